@@ -36,26 +36,31 @@ from .config import (
     MaaPlanConfig,
     GeneralConfig,
     GeneralSubConfig,
+    MaaLogStatistics,
+    ConfigWriter,
     Config,
 )
 from .logger import logger
 from .main_info_bar import MainInfoBar
-from .network import Network
+from .network import Network, NetworkTask
 from .sound_player import SoundPlayer
 from .task_manager import Task, TaskManager
 from .timer import MainTimer
 
 __all__ = [
     "Config",
+    "ConfigWriter",
     "QueueConfig",
     "MaaConfig",
     "MaaUserConfig",
     "MaaPlanConfig",
     "GeneralConfig",
     "GeneralSubConfig",
+    "MaaLogStatistics",
     "logger",
     "MainInfoBar",
     "Network",
+    "NetworkTask",
     "SoundPlayer",
     "Task",
     "TaskManager",
@@ -25,8 +25,10 @@ v4.4
 作者：DLmaster_361
 """
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QObject, QTimer, Signal
 import argparse
+import os
+import threading
 import sqlite3
 import json
 import sys
@@ -34,6 +36,7 @@ import shutil
 import re
 import base64
 import calendar
+import hashlib
 from datetime import datetime, timedelta, date
 from collections import defaultdict
 from pathlib import Path
@@ -50,10 +53,10 @@ from qfluentwidgets import (
     exceptionHandler,
 )
 from urllib.parse import urlparse
-from typing import Union, Dict, List
+from typing import Union, Dict, List, Tuple, Optional
 
 from .logger import logger
-from .network import Network
+from .network import Network, NetworkTask
 
 
 class FileValidator(ConfigValidator):
@@ -91,29 +94,236 @@ class UrlListValidator(ConfigValidator):
         return list(set([_ for _ in urls if self.validate(_)]))
 
 
+class MaaLogStatistics:
+    """MAA日志统计解析器，单次线性扫描日志生成公招与掉落统计"""
+
+    STAR_PATTERN = re.compile(r"(\d+)\s*★ Tags")
+    DROP_PATTERN = re.compile(r"([A-Za-z0-9\-]+) 掉落统计:")
+    ITEM_PATTERN = re.compile(r"^(?!\[)(\S+?)\s*:\s*([\d,]+)(?:\s*\(\+[\d,]+\))?", re.M)
+    ITEM_BLACKLIST = {"当前次数", "理智", "最快截图耗时", "专精等级", "剩余时间"}
+
+    def __init__(self) -> None:
+
+        self.recruit_statistics: Dict[str, int] = defaultdict(int)
+        self.drop_statistics: Dict[str, Dict[str, int]] = {}
+        self.if_six_star = False
+
+        # 公招解析状态
+        self.if_wait_tags = False
+        self.confirmed_recruit = False
+        self.current_star_level = None
+
+        # 掉落解析状态
+        self.if_in_fight = False
+        self.current_stage = None
+        self.last_drop_stats: Dict[str, int] = {}
+
+    def feed(self, lines: List[str]) -> None:
+        """
+        解析新增日志行并更新统计数据
+
+        :param lines: 新增的日志行列表
+        """
+
+        for line in lines:
+            self.__feed_recruit(line)
+            self.__feed_drop(line)
+
+    def __feed_recruit(self, line: str) -> None:
+        """公招统计（仅统计招募到的）"""
+
+        # 公招识别结果之后，跳过标签行直到识别到星级
+        if self.if_wait_tags:
+            if "Tags" not in line:
+                return None
+            self.if_wait_tags = False
+            star_match = self.STAR_PATTERN.search(line)
+            if star_match:
+                self.current_star_level = f"{star_match.group(1)}★"
+                if self.current_star_level == "6★":
+                    self.if_six_star = True
+
+        elif "公招识别结果:" in line:
+            self.current_star_level = None  # 每次识别公招时清空之前的星级
+            self.if_wait_tags = True
+            return None
+
+        if "已确认招募" in line:  # 只有确认招募后才统计
+            self.confirmed_recruit = True
+
+        if self.confirmed_recruit and self.current_star_level:
+            self.recruit_statistics[self.current_star_level] += 1
+            self.confirmed_recruit = False  # 重置，等待下一次公招
+            self.current_star_level = None  # 清空已处理的星级
+
+    def __feed_drop(self, line: str) -> None:
+        """掉落统计（仅统计正常结束的Fight任务中的最后一次掉落统计）"""
+
+        # 遇到新的Fight任务开始时，未正常结束的任务被丢弃
+        if "开始任务: Fight" in line or "开始任务: 刷理智" in line:
+            self.if_in_fight = True
+            self.current_stage = None
+            self.last_drop_stats = {}
+
+        if not self.if_in_fight:
+            return None
+
+        drop_match = self.DROP_PATTERN.search(line)
+        if drop_match:
+            # 发现新的掉落统计，重置当前关卡的掉落数据
+            self.current_stage = drop_match.group(1)
+            self.last_drop_stats = {}
+
+        elif self.current_stage:
+            for item, total in self.ITEM_PATTERN.findall(line):
+                # 解析数值时去掉逗号 （如 2,160 -> 2160）
+                if item not in self.ITEM_BLACKLIST:
+                    self.last_drop_stats[item] = int(total.replace(",", ""))
+
+        if "完成任务: Fight" in line or "完成任务: 刷理智" in line:
+
+            # 累加本次任务的掉落数据
+            if self.current_stage and self.last_drop_stats:
+                stage_drops = self.drop_statistics.setdefault(self.current_stage, {})
+                for item, count in self.last_drop_stats.items():
+                    stage_drops[item] = stage_drops.get(item, 0) + count
+
+            self.if_in_fight = False
+            self.current_stage = None
+            self.last_drop_stats = {}
+
+
+class _ConfigWriter(QObject):
+    """配置文件延迟写入管理器，合并短时间内的多次保存后统一落盘"""
+
+    flush_delay = 500
+
+    schedule_flush = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.dirty_dict: Dict[int, "LQConfig"] = {}
+        self.lock = threading.Lock()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+        # 保存可能发生在子线程中，定时器统一在主线程启动
+        self.schedule_flush.connect(self.start_timer)
+
+    def mark_dirty(self, config: "LQConfig") -> None:
+        """
+        标记配置待写入
+
+        :param config: 待写入的配置
+        """
+
+        with self.lock:
+            self.dirty_dict[id(config)] = config
+
+        self.schedule_flush.emit()
+
+    def start_timer(self) -> None:
+        """自首个待写入配置起计时，到期后统一写入"""
+
+        if not self.timer.isActive():
+            self.timer.start(self.flush_delay)
+
+    def flush(self) -> None:
+        """立即写入所有待写入配置"""
+
+        with self.lock:
+            config_list = list(self.dirty_dict.values())
+            self.dirty_dict.clear()
+
+        for config in config_list:
+            try:
+                config.save_now()
+            except Exception as e:
+                logger.exception(
+                    f"配置文件写入失败：{config.file}，{e}", module="配置管理"
+                )
+
+
+ConfigWriter = _ConfigWriter()
+
+
 class LQConfig(QConfig):
     """局域配置类"""
 
+    # 各配置类中配置项的属性名，按类缓存，仅在首次使用时通过反射生成
+    item_name_registry: Dict[type, List[str]] = {}
+
     def __init__(self) -> None:
         super().__init__()
 
+        self.item_registry: Dict[str, ConfigItem] = None
+        self.group_registry: Dict[str, List[ConfigItem]] = None
+
+    def get_registry(
+        self,
+    ) -> Tuple[Dict[str, ConfigItem], Dict[str, List[ConfigItem]]]:
+        """
+        获取配置项注册表，配置项均在构造时创建，注册表生成后不再变化
+
+        :return: 键值到配置项的映射，分组到配置项列表的映射
+        """
+
+        cfg = self._cfg
+
+        if cfg.item_registry is None:
+
+            if type(cfg) not in LQConfig.item_name_registry:
+                LQConfig.item_name_registry[type(cfg)] = [
+                    name
+                    for name in dir(cfg)
+                    if isinstance(getattr(cfg, name), ConfigItem)
+                ]
+
+            cfg.item_registry = {}
+            cfg.group_registry = {}
+            for name in LQConfig.item_name_registry[type(cfg)]:
+                item = getattr(cfg, name)
+                cfg.item_registry[item.key] = item
+                cfg.group_registry.setdefault(item.group, []).append(item)
+
+        return cfg.item_registry, cfg.group_registry
+
+    def save(self):
+        """标记配置待写入，由配置写入管理器合并后统一写入"""
+
+        ConfigWriter.mark_dirty(self._cfg)
+
+    def save_now(self):
+        """以临时文件替换的方式原子写入配置文件"""
+
+        file = Path(self._cfg.file)
+        file.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_file = file.with_name(f"{file.name}.tmp")
+        with temp_file.open("w", encoding="utf-8") as f:
+            json.dump(self._cfg.toDict(), f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(file)
+
     def toDict(self, serialize=True):
         """convert config items to `dict`"""
         items = {}
-        for name in dir(self._cfg):
-            item = getattr(self._cfg, name)
-            if not isinstance(item, ConfigItem):
-                continue
+        for item_list in self.get_registry()[1].values():
+            for item in item_list:
 
-            value = item.serialize() if serialize else item.value
-            if not items.get(item.group):
-                if not item.name:
-                    items[item.group] = value
-                else:
-                    items[item.group] = {}
+                value = item.serialize() if serialize else item.value
+                if not items.get(item.group):
+                    if not item.name:
+                        items[item.group] = value
+                    else:
+                        items[item.group] = {}
 
-            if item.name:
-                items[item.group][item.name] = value
+                if item.name:
+                    items[item.group][item.name] = value
 
         return items
 
@@ -143,11 +353,7 @@ class LQConfig(QConfig):
             cfg = {}
 
         # map config items'key to item
-        items = {}
-        for name in dir(self._cfg):
-            item = getattr(self._cfg, name)
-            if isinstance(item, ConfigItem):
-                items[item.key] = item
+        items = self.get_registry()[0]
 
         # update the value of config item
         for k, v in cfg.items():
@@ -336,6 +542,9 @@ class MaaConfig(LQConfig):
 
         self.MaaSet_Name = ConfigItem("MaaSet", "Name", "")
         self.MaaSet_Path = ConfigItem("MaaSet", "Path", ".", FolderValidator())
+        # 多开实例列表，需列出包括主实例在内的全部实例，每项包含 Path、EmulatorPath、EmulatorArgs、ADBAddress
+        # 每个实例须配置独立的模拟器与ADB地址，Path 为空时使用主MAA路径
+        self.MaaSet_Workers = ConfigItem("MaaSet", "Workers", [])
 
         self.RunSet_TaskTransitionMethod = OptionsConfigItem(
             "RunSet",
@@ -705,8 +914,10 @@ class GeneralSubConfig(LQConfig):
 class AppConfig(GlobalConfig):
 
     VERSION = "4.4.3.0"
+    STAGE_CACHE_TTL = 1800
 
     stage_refreshed = Signal()
+    queue_changed = Signal()
     PASSWORD_refreshed = Signal()
     sub_info_changed = Signal()
     power_sign_changed = Signal()
@@ -721,11 +932,14 @@ class AppConfig(GlobalConfig):
         self.database_path = self.app_path / "data/data.db"
         self.config_path = self.app_path / "config/config.json"
         self.key_path = self.app_path / "data/key"
+        self.stage_cache_path = self.app_path / "data/StageActivity.json"
 
         self.main_window = None
         self.PASSWORD = ""
         self.running_list = []
         self.silence_dict: Dict[Path, datetime] = {}
+        self.adb_port_dict: Dict[str, int] = {}
+        self.emulator_boot_dict: Dict[Path, float] = {}
         self.info_bar_list = []
         self.stage_dict = {
             "ALL": {"value": [], "text": []},
@@ -737,6 +951,7 @@ class AppConfig(GlobalConfig):
             "Saturday": {"value": [], "text": []},
             "Sunday": {"value": [], "text": []},
         }
+        self.stage_hash = None
         self.power_sign = "NoAction"
         self.if_ignore_silence = False
         self.if_database_opened = False
@@ -824,7 +1039,8 @@ class AppConfig(GlobalConfig):
             db = sqlite3.connect(self.database_path)
             cur = db.cursor()
             cur.execute("CREATE TABLE version(v text)")
-            cur.execute("INSERT INTO version VALUES(?)", ("v1.8",))
+            cur.execute("INSERT INTO version VALUES(?)", ("v1.10",))
+            self.create_history_index(cur)
             db.commit()
             cur.close()
             db.close()
@@ -835,7 +1051,7 @@ class AppConfig(GlobalConfig):
         cur.execute("SELECT * FROM version WHERE True")
         version = cur.fetchall()
 
-        if version[0][0] != "v1.8":
+        if version[0][0] != "v1.10":
             logger.info("数据文件版本更新开始", module="配置管理")
             if_streaming = False
             # v1.4-->v1.5
@@ -1099,25 +1315,135 @@ class AppConfig(GlobalConfig):
                 cur.execute("DELETE FROM version WHERE v = ?", ("v1.7",))
                 cur.execute("INSERT INTO version VALUES(?)", ("v1.8",))
                 db.commit()
+            # v1.8-->v1.9
+            if version[0][0] == "v1.8" or if_streaming:
+                logger.info("数据文件版本更新：v1.8-->v1.9", module="配置管理")
+                if_streaming = True
+
+                self.create_history_index(cur)
+                cur.execute("DELETE FROM version WHERE v = ?", ("v1.8",))
+                cur.execute("INSERT INTO version VALUES(?)", ("v1.9",))
+                db.commit()
+
+                self.rebuild_history_index()
+            # v1.9-->v1.10
+            if version[0][0] == "v1.9" or if_streaming:
+                logger.info("数据文件版本更新：v1.9-->v1.10", module="配置管理")
+                if_streaming = True
+
+                self.create_history_index(cur)
+                cur.execute("DELETE FROM history_rollup_recruit")
+                cur.execute("DELETE FROM history_rollup_drop")
+                cur.execute(
+                    "INSERT INTO history_rollup_recruit "
+                    "SELECT date, user, star, SUM(count) FROM history_recruit "
+                    "GROUP BY date, user, star"
+                )
+                cur.execute(
+                    "INSERT INTO history_rollup_drop "
+                    "SELECT date, user, stage, item, SUM(count) FROM history_drop "
+                    "GROUP BY date, user, stage, item"
+                )
+                cur.execute("DELETE FROM version WHERE v = ?", ("v1.9",))
+                cur.execute("INSERT INTO version VALUES(?)", ("v1.10",))
+                db.commit()
 
             cur.close()
             db.close()
             logger.success("数据文件版本更新完成", module="配置管理")
 
     def get_stage(self) -> None:
-        """从MAA服务器更新活动关卡信息"""
+        """从MAA服务器更新活动关卡信息，优先使用本地缓存并发送条件请求"""
+
+        network = self.request_stage()
+        if network is not None:
+            network.loop.exec()
+            self.apply_stage(network)
+
+    def load_stage_cache(self) -> dict:
+        """读取活动关卡缓存，缓存不存在或损坏时返回空字典"""
+
+        if self.stage_cache_path.exists():
+            try:
+                return json.loads(self.stage_cache_path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"活动关卡缓存读取失败：{e}", module="配置管理")
+        return {}
+
+    def request_stage(self) -> Optional[NetworkTask]:
+        """
+        发起活动关卡信息请求，请求在网络线程池中执行，不等待结果
+
+        :return: 网络请求任务，缓存仍在有效期内时返回 None
+        """
 
         logger.info("开始获取活动关卡信息", module="配置管理")
-        network = Network.add_task(
+
+        cache = self.load_stage_cache()
+
+        if "body" in cache:
+
+            # 首次调用或缓存仍在有效期内时立即使用缓存数据生成关卡信息
+            if_fresh = datetime.now() - datetime.strptime(
+                cache["time"], "%Y-%m-%d %H:%M:%S"
+            ) < timedelta(seconds=self.STAGE_CACHE_TTL)
+            if self.stage_hash is None or if_fresh:
+                self.update_stage(cache["body"]["Official"]["sideStoryStage"])
+            if if_fresh:
+                logger.info("活动关卡缓存仍在有效期内，跳过网络请求", module="配置管理")
+                return None
+
+        headers = {}
+        if "body" in cache and cache.get("ETag"):
+            headers["If-None-Match"] = cache["ETag"]
+        if "body" in cache and cache.get("Last-Modified"):
+            headers["If-Modified-Since"] = cache["Last-Modified"]
+
+        return Network.add_task(
             mode="get",
             url="https://api.maa.plus/MaaAssistantArknights/api/gui/StageActivity.json",
+            headers=headers,
         )
-        network.loop.exec()
+
+    def apply_stage(self, network: NetworkTask) -> None:
+        """
+        根据活动关卡信息请求结果更新关卡信息与本地缓存
+
+        :param network: 已完成的活动关卡信息请求任务
+        """
+
+        cache = self.load_stage_cache()
+
         network_result = Network.get_result(network)
         if network_result["status_code"] == 200:
-            stage_infos: List[Dict[str, Union[str, Dict[str, Union[str, int]]]]] = (
-                network_result["response_json"]["Official"]["sideStoryStage"]
+
+            body = network_result["response_json"]
+            cache = {
+                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "ETag": network_result["response_headers"].get("ETag"),
+                "Last-Modified": network_result["response_headers"].get(
+                    "Last-Modified"
+                ),
+                "body": body,
+            }
+            self.save_stage_cache(cache)
+            stage_infos = body["Official"]["sideStoryStage"]
+
+        elif network_result["status_code"] == 304 and "body" in cache:
+
+            logger.info("活动关卡信息未变化，沿用本地缓存", module="配置管理")
+            cache["time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.save_stage_cache(cache)
+            stage_infos = cache["body"]["Official"]["sideStoryStage"]
+
+        elif "body" in cache:
+
+            logger.warning(
+                f"无法从MAA服务器获取活动关卡信息:{network_result['error_message']}，使用本地缓存",
+                module="配置管理",
             )
+            stage_infos = cache["body"]["Official"]["sideStoryStage"]
+
         else:
             logger.warning(
                 f"无法从MAA服务器获取活动关卡信息:{network_result['error_message']}",
@@ -1125,6 +1451,28 @@ class AppConfig(GlobalConfig):
             )
             stage_infos = []
 
+        self.update_stage(stage_infos)
+
+    def save_stage_cache(self, cache: dict) -> None:
+        """
+        写入活动关卡缓存，先写入临时文件再替换，避免中断时留下不完整的缓存
+
+        :param cache: 活动关卡缓存数据
+        """
+
+        tmp_path = self.stage_cache_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.stage_cache_path)
+
+    def update_stage(
+        self, stage_infos: List[Dict[str, Union[str, Dict[str, Union[str, int]]]]]
+    ) -> None:
+        """
+        根据活动关卡数据生成关卡信息，仅在内容变化时刷新
+
+        :param stage_infos: 活动关卡数据
+        """
+
         ss_stage_dict = {"value": [], "text": []}
 
         for stage_info in stage_infos:
@@ -1181,6 +1529,15 @@ class AppConfig(GlobalConfig):
                 "text": today_stage_dict["text"] + ss_stage_dict["text"],
             }
 
+        # 当前开放的活动关卡与日常关卡表共同决定关卡信息，二者均未变化时无需刷新界面
+        stage_hash = hashlib.sha256(
+            json.dumps(self.stage_dict, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        if stage_hash == self.stage_hash:
+            logger.info("活动关卡信息未变化，跳过界面刷新", module="配置管理")
+            return None
+        self.stage_hash = stage_hash
+
         self.stage_refreshed.emit()
 
         logger.success("活动关卡信息更新完成", module="配置管理")
@@ -1201,6 +1558,8 @@ class AppConfig(GlobalConfig):
     def search_script(self) -> None:
         """更新脚本实例配置信息"""
 
+        ConfigWriter.flush()
+
         logger.info("开始搜索并读入脚本实例配置", module="配置管理")
         self.script_dict: Dict[
             str,
@@ -1260,6 +1619,8 @@ class AppConfig(GlobalConfig):
         :type name: str
         """
 
+        ConfigWriter.flush()
+
         logger.info(f"开始搜索并读入 MAA 脚本实例 {name} 的用户信息", module="配置管理")
 
         user_dict: Dict[str, Dict[str, Union[Path, MaaUserConfig]]] = {}
@@ -1289,6 +1650,8 @@ class AppConfig(GlobalConfig):
         :type name: str
         """
 
+        ConfigWriter.flush()
+
         logger.info(
             f"开始搜索并读入通用脚本实例 {name} 的子配置信息", module="配置管理"
         )
@@ -1315,6 +1678,8 @@ class AppConfig(GlobalConfig):
     def search_plan(self) -> None:
         """更新计划表配置信息"""
 
+        ConfigWriter.flush()
+
         logger.info("开始搜索并读入计划表配置", module="配置管理")
 
         self.plan_dict: Dict[str, Dict[str, Union[str, Path, MaaPlanConfig]]] = {}
@@ -1344,6 +1709,8 @@ class AppConfig(GlobalConfig):
     def search_queue(self):
         """更新调度队列实例配置信息"""
 
+        ConfigWriter.flush()
+
         logger.info("开始搜索并读入调度队列配置", module="配置管理")
 
         self.queue_dict: Dict[str, Dict[str, Union[Path, QueueConfig]]] = {}
@@ -1354,6 +1721,7 @@ class AppConfig(GlobalConfig):
                 queue_config = QueueConfig()
                 queue_config.load(json_file, queue_config)
                 queue_config.save()
+                self.watch_queue(queue_config)
 
                 self.queue_dict[json_file.stem] = {
                     "Path": json_file,
@@ -1363,12 +1731,26 @@ class AppConfig(GlobalConfig):
         self.queue_dict = dict(
             sorted(self.queue_dict.items(), key=lambda x: int(x[0][5:]))
         )
+        self.queue_changed.emit()
 
         logger.success(
             f"调度队列配置搜索完成，共找到 {len(self.queue_dict)} 个调度队列",
             module="配置管理",
         )
 
+    def watch_queue(self, queue_config: QueueConfig) -> None:
+        """
+        监听调度队列定时相关配置项，变化时通知定时器重建调度索引
+
+        :param queue_config: 调度队列配置
+        """
+
+        for item in [
+            queue_config.QueueSet_TimeEnabled,
+            *queue_config.config_item_dict["Time"].values(),
+        ]:
+            item.valueChanged.connect(lambda _: self.queue_changed.emit())
+
     def change_queue(self, old: str, new: str) -> None:
         """
         修改调度队列配置文件的队列参数
@@ -1529,7 +1911,13 @@ class AppConfig(GlobalConfig):
         else:
             logger.warning(f"保存历史记录时未找到调度队列: {key}")
 
-    def save_maa_log(self, log_path: Path, logs: list, maa_result: str) -> bool:
+    def save_maa_log(
+        self,
+        log_path: Path,
+        logs: list,
+        maa_result: str,
+        statistics: MaaLogStatistics = None,
+    ) -> bool:
         """
         保存MAA日志并生成对应统计数据
 
@@ -1539,6 +1927,8 @@ class AppConfig(GlobalConfig):
         :type logs: list
         :param maa_result: MAA 结果
         :type maa_result: str
+        :param statistics: 日志监视过程中已完成解析的统计数据，为空时重新解析日志
+        :type statistics: MaaLogStatistics
         :return: 是否包含6★招募
         :rtype: bool
         """
@@ -1548,128 +1938,28 @@ class AppConfig(GlobalConfig):
             module="配置管理",
         )
 
+        # 未提供实时解析结果时，重新解析完整日志
+        if statistics is None:
+            statistics = MaaLogStatistics()
+            statistics.feed(logs)
+
         data: Dict[str, Union[str, Dict[str, Union[int, dict]]]] = {
-            "recruit_statistics": defaultdict(int),
-            "drop_statistics": defaultdict(dict),
+            "recruit_statistics": dict(statistics.recruit_statistics),
+            "drop_statistics": statistics.drop_statistics,
             "maa_result": maa_result,
         }
 
-        if_six_star = False
-
-        # 公招统计（仅统计招募到的）
-        confirmed_recruit = False
-        current_star_level = None
-        i = 0
-        while i < len(logs):
-            if "公招识别结果:" in logs[i]:
-                current_star_level = None  # 每次识别公招时清空之前的星级
-                i += 1
-                while i < len(logs) and "Tags" not in logs[i]:  # 读取所有公招标签
-                    i += 1
-
-                if i < len(logs) and "Tags" in logs[i]:  # 识别星级
-                    star_match = re.search(r"(\d+)\s*★ Tags", logs[i])
-                    if star_match:
-                        current_star_level = f"{star_match.group(1)}★"
-                        if current_star_level == "6★":
-                            if_six_star = True
-
-            if "已确认招募" in logs[i]:  # 只有确认招募后才统计
-                confirmed_recruit = True
-
-            if confirmed_recruit and current_star_level:
-                data["recruit_statistics"][current_star_level] += 1
-                confirmed_recruit = False  # 重置，等待下一次公招
-                current_star_level = None  # 清空已处理的星级
-
-            i += 1
-
-        # 掉落统计
-        # 存储所有关卡的掉落统计
-        all_stage_drops = {}
-
-        # 查找所有Fight任务的开始和结束位置
-        fight_tasks = []
-        for i, line in enumerate(logs):
-            if "开始任务: Fight" in line or "开始任务: 刷理智" in line:
-                # 查找对应的任务结束位置
-                end_index = -1
-                for j in range(i + 1, len(logs)):
-                    if "完成任务: Fight" in logs[j] or "完成任务: 刷理智" in logs[j]:
-                        end_index = j
-                        break
-                    # 如果遇到新的Fight任务开始，则当前任务没有正常结束
-                    if j < len(logs) and (
-                        "开始任务: Fight" in logs[j] or "开始任务: 刷理智" in logs[j]
-                    ):
-                        break
-
-                # 如果找到了结束位置，记录这个任务的范围
-                if end_index != -1:
-                    fight_tasks.append((i, end_index))
-
-        # 处理每个Fight任务
-        for start_idx, end_idx in fight_tasks:
-            # 提取当前任务的日志
-            task_logs = logs[start_idx : end_idx + 1]
-
-            # 查找任务中的最后一次掉落统计
-            last_drop_stats = {}
-            current_stage = None
-
-            for line in task_logs:
-                # 匹配掉落统计行，如"1-7 掉落统计:"
-                drop_match = re.search(r"([A-Za-z0-9\-]+) 掉落统计:", line)
-                if drop_match:
-                    # 发现新的掉落统计，重置当前关卡的掉落数据
-                    current_stage = drop_match.group(1)
-                    last_drop_stats = {}
-                    continue
-
-                # 如果已经找到了关卡，处理掉落物
-                if current_stage:
-                    item_match: List[str] = re.findall(
-                        r"^(?!\[)(\S+?)\s*:\s*([\d,]+)(?:\s*\(\+[\d,]+\))?",
-                        line,
-                        re.M,
-                    )
-                    for item, total in item_match:
-                        # 解析数值时去掉逗号 （如 2,160 -> 2160）
-                        total = int(total.replace(",", ""))
-
-                        # 黑名单
-                        if item not in [
-                            "当前次数",
-                            "理智",
-                            "最快截图耗时",
-                            "专精等级",
-                            "剩余时间",
-                        ]:
-                            last_drop_stats[item] = total
-
-            # 如果任务中有掉落统计，更新总统计
-            if current_stage and last_drop_stats:
-                if current_stage not in all_stage_drops:
-                    all_stage_drops[current_stage] = {}
-
-                # 累加掉落数据
-                for item, count in last_drop_stats.items():
-                    all_stage_drops[current_stage].setdefault(item, 0)
-                    all_stage_drops[current_stage][item] += count
-
-        # 将累加后的掉落数据保存到结果中
-        data["drop_statistics"] = all_stage_drops
-
         # 保存日志
         log_path.parent.mkdir(parents=True, exist_ok=True)
         with log_path.open("w", encoding="utf-8") as f:
             f.writelines(logs)
         with log_path.with_suffix(".json").open("w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+        self.update_history_index(log_path.with_suffix(".json"), data)
 
         logger.success(f"MAA 日志统计完成，日志路径：{log_path}", module="配置管理")
 
-        return if_six_star
+        return statistics.if_six_star
 
     def save_general_log(self, log_path: Path, logs: list, general_result: str) -> None:
         """
@@ -1693,17 +1983,243 @@ class AppConfig(GlobalConfig):
             f.writelines(logs)
         with log_path.with_suffix(".json").open("w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+        self.update_history_index(log_path.with_suffix(".json"), data)
 
         logger.success(
             f"通用日志统计完成，日志路径：{log_path.with_suffix('.log')}",
             module="配置管理",
         )
 
-    def merge_statistic_info(self, statistic_path_list: List[Path]) -> dict:
+    def create_history_index(self, cur: sqlite3.Cursor) -> None:
+        """
+        创建历史记录索引数据表
+
+        :param cur: 主数据库游标
+        """
+
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS history_index("
+            "date text, user text, run_time text, result text, "
+            "PRIMARY KEY(date, user, run_time))"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS history_recruit("
+            "date text, user text, run_time text, star text, count integer)"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS history_drop("
+            "date text, user text, run_time text, stage text, item text, count integer)"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS history_rollup_recruit("
+            "date text, user text, star text, count integer, "
+            "PRIMARY KEY(date, user, star))"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS history_rollup_drop("
+            "date text, user text, stage text, item text, count integer, "
+            "PRIMARY KEY(date, user, stage, item))"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS history_recruit_key "
+            "ON history_recruit(date, user, run_time)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS history_drop_key "
+            "ON history_drop(date, user, run_time)"
+        )
+
+    def history_key(self, json_file: Path) -> tuple:
+        """
+        获取统计信息文件对应的历史记录索引键
+
+        :param json_file: 统计信息文件路径
+        :return: (日期, 用户, 运行时间)
+        """
+
+        return (json_file.parent.parent.name, json_file.parent.name, json_file.stem)
+
+    def insert_history_index(
+        self, cur: sqlite3.Cursor, json_file: Path, data: dict
+    ) -> None:
+        """
+        向历史记录索引写入单条统计信息
+
+        :param cur: 主数据库游标
+        :param json_file: 统计信息文件路径
+        :param data: 统计信息字典
+        """
+
+        key = self.history_key(json_file)
+
+        # 从日汇总中扣除同一记录的旧统计信息
+        cur.execute(
+            "SELECT star, count FROM history_recruit "
+            "WHERE date = ? AND user = ? AND run_time = ?",
+            key,
+        )
+        self.update_history_rollup(
+            cur, key, {star: -count for star, count in cur.fetchall()}, {}
+        )
+        cur.execute(
+            "SELECT stage, item, count FROM history_drop "
+            "WHERE date = ? AND user = ? AND run_time = ?",
+            key,
+        )
+        old_drops = {}
+        for stage, item, count in cur.fetchall():
+            old_drops.setdefault(stage, {})[item] = -count
+        self.update_history_rollup(cur, key, {}, old_drops)
+
+        cur.execute(
+            "DELETE FROM history_index WHERE date = ? AND user = ? AND run_time = ?",
+            key,
+        )
+        cur.execute(
+            "DELETE FROM history_recruit WHERE date = ? AND user = ? AND run_time = ?",
+            key,
+        )
+        cur.execute(
+            "DELETE FROM history_drop WHERE date = ? AND user = ? AND run_time = ?",
+            key,
+        )
+
+        cur.execute(
+            "INSERT INTO history_index VALUES(?, ?, ?, ?)",
+            (*key, data.get("maa_result", data.get("general_result", ""))),
+        )
+        cur.executemany(
+            "INSERT INTO history_recruit VALUES(?, ?, ?, ?, ?)",
+            [
+                (*key, star, count)
+                for star, count in data.get("recruit_statistics", {}).items()
+            ],
+        )
+        cur.executemany(
+            "INSERT INTO history_drop VALUES(?, ?, ?, ?, ?, ?)",
+            [
+                (*key, stage, item, count)
+                for stage, drops in data.get("drop_statistics", {}).items()
+                for item, count in drops.items()
+            ],
+        )
+        self.update_history_rollup(
+            cur,
+            key,
+            data.get("recruit_statistics", {}),
+            data.get("drop_statistics", {}),
+        )
+
+    def update_history_rollup(
+        self,
+        cur: sqlite3.Cursor,
+        key: tuple,
+        recruit_statistics: Dict[str, int],
+        drop_statistics: Dict[str, Dict[str, int]],
+    ) -> None:
+        """
+        将单条记录的统计信息累加至用户日汇总
+
+        :param cur: 主数据库游标
+        :param key: 历史记录索引键
+        :param recruit_statistics: 公招统计增量
+        :param drop_statistics: 掉落统计增量
+        """
+
+        date, user, _ = key
+
+        cur.executemany(
+            "INSERT INTO history_rollup_recruit VALUES(?, ?, ?, ?) "
+            "ON CONFLICT(date, user, star) DO UPDATE SET count = count + excluded.count",
+            [(date, user, star, count) for star, count in recruit_statistics.items()],
+        )
+        cur.executemany(
+            "INSERT INTO history_rollup_drop VALUES(?, ?, ?, ?, ?) "
+            "ON CONFLICT(date, user, stage, item) "
+            "DO UPDATE SET count = count + excluded.count",
+            [
+                (date, user, stage, item, count)
+                for stage, drops in drop_statistics.items()
+                for item, count in drops.items()
+            ],
+        )
+
+    def update_history_index(self, json_file: Path, data: dict) -> None:
+        """
+        将新保存的统计信息写入历史记录索引
+
+        :param json_file: 统计信息文件路径
+        :param data: 统计信息字典
+        """
+
+        try:
+            db = sqlite3.connect(self.database_path)
+            cur = db.cursor()
+            self.insert_history_index(cur, json_file, data)
+            db.commit()
+            cur.close()
+            db.close()
+        except Exception as e:
+            logger.exception(f"写入历史记录索引时出现异常：{e}", module="配置管理")
+
+    def rebuild_history_index(self) -> None:
+        """从历史记录目录重建历史记录索引"""
+
+        logger.info("开始从历史记录目录重建历史记录索引", module="配置管理")
+
+        db = sqlite3.connect(self.database_path)
+        cur = db.cursor()
+        self.create_history_index(cur)
+        cur.execute("DELETE FROM history_index")
+        cur.execute("DELETE FROM history_recruit")
+        cur.execute("DELETE FROM history_drop")
+
+        count = 0
+
+        for date_folder in (self.app_path / "history").iterdir():
+            if not date_folder.is_dir():
+                continue  # 只处理日期文件夹
+
+            try:
+                datetime.strptime(date_folder.name, "%Y-%m-%d")
+            except ValueError:
+                logger.warning(f"非日期格式的目录: {date_folder}", module="配置管理")
+                continue
+
+            # 仅重算仍有原始记录的日期，已清理日期的日汇总予以保留
+            cur.execute(
+                "DELETE FROM history_rollup_recruit WHERE date = ?", (date_folder.name,)
+            )
+            cur.execute(
+                "DELETE FROM history_rollup_drop WHERE date = ?", (date_folder.name,)
+            )
+
+            for json_file in date_folder.glob("*/*.json"):
+                try:
+                    with json_file.open("r", encoding="utf-8") as f:
+                        self.insert_history_index(cur, json_file, json.load(f))
+                    count += 1
+                except Exception as e:
+                    logger.warning(
+                        f"无法读取统计信息文件：{json_file}，{e}", module="配置管理"
+                    )
+
+        db.commit()
+        cur.close()
+        db.close()
+
+        logger.success(f"历史记录索引重建完成，共计 {count} 条记录", module="配置管理")
+
+    def merge_statistic_info(
+        self,
+        statistic_path_list: List[Path],
+        rollup: Optional[Tuple[str, datetime, datetime]] = None,
+    ) -> dict:
         """
         合并指定数据统计信息文件
 
         :param statistic_path_list: 需要合并的统计信息文件路径列表
+        :param rollup: 以（用户, 开始日期, 结束日期）直接合并日汇总，不依赖统计信息文件是否仍保留
         :return: 合并后的统计信息字典
         """
 
@@ -1714,66 +2230,113 @@ class AppConfig(GlobalConfig):
 
         data = {"index": {}}
 
-        for json_file in statistic_path_list:
+        # 补录时读取统计信息文件可能出错，需保证数据库连接被关闭
+        db = sqlite3.connect(self.database_path)
+        try:
+            cur = db.cursor()
+
+            cur.execute(
+                "CREATE TEMP TABLE history_key(date text, user text, run_time text)"
+            )
+            cur.executemany(
+                "INSERT INTO history_key VALUES(?, ?, ?)",
+                [self.history_key(_) for _ in statistic_path_list],
+            )
+
+            # 补录尚未写入索引的统计信息文件
+            cur.execute(
+                "SELECT k.date, k.user, k.run_time FROM history_key k "
+                "LEFT JOIN history_index h USING(date, user, run_time) "
+                "WHERE h.result IS NULL"
+            )
+            for date, user, run_time in cur.fetchall():
+                json_file = self.app_path / f"history/{date}/{user}/{run_time}.json"
+                if json_file.exists():
+                    with json_file.open("r", encoding="utf-8") as f:
+                        self.insert_history_index(cur, json_file, json.load(f))
+            db.commit()
+
+            if rollup is not None:
 
-            with json_file.open("r", encoding="utf-8") as f:
-                single_data: Dict[str, Union[str, Dict[str, Union[int, dict]]]] = (
-                    json.load(f)
+                # 按用户与日期范围合并日汇总，已清理日期的汇总同样计入
+                user, start_date, end_date = rollup
+                rollup_key = (
+                    user,
+                    start_date.strftime("%Y-%m-%d"),
+                    end_date.strftime("%Y-%m-%d"),
                 )
 
-            for key in single_data.keys():
+                cur.execute(
+                    "SELECT star, SUM(count) FROM history_rollup_recruit "
+                    "WHERE user = ? AND date BETWEEN ? AND ? "
+                    "GROUP BY star HAVING SUM(count) > 0 "
+                    "ORDER BY MIN(history_rollup_recruit.rowid)",
+                    rollup_key,
+                )
+                data["recruit_statistics"] = dict(cur.fetchall())
+
+                data["drop_statistics"] = {}
+                cur.execute(
+                    "SELECT stage, item, SUM(count) FROM history_rollup_drop "
+                    "WHERE user = ? AND date BETWEEN ? AND ? "
+                    "GROUP BY stage, item HAVING SUM(count) > 0 "
+                    "ORDER BY MIN(history_rollup_drop.rowid)",
+                    rollup_key,
+                )
 
-                if key not in data:
-                    data[key] = {}
+            else:
 
                 # 合并公招统计
-                if key == "recruit_statistics":
-
-                    for star_level, count in single_data[key].items():
-                        if star_level not in data[key]:
-                            data[key][star_level] = 0
-                        data[key][star_level] += count
+                cur.execute(
+                    "SELECT star, SUM(count) FROM history_recruit "
+                    "JOIN history_key USING(date, user, run_time) "
+                    "GROUP BY star ORDER BY MIN(history_recruit.rowid)"
+                )
+                data["recruit_statistics"] = dict(cur.fetchall())
 
                 # 合并掉落统计
-                elif key == "drop_statistics":
-
-                    for stage, drops in single_data[key].items():
-                        if stage not in data[key]:
-                            data[key][stage] = {}  # 初始化关卡
-
-                        for item, count in drops.items():
-
-                            if item not in data[key][stage]:
-                                data[key][stage][item] = 0
-                            data[key][stage][item] += count
-
-                # 录入运行结果
-                elif key in ["maa_result", "general_result"]:
-
-                    actual_date = datetime.strptime(
-                        f"{json_file.parent.parent.name} {json_file.stem}",
-                        "%Y-%m-%d %H-%M-%S",
-                    ) + timedelta(
-                        days=(
-                            1
-                            if datetime.strptime(json_file.stem, "%H-%M-%S").time()
-                            < datetime.min.time().replace(hour=4)
-                            else 0
-                        )
+                data["drop_statistics"] = {}
+                cur.execute(
+                    "SELECT stage, item, SUM(count) FROM history_drop "
+                    "JOIN history_key USING(date, user, run_time) "
+                    "GROUP BY stage, item ORDER BY MIN(history_drop.rowid)"
+                )
+            for stage, item, count in cur.fetchall():
+                data["drop_statistics"].setdefault(stage, {})[item] = count
+
+            # 录入运行结果
+            cur.execute(
+                "SELECT date, user, run_time, result FROM history_index "
+                "JOIN history_key USING(date, user, run_time)"
+            )
+            for date, user, run_time, result in cur.fetchall():
+
+                actual_date = datetime.strptime(
+                    f"{date} {run_time}", "%Y-%m-%d %H-%M-%S"
+                ) + timedelta(
+                    days=(
+                        1
+                        if datetime.strptime(run_time, "%H-%M-%S").time()
+                        < datetime.min.time().replace(hour=4)
+                        else 0
                     )
+                )
 
-                    if single_data[key] != "Success!":
-                        if "error_info" not in data:
-                            data["error_info"] = {}
-                        data["error_info"][actual_date.strftime("%d日 %H:%M:%S")] = (
-                            single_data[key]
-                        )
+                if result != "Success!":
+                    if "error_info" not in data:
+                        data["error_info"] = {}
+                    data["error_info"][actual_date.strftime("%d日 %H:%M:%S")] = result
 
-                    data["index"][actual_date] = [
-                        actual_date.strftime("%d日 %H:%M:%S"),
-                        ("完成" if single_data[key] == "Success!" else "异常"),
-                        json_file,
-                    ]
+                data["index"][actual_date] = [
+                    actual_date.strftime("%d日 %H:%M:%S"),
+                    ("完成" if result == "Success!" else "异常"),
+                    self.app_path / f"history/{date}/{user}/{run_time}.json",
+                ]
+
+            cur.execute("DROP TABLE history_key")
+            cur.close()
+        finally:
+            db.close()
 
         data["index"] = [data["index"][_] for _ in sorted(data["index"])]
 
@@ -1792,7 +2355,7 @@ class AppConfig(GlobalConfig):
         :param mode: 合并模式（按日合并、按周合并、按月合并）
         :param start_date: 开始日期
         :param end_date: 结束日期
-        :return: 搜索到的历史记录字典
+        :return: 搜索到的历史记录字典，按合并区间给出实际覆盖的日期范围与各用户记录
         """
 
         logger.info(
@@ -1802,43 +2365,51 @@ class AppConfig(GlobalConfig):
 
         history_dict = {}
 
-        for date_folder in (Config.app_path / "history").iterdir():
-            if not date_folder.is_dir():
-                continue  # 只处理日期文件夹
-
-            try:
-
-                date = datetime.strptime(date_folder.name, "%Y-%m-%d")
-
-                if not (start_date <= date <= end_date):
-                    continue  # 只统计在范围内的日期
-
-                if mode == "按日合并":
-                    date_name = date.strftime("%Y年 %m月 %d日")
-                elif mode == "按周合并":
-                    year, week, _ = date.isocalendar()
-                    date_name = f"{year}年 第{week}周"
-                elif mode == "按月合并":
-                    date_name = date.strftime("%Y年 %m月")
-
-                if date_name not in history_dict:
-                    history_dict[date_name] = {}
-
-                for user_folder in date_folder.iterdir():
-                    if not user_folder.is_dir():
-                        continue  # 只处理用户文件夹
-
-                    if user_folder.stem not in history_dict[date_name]:
-                        history_dict[date_name][user_folder.stem] = list(
-                            user_folder.with_suffix("").glob("*.json")
-                        )
-                    else:
-                        history_dict[date_name][user_folder.stem] += list(
-                            user_folder.with_suffix("").glob("*.json")
-                        )
-
-            except ValueError:
-                logger.warning(f"非日期格式的目录: {date_folder}")
+        # 已清理的日期仅保留日汇总，同样需要列出对应用户
+        db = sqlite3.connect(self.database_path)
+        cur = db.cursor()
+        cur.execute(
+            "SELECT date, user, run_time FROM history_index "
+            "WHERE date BETWEEN ?1 AND ?2 "
+            "UNION SELECT date, user, NULL FROM history_rollup_recruit "
+            "WHERE date BETWEEN ?1 AND ?2 "
+            "UNION SELECT date, user, NULL FROM history_rollup_drop "
+            "WHERE date BETWEEN ?1 AND ?2 "
+            "ORDER BY date, user, run_time",
+            (start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")),
+        )
+        rows = cur.fetchall()
+        cur.close()
+        db.close()
+
+        for date_text, user, run_time in rows:
+
+            date = datetime.strptime(date_text, "%Y-%m-%d")
+
+            if mode == "按日合并":
+                date_name = date.strftime("%Y年 %m月 %d日")
+                begin, end = date, date
+            elif mode == "按周合并":
+                year, week, weekday = date.isocalendar()
+                date_name = f"{year}年 第{week}周"
+                begin = date - timedelta(days=weekday - 1)
+                end = begin + timedelta(days=6)
+            elif mode == "按月合并":
+                date_name = date.strftime("%Y年 %m月")
+                begin = date.replace(day=1)
+                end = date.replace(day=calendar.monthrange(date.year, date.month)[1])
+
+            path_list = history_dict.setdefault(
+                date_name,
+                {
+                    "Range": (max(begin, start_date), min(end, end_date)),
+                    "User": {},
+                },
+            )["User"].setdefault(user, [])
+            if run_time is not None:
+                path_list.append(
+                    self.app_path / f"history/{date_text}/{user}/{run_time}.json"
+                )
 
         logger.success(
             f"历史记录搜索完成，共计 {len(history_dict)} 条记录", module="配置管理"
@@ -1858,7 +2429,7 @@ class AppConfig(GlobalConfig):
 
         logger.info("开始清理超过设定天数的历史记录", module="配置管理")
 
-        deleted_count = 0
+        deleted_dates = []
 
         for date_folder in (self.app_path / "history").iterdir():
             if not date_folder.is_dir():
@@ -1871,12 +2442,22 @@ class AppConfig(GlobalConfig):
                     days=self.get(self.function_HistoryRetentionTime)
                 ):
                     shutil.rmtree(date_folder, ignore_errors=True)
-                    deleted_count += 1
+                    deleted_dates.append((date_folder.name,))
                     logger.info(f"已删除超期日志目录: {date_folder}", module="配置管理")
             except ValueError:
                 logger.warning(f"非日期格式的目录: {date_folder}", module="配置管理")
 
-        logger.success(f"清理完成: {deleted_count} 个日期目录", module="配置管理")
+        # 同步移除历史记录索引，日汇总保留以维持长期统计
+        db = sqlite3.connect(self.database_path)
+        cur = db.cursor()
+        cur.executemany("DELETE FROM history_index WHERE date = ?", deleted_dates)
+        cur.executemany("DELETE FROM history_recruit WHERE date = ?", deleted_dates)
+        cur.executemany("DELETE FROM history_drop WHERE date = ?", deleted_dates)
+        db.commit()
+        cur.close()
+        db.close()
+
+        logger.success(f"清理完成: {len(deleted_dates)} 个日期目录", module="配置管理")
 
 
 Config = AppConfig()
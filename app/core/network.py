@@ -20,29 +20,36 @@
 
 """
 AUTO_MAA
-AUTO_MAA网络请求线程
+AUTO_MAA网络请求组件
 v4.4
 作者：DLmaster_361
 """
 
-from PySide6.QtCore import QObject, QThread, QEventLoop
+from PySide6.QtCore import QObject, QEventLoop, Signal, Qt
 import re
 import time
+import threading
 import requests
 import truststore
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List, Optional
 
 from .logger import logger
 
 
-class NetworkThread(QThread):
-    """网络请求线程类"""
+class NetworkTask(QObject):
+    """网络请求任务类，由网络请求线程池执行"""
 
     max_retries = 3
     timeout = 10
     backoff_factor = 0.1
 
+    finished = Signal()
+
     def __init__(
         self,
         mode: str,
@@ -50,163 +57,306 @@ class NetworkThread(QThread):
         path: Path = None,
         files: Dict = None,
         data: Dict = None,
+        headers: Dict = None,
     ) -> None:
         super().__init__()
 
         self.setObjectName(
-            f"NetworkThread-{mode}-{re.sub(r'(&cdk=)[^&]+(&)', r'\1******\2', url)}"
+            f"NetworkTask-{mode}-{re.sub(r'(&cdk=)[^&]+(&)', r'\1******\2', url)}"
         )
 
-        logger.info(f"创建网络请求线程: {self.objectName()}", module="网络请求子线程")
+        logger.info(f"创建网络请求任务: {self.objectName()}", module="网络请求任务")
 
         self.mode = mode
         self.url = url
         self.path = path
         self.files = files
         self.data = data
-
-        from .config import Config
-
-        self.proxies = {
-            "http": Config.get(Config.update_ProxyAddress),
-            "https": Config.get(Config.update_ProxyAddress),
-        }
+        self.headers = headers
 
         self.status_code = None
         self.response_json = None
+        self.response_headers = {}
         self.error_message = None
 
+        self.future: Optional[Future] = None
+        self.if_cancelled = False
+        self.if_finished = False
+        self.callbacks: List[Callable[["NetworkTask"], None]] = []
+
         self.loop = QEventLoop()
+        # 强制排队连接，保证任务在调用方进入事件循环前完成时事件循环仍能正常退出
+        self.finished.connect(self.loop.quit, Qt.ConnectionType.QueuedConnection)
+        self.finished.connect(self.on_finished, Qt.ConnectionType.QueuedConnection)
+
+    @property
+    def key(self) -> Optional[tuple]:
+        """相同的 GET 请求共享同一键值，其余请求不参与合并"""
+
+        if self.mode != "get":
+            return None
+        return (self.url, tuple(sorted((self.headers or {}).items())))
+
+    def add_done_callback(self, callback: Callable[["NetworkTask"], None]) -> None:
+        """
+        添加请求完成后的回调，回调在任务所属线程执行，无需进入事件循环等待
+
+        :param callback: 以任务实例为参数的回调函数，任务已完成时立即调用
+        """
 
-        truststore.inject_into_ssl()  # 信任系统证书
+        if self.if_finished:
+            callback(self)
+        else:
+            self.callbacks.append(callback)
+
+    def on_finished(self) -> None:
+        """在任务所属线程标记任务完成并依次调用回调"""
+
+        if self.if_finished:
+            return None
+
+        self.if_finished = True
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.exception(
+                    f"任务 {self.objectName()} 回调执行失败：{e}",
+                    module="网络请求任务",
+                )
 
     @logger.catch
-    def run(self) -> None:
-        """运行网络请求线程"""
+    def run(self) -> dict:
+        """
+        执行网络请求，运行于线程池工作线程
+
+        :return: 请求结果字典
+        """
 
         if self.mode == "get":
-            self.get_json(self.url)
+            return self.get_json(self.url)
         elif self.mode == "get_file":
-            self.get_file(self.url, self.path)
+            return self.get_file(self.url, self.path)
         elif self.mode == "upload_file":
-            self.upload_file(self.url, self.files, self.data)
+            return self.upload_file(self.url, self.files, self.data)
+
+    def set_result(self, result: Optional[dict]) -> None:
+        """
+        写入请求结果并通知调用方
+
+        :param result: 请求结果字典
+        """
 
-    def get_json(self, url: str) -> None:
+        if not self.if_cancelled and result is not None:
+            self.status_code = result["status_code"]
+            self.response_json = result["response_json"]
+            self.response_headers = result["response_headers"]
+            self.error_message = result["error_message"]
+
+        self.finished.emit()
+
+    def get_json(self, url: str) -> dict:
         """
         通过get方法获取json数据
 
         :param url: 请求的URL
+        :return: 请求结果字典
         """
 
-        logger.info(f"子线程 {self.objectName()} 开始网络请求", module="网络请求子线程")
+        logger.info(f"任务 {self.objectName()} 开始网络请求", module="网络请求任务")
 
+        result = {
+            "status_code": None,
+            "response_json": None,
+            "response_headers": {},
+            "error_message": None,
+        }
         response = None
 
-        for _ in range(self.max_retries):
-            try:
-                response = requests.get(url, timeout=self.timeout, proxies=self.proxies)
-                self.status_code = response.status_code
-                self.response_json = response.json()
-                self.error_message = None
-                break
-            except Exception as e:
-                self.status_code = response.status_code if response else None
-                self.response_json = None
-                self.error_message = str(e)
-                logger.exception(
-                    f"子线程 {self.objectName()} 网络请求失败：{e}，第{_+1}次尝试",
-                    module="网络请求子线程",
-                )
-                time.sleep(self.backoff_factor)
+        # 连接层面的重试由共享会话统一处理
+        try:
+            response = Network.get_session().get(
+                url, headers=self.headers, timeout=self.timeout
+            )
+            result["status_code"] = response.status_code
+            result["response_headers"] = dict(response.headers)
+            # 条件请求命中时无响应体
+            result["response_json"] = (
+                None if response.status_code == 304 else response.json()
+            )
+        except Exception as e:
+            result["status_code"] = response.status_code if response else None
+            result["response_json"] = None
+            result["error_message"] = str(e)
+            logger.exception(
+                f"任务 {self.objectName()} 网络请求失败：{e}",
+                module="网络请求任务",
+            )
 
-        self.loop.quit()
+        return result
 
-    def get_file(self, url: str, path: Path) -> None:
+    def get_file(self, url: str, path: Path) -> dict:
         """
         通过get方法下载文件到指定路径
 
         :param url: 请求的URL
         :param path: 下载文件的保存路径
+        :return: 请求结果字典
         """
 
-        logger.info(f"子线程 {self.objectName()} 开始下载文件", module="网络请求子线程")
+        logger.info(f"任务 {self.objectName()} 开始下载文件", module="网络请求任务")
 
+        result = {
+            "status_code": None,
+            "response_json": None,
+            "response_headers": {},
+            "error_message": None,
+        }
         response = None
 
         try:
-            response = requests.get(url, timeout=self.timeout, proxies=self.proxies)
+            response = Network.get_session().get(url, timeout=self.timeout)
+            result["status_code"] = response.status_code
             if response.status_code == 200:
                 with open(path, "wb") as file:
                     file.write(response.content)
-                self.status_code = response.status_code
-                self.error_message = None
             else:
-                self.status_code = response.status_code
-                self.error_message = f"下载失败，状态码: {response.status_code}"
+                result["error_message"] = f"下载失败，状态码: {response.status_code}"
 
         except Exception as e:
-            self.status_code = response.status_code if response else None
-            self.error_message = str(e)
+            result["status_code"] = response.status_code if response else None
+            result["error_message"] = str(e)
             logger.exception(
-                f"子线程 {self.objectName()} 网络请求失败：{e}", module="网络请求子线程"
+                f"任务 {self.objectName()} 网络请求失败：{e}", module="网络请求任务"
             )
 
-        self.loop.quit()
+        return result
 
-    def upload_file(self, url: str, files: Dict, data: Dict = None) -> None:
+    def upload_file(self, url: str, files: Dict, data: Dict = None) -> dict:
         """
         通过POST方法上传文件
 
         :param url: 请求的URL
         :param files: 文件字典，格式为 {'file': ('filename', file_obj, 'content_type')}
         :param data: 表单数据字典
+        :return: 请求结果字典
         """
 
-        logger.info(f"子线程 {self.objectName()} 开始上传文件", module="网络请求子线程")
+        logger.info(f"任务 {self.objectName()} 开始上传文件", module="网络请求任务")
 
+        result = {
+            "status_code": None,
+            "response_json": None,
+            "response_headers": {},
+            "error_message": None,
+        }
         response = None
 
         for _ in range(self.max_retries):
             try:
-                response = requests.post(
-                    url,
-                    files=files,
-                    data=data,
-                    timeout=self.timeout,
-                    proxies=self.proxies,
+                response = Network.get_session().post(
+                    url, files=files, data=data, timeout=self.timeout
                 )
-                self.status_code = response.status_code
+                result["status_code"] = response.status_code
 
                 # 尝试解析JSON响应
                 try:
-                    self.response_json = response.json()
+                    result["response_json"] = response.json()
                 except ValueError:
                     # 如果不是JSON格式，保存文本内容
-                    self.response_json = {"text": response.text}
+                    result["response_json"] = {"text": response.text}
 
-                self.error_message = None
+                result["error_message"] = None
                 break
 
             except Exception as e:
-                self.status_code = response.status_code if response else None
-                self.response_json = None
-                self.error_message = str(e)
+                result["status_code"] = response.status_code if response else None
+                result["response_json"] = None
+                result["error_message"] = str(e)
                 logger.exception(
-                    f"子线程 {self.objectName()} 文件上传失败：{e}，第{_+1}次尝试",
-                    module="网络请求子线程",
+                    f"任务 {self.objectName()} 文件上传失败：{e}，第{_+1}次尝试",
+                    module="网络请求任务",
                 )
                 time.sleep(self.backoff_factor)
 
-        self.loop.quit()
+        return result
 
 
 class _Network(QObject):
-    """网络请求线程管理类"""
+    """网络请求任务管理类"""
+
+    max_workers = 4
+    max_retries = 3
+    backoff_factor = 0.1
+    pool_connections = 8
+    pool_maxsize = 16
 
     def __init__(self) -> None:
         super().__init__()
 
-        self.task_queue = []
+        self.task_queue: List[NetworkTask] = []
+        self.session_dict: Dict[str, requests.Session] = {}
+        self.session_lock = threading.Lock()
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="Network"
+        )
+        self.pending_dict: Dict[tuple, Future] = {}
+        self.waiter_dict: Dict[Future, List[NetworkTask]] = {}
+        self.pending_lock = threading.Lock()
+
+    def get_session(self, if_private: bool = False) -> requests.Session:
+        """
+        获取当前代理设置对应的共享会话，会话间复用连接池与重试策略
+
+        :param if_private: 是否返回使用独立 Cookie 的会话，该会话复用共享连接池，不可关闭
+        :return: requests.Session 实例
+        """
+
+        from .config import Config
+
+        proxy = Config.get(Config.update_ProxyAddress)
+
+        with self.session_lock:
+
+            if proxy not in self.session_dict:
+
+                logger.info(
+                    f"创建共享网络会话，代理：{proxy or '无'}", module="网络请求"
+                )
+
+                truststore.inject_into_ssl()  # 信任系统证书
+
+                session = requests.Session()
+                if proxy:
+                    session.proxies = {"http": proxy, "https": proxy}
+
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=Retry(
+                        total=self.max_retries,
+                        backoff_factor=self.backoff_factor,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        raise_on_status=False,
+                    ),
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
+                self.session_dict[proxy] = session
+
+            shared_session = self.session_dict[proxy]
+
+        if not if_private:
+            return shared_session
+
+        session = requests.Session()
+        session.proxies = shared_session.proxies.copy()
+        for prefix, adapter in shared_session.adapters.items():
+            session.mount(prefix, adapter)
+        return session
 
     def add_task(
         self,
@@ -215,7 +365,8 @@ class _Network(QObject):
         path: Path = None,
         files: Dict = None,
         data: Dict = None,
-    ) -> NetworkThread:
+        headers: Dict = None,
+    ) -> NetworkTask:
         """
         添加网络请求任务
 
@@ -224,29 +375,87 @@ class _Network(QObject):
         :param path: 下载文件的保存路径，仅在 mode 为 "get_file" 时有效
         :param files: 上传文件字典，仅在 mode 为 "upload_file" 时有效
         :param data: 表单数据字典，仅在 mode 为 "upload_file" 时有效
-        :return: 返回创建的 NetworkThread 实例
+        :param headers: 附加请求头，仅在 mode 为 "get" 时有效
+        :return: 返回创建的 NetworkTask 实例
         """
 
         logger.info(f"添加网络请求任务: {mode} {url} {path}", module="网络请求")
 
-        network_thread = NetworkThread(mode, url, path, files, data)
+        task = NetworkTask(mode, url, path, files, data, headers)
+
+        self.task_queue.append(task)
+
+        with self.pending_lock:
+
+            # 合并进行中的相同 GET 请求
+            if task.key is not None and task.key in self.pending_dict:
+                logger.info(
+                    f"合并至进行中的相同请求: {task.objectName()}", module="网络请求"
+                )
+                task.future = self.pending_dict[task.key]
+                self.waiter_dict[task.future].append(task)
+                return task
+
+            task.future = self.executor.submit(task.run)
+            if task.key is not None:
+                self.pending_dict[task.key] = task.future
+            self.waiter_dict[task.future] = [task]
+
+        task.future.add_done_callback(partial(self.task_done, task.key))
+
+        return task
+
+    def task_done(self, key: Optional[tuple], future: Future) -> None:
+        """
+        请求完成后向所有等待该请求的任务分发结果
+
+        :param key: 请求合并键值
+        :param future: 已完成的请求
+        """
+
+        with self.pending_lock:
+            if key is not None and self.pending_dict.get(key) is future:
+                self.pending_dict.pop(key)
+            waiters = self.waiter_dict.pop(future, [])
+
+        result = None if future.cancelled() else future.result()
+
+        for task in waiters:
+            task.set_result(result)
+
+    def cancel(self, task: NetworkTask) -> None:
+        """
+        取消网络请求任务，尚未开始且无其他等待者的请求将不再执行
+
+        :param task: 需要取消的网络请求任务
+        """
+
+        logger.info(f"取消网络请求任务: {task.objectName()}", module="网络请求")
+
+        task.if_cancelled = True
+        task.error_message = "请求已取消"
 
-        self.task_queue.append(network_thread)
+        with self.pending_lock:
+            waiters = self.waiter_dict.get(task.future, [])
+            if task in waiters:
+                waiters.remove(task)
+            if_cancel_future = not waiters
 
-        network_thread.start()
+        if if_cancel_future:
+            task.future.cancel()
 
-        return network_thread
+        task.finished.emit()
 
     def upload_config_file(
         self, file_path: Path, username: str = "", description: str = ""
-    ) -> NetworkThread:
+    ) -> NetworkTask:
         """
         上传配置文件到分享服务器
 
         :param file_path: 要上传的文件路径
         :param username: 用户名（可选）
         :param description: 文件描述（必填）
-        :return: 返回创建的 NetworkThread 实例
+        :return: 返回创建的 NetworkTask 实例
         """
 
         if not file_path.exists():
@@ -274,17 +483,18 @@ class _Network(QObject):
 
         return self.add_task("upload_file", url, files=files, data=data)
 
-    def get_result(self, network_thread: NetworkThread) -> dict:
+    def get_result(self, network_thread: NetworkTask) -> dict:
         """
         获取网络请求结果
 
-        :param network_thread: 网络请求线程实例
+        :param network_thread: 网络请求任务实例
         :return: 包含状态码、响应JSON和错误信息的字典
         """
 
         result = {
             "status_code": network_thread.status_code,
             "response_json": network_thread.response_json,
+            "response_headers": network_thread.response_headers,
             "error_message": (
                 re.sub(r"(&cdk=)[^&]+(&)", r"\1******\2", network_thread.error_message)
                 if network_thread.error_message
@@ -292,13 +502,11 @@ class _Network(QObject):
             ),
         }
 
-        network_thread.quit()
-        network_thread.wait()
         self.task_queue.remove(network_thread)
         network_thread.deleteLater()
 
         logger.info(
-            f"网络请求结果: {result['status_code']}，请求子线程已结束",
+            f"网络请求结果: {result['status_code']}，请求任务已结束",
             module="网络请求",
         )
 
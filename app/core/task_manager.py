@@ -32,7 +32,7 @@ from packaging import version
 from typing import Dict, Union
 
 from .logger import logger
-from .config import Config
+from .config import Config, ConfigWriter
 from .main_info_bar import MainInfoBar
 from .network import Network
 from .sound_player import SoundPlayer
@@ -391,6 +391,9 @@ class _TaskManager(QObject):
                     )
                 )
 
+        # 任务结束后立即写入任务期间变更的配置
+        ConfigWriter.flush()
+
         if Config.args.mode == "cli" and Config.power_sign == "NoAction":
             Config.set_power_sign("KillSelf")
 
@@ -25,9 +25,11 @@ v4.4
 作者：DLmaster_361
 """
 
-from PySide6.QtCore import QObject, QTimer
-from datetime import datetime
+from PySide6.QtCore import QObject, QTimer, Qt
+from datetime import datetime, timedelta
+import heapq
 import keyboard
+from typing import List, Tuple
 
 from .logger import logger
 from .config import Config
@@ -41,19 +43,28 @@ class _MainTimer(QObject):
         super().__init__(parent)
 
         self.Timer = QTimer()
-        self.Timer.timeout.connect(self.timed_start)
         self.Timer.timeout.connect(self.set_silence)
         self.Timer.timeout.connect(self.check_power)
 
         self.LongTimer = QTimer()
         self.LongTimer.timeout.connect(self.long_timed_task)
 
+        # 定时启动调度索引：按下次触发时间排列的最小堆，由单次定时器唤醒
+        self.schedule_heap: List[Tuple[datetime, str]] = []
+        self.ScheduleTimer = QTimer()
+        self.ScheduleTimer.setSingleShot(True)
+        self.ScheduleTimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.ScheduleTimer.timeout.connect(self.timed_start)
+
+        Config.queue_changed.connect(self.rebuild_schedule)
+
     def start(self):
         """启动定时器"""
 
         logger.info("启动主定时器", module="主业务定时器")
         self.Timer.start(1000)
         self.LongTimer.start(3600000)
+        self.rebuild_schedule()
 
     def stop(self):
         """停止定时器"""
@@ -63,6 +74,8 @@ class _MainTimer(QObject):
         self.Timer.deleteLater()
         self.LongTimer.stop()
         self.LongTimer.deleteLater()
+        self.ScheduleTimer.stop()
+        self.ScheduleTimer.deleteLater()
 
     def long_timed_task(self):
         """长时间定期检定任务"""
@@ -74,32 +87,108 @@ class _MainTimer(QObject):
         if Config.get(Config.update_IfAutoUpdate):
             Config.main_window.setting.check_update()
 
+    def next_fire_time(self, name: str, after: datetime) -> datetime:
+        """
+        计算调度队列在指定时刻之后的下次定时启动时间
+
+        :param name: 调度队列名称
+        :param after: 起算时刻
+        :return: 下次启动时间，未启用定时启动时返回 None
+        """
+
+        queue_config = Config.queue_dict[name]["Config"]
+
+        if not queue_config.get(queue_config.QueueSet_TimeEnabled):
+            return None
+
+        fire_time_list = []
+
+        for i in range(10):
+
+            if not queue_config.get(
+                queue_config.config_item_dict["Time"][f"Enabled_{i}"]
+            ):
+                continue
+
+            try:
+                set_time = datetime.strptime(
+                    queue_config.get(queue_config.config_item_dict["Time"][f"Set_{i}"]),
+                    "%H:%M",
+                ).time()
+            except ValueError:
+                continue
+
+            fire_time = datetime.combine(after.date(), set_time)
+            if fire_time <= after:
+                fire_time += timedelta(days=1)
+            fire_time_list.append(fire_time)
+
+        return min(fire_time_list) if fire_time_list else None
+
+    def rebuild_schedule(self):
+        """根据调度队列配置重建定时启动调度索引"""
+
+        # 从当前分钟起算，保证配置变化不会跳过正处于当前分钟的定时项
+        after = datetime.now().replace(second=0, microsecond=0) - timedelta(
+            microseconds=1
+        )
+
+        self.schedule_heap = []
+        for name in Config.queue_dict.keys():
+            fire_time = self.next_fire_time(name, after)
+            if fire_time is not None:
+                self.schedule_heap.append((fire_time, name))
+        heapq.heapify(self.schedule_heap)
+
+        logger.info(
+            f"定时启动调度索引已重建，共 {len(self.schedule_heap)} 个调度队列",
+            module="主业务定时器",
+        )
+
+        self.arm_schedule()
+
+    def arm_schedule(self):
+        """将调度定时器设置为在最近的定时启动时间唤醒"""
+
+        self.ScheduleTimer.stop()
+
+        if not self.schedule_heap:
+            return None
+
+        # 单次休眠不超过一小时，以便系统时间调整或休眠唤醒后重新校准
+        delay = (self.schedule_heap[0][0] - datetime.now()).total_seconds()
+        self.ScheduleTimer.start(int(min(max(delay, 0), 3600) * 1000))
+
     def timed_start(self):
         """定时启动代理任务"""
 
-        for name, info in Config.queue_dict.items():
+        now = datetime.now()
+
+        while self.schedule_heap and self.schedule_heap[0][0] <= now:
 
-            if not info["Config"].get(info["Config"].QueueSet_TimeEnabled):
+            fire_time, name = heapq.heappop(self.schedule_heap)
+
+            if name not in Config.queue_dict:
                 continue
 
-            data = info["Config"].toDict()
+            queue_config = Config.queue_dict[name]["Config"]
 
-            time_set = [
-                data["Time"][f"Set_{_}"]
-                for _ in range(10)
-                if data["Time"][f"Enabled_{_}"]
-            ]
-            # 按时间调起代理任务
-            curtime = datetime.now().strftime("%Y-%m-%d %H:%M")
+            # 按时间调起代理任务，错过当前分钟的定时项不再补执行
+            curtime = fire_time.strftime("%Y-%m-%d %H:%M")
             if (
-                curtime[11:16] in time_set
-                and curtime
-                != info["Config"].get(info["Config"].Data_LastProxyTime)[:16]
+                now - fire_time < timedelta(minutes=1)
+                and curtime != queue_config.get(queue_config.Data_LastProxyTime)[:16]
                 and name not in Config.running_list
             ):
 
                 logger.info(f"定时唤起任务：{name}。", module="主业务定时器")
-                TaskManager.add_task("自动代理_新调度台", name, data)
+                TaskManager.add_task("自动代理_新调度台", name, queue_config.toDict())
+
+            next_time = self.next_fire_time(name, max(now, fire_time))
+            if next_time is not None:
+                heapq.heappush(self.schedule_heap, (next_time, name))
+
+        self.arm_schedule()
 
     def set_silence(self):
         """设置静默模式"""
@@ -25,21 +25,254 @@ v4.4
 作者：DLmaster_361
 """
 
-from PySide6.QtCore import QObject, Signal, QEventLoop, QFileSystemWatcher, QTimer
+from PySide6.QtCore import (
+    QObject,
+    QThread,
+    Signal,
+    QEventLoop,
+    QFileSystemWatcher,
+    QTimer,
+)
 import json
+import copy
+import queue
 import subprocess
+import socket
 import shutil
 import re
 import win32com.client
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple, Optional
 
-from app.core import Config, MaaConfig, MaaUserConfig, logger
+from app.core import Config, MaaConfig, MaaUserConfig, MaaLogStatistics, logger
 from app.services import Notify, Crypto, System, skland_sign_in
-from app.utils import ProcessManager
+from app.utils import LogReader, ProcessManager
+
+# MAA日志消息与状态标记的对照表，新增MAA日志消息时仅需修改此表
+# 任务完成标记与 MaaManager.task_dict 的键保持一致
+MAA_LOG_MESSAGES: Dict[str, str] = {
+    "任务出错: StartUp": "StartUpError",
+    "任务出错: 开始唤醒": "StartUpError",
+    "任务出错: 刷理智": "CombatError",
+    "任务已全部完成！": "AllCompleted",
+    "完成任务: StartUp": "WakeUp",
+    "完成任务: 开始唤醒": "WakeUp",
+    "完成任务: Recruit": "Recruiting",
+    "完成任务: 自动公招": "Recruiting",
+    "完成任务: Infrast": "Base",
+    "完成任务: 基建换班": "Base",
+    "完成任务: Fight": "Combat",
+    "完成任务: 刷理智": "Combat",
+    "完成任务: Mall": "Mall",
+    "完成任务: 获取信用及购物": "Mall",
+    "完成任务: Award": "Mission",
+    "完成任务: 领取奖励": "Mission",
+    "完成任务: Roguelike": "AutoRoguelike",
+    "完成任务: 自动肉鸽": "AutoRoguelike",
+    "完成任务: Reclamation": "Reclamation",
+    "完成任务: 生息演算": "Reclamation",
+    "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣": "ADBError",
+    "未检测到任何模拟器": "NoEmulator",
+    "已停止": "Stopped",
+    "MaaAssistantArknights GUI exited": "Exited",
+}
+
+# 各日志检查模式下状态标记到运行结果的映射，按优先级排序
+MAA_LOG_RESULTS: Dict[str, List[Tuple[str, str]]] = {
+    "自动代理": [
+        ("StartUpError", "MAA未能正确登录PRTS"),
+        ("AllCompleted", "Success!"),
+        ("ADBError", "MAA的ADB连接异常"),
+        ("NoEmulator", "MAA未检测到任何模拟器"),
+        ("Stopped", "MAA在完成任务前中止"),
+        ("Exited", "MAA在完成任务前退出"),
+    ],
+    "人工排查": [
+        ("WakeUp", "Success!"),
+        ("ADBError", "MAA的ADB连接异常"),
+        ("NoEmulator", "MAA未检测到任何模拟器"),
+        ("Stopped", "MAA在完成任务前中止"),
+        ("Exited", "MAA在完成任务前退出"),
+    ],
+    "设置MAA": [("Exited", "Success!")],
+}
+
+# 不计入最近日志时间的日志消息
+MAA_LOG_IGNORED_TIME = "如果长时间无进一步日志更新，可能需要手动干预。"
+
+
+class MaaLogAnalyzer:
+    """MAA日志流式分析器，逐行匹配新增日志并维护运行状态标记"""
+
+    pattern = re.compile(
+        "|".join(re.escape(_) for _ in sorted(MAA_LOG_MESSAGES, key=len, reverse=True))
+    )
+
+    def __init__(self):
+
+        self.reset(datetime.now())
+
+    def reset(self, start_time: datetime) -> None:
+        """
+        重置分析状态
+
+        :param start_time: 日志起始时间
+        """
+
+        self.flags = set()
+        self.latest_time = start_time
+
+    def feed(self, lines: List[str]) -> None:
+        """
+        分析新增日志行并更新状态标记
+
+        :param lines: 新增的日志行列表
+        """
+
+        for line in lines:
+            for match in self.pattern.finditer(line):
+                self.flags.add(MAA_LOG_MESSAGES[match.group()])
+
+        # 仅需解析本批日志中最后一条带时间的日志
+        for line in lines[::-1]:
+            if MAA_LOG_IGNORED_TIME in line:
+                continue
+            try:
+                self.latest_time = datetime.strptime(line[1:20], "%Y-%m-%d %H:%M:%S")
+                break
+            except ValueError:
+                pass
+
+    def get_result(self, mode: str) -> Optional[str]:
+        """
+        根据当前状态标记获取运行结果
+
+        :param mode: 日志检查模式，支持 "自动代理", "人工排查", "设置MAA"
+        :return: 运行结果，未匹配到任何结果时返回 None
+        """
+
+        for flag, result in MAA_LOG_RESULTS[mode]:
+            if flag in self.flags:
+                return result
+
+        return None
+
+
+class MaaTasksPatcher:
+    """MAA任务文件修补器，记录任务文件状态，仅在需要修改时读写任务文件"""
+
+    task_name = "BilibiliAgreement_AUTO"
+    task = {
+        "algorithm": "OcrDetect",
+        "action": "ClickSelf",
+        "text": ["同意"],
+        "maxTimes": 5,
+        "Doc": "关闭B服用户协议",
+        "next": ["StartUpThemes#next"],
+    }
+
+    # 任务文件路径与 (修改时间, 文件大小, Bilibili协议任务状态) 的对照表，跨实例共享
+    state_dict: Dict[Path, Tuple[int, int, bool]] = {}
+
+    def __init__(self, tasks_path: Path):
+
+        self.tasks_path = tasks_path
+
+    def get_file_state(self) -> Tuple[int, int]:
+        """获取任务文件的修改时间与大小"""
+
+        stat = self.tasks_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def set_bilibili_agreement(self, if_agree: bool) -> bool:
+        """
+        设置Bilibili协议相关任务状态
+
+        :param if_agree: 是否启用Bilibili协议相关任务
+        :return: 是否修改了任务文件
+        """
+
+        if self.state_dict.get(self.tasks_path) == (*self.get_file_state(), if_agree):
+            return False
+
+        with self.tasks_path.open(mode="r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        next_list = data["StartUpThemes"]["next"]
+        if_agreed = (
+            data.get(self.task_name) == self.task and self.task_name in next_list
+        )
+        if_disagreed = self.task_name not in data and self.task_name not in next_list
+
+        if (if_agree and not if_agreed) or (not if_agree and not if_disagreed):
+
+            if if_agree:
+                data[self.task_name] = self.task
+                if self.task_name not in next_list:
+                    next_list.insert(0, self.task_name)
+            else:
+                data.pop(self.task_name, None)
+                if self.task_name in next_list:
+                    next_list.remove(self.task_name)
+
+            # 先写入临时文件再替换，避免中断时损坏任务文件
+            temp_path = self.tasks_path.with_suffix(".json.tmp")
+            with temp_path.open(mode="w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+            temp_path.replace(self.tasks_path)
+            if_changed = True
+
+        else:
+            if_changed = False
+
+        self.state_dict[self.tasks_path] = (*self.get_file_state(), if_agree)
+        return if_changed
+
+
+class MaaGuiComposer:
+    """MAA配置文件组装器，缓存已解析的配置文件，在内存中组装配置后一次性写入"""
+
+    def __init__(self):
+
+        # 配置文件路径与 (修改时间, 文件大小, 解析结果) 的对照表
+        self.cache_dict: Dict[Path, Tuple[int, int, dict]] = {}
+
+    def load(self, path: Path) -> dict:
+        """
+        读取配置文件，文件未修改时直接使用缓存的解析结果
+
+        :param path: 配置文件路径
+        :return: 配置文件内容的副本
+        """
+
+        stat = path.stat()
+        cache = self.cache_dict.get(path)
+
+        if cache is None or cache[:2] != (stat.st_mtime_ns, stat.st_size):
+            with path.open(mode="r", encoding="utf-8") as f:
+                cache = (stat.st_mtime_ns, stat.st_size, json.load(f))
+            self.cache_dict[path] = cache
+
+        return copy.deepcopy(cache[2])
+
+    def write(self, path: Path, data: dict) -> None:
+        """
+        原子写入配置文件，并缓存写入的内容
+
+        :param path: 配置文件路径
+        :param data: 配置文件内容
+        """
+
+        temp_path = path.with_suffix(".json.tmp")
+        with temp_path.open(mode="w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        temp_path.replace(path)
+
+        stat = path.stat()
+        self.cache_dict[path] = (stat.st_mtime_ns, stat.st_size, copy.deepcopy(data))
 
 
 class MaaManager(QObject):
@@ -70,14 +303,25 @@ class MaaManager(QObject):
             ],
         ],
         user_config_path: Path = None,
+        worker: Dict[str, str] = None,
+        primary: "MaaManager" = None,
     ):
         super(MaaManager, self).__init__()
 
         self.user_list = ""
         self.mode = mode
+        self.script_config = config
         self.config_path = config["Path"]
-        self.name = config["Config"].get(config["Config"].MaaSet_Name)
         self.user_config_path = user_config_path
+        self.worker = worker
+        self.worker_list: List[MaaWorker] = []
+        self.user_queue: Optional[queue.Queue] = None
+
+        # 多开实例直接共享主调度器已整理的配置与用户数据，不在实例线程中访问配置对象
+        if primary is None:
+            self.name = config["Config"].get(config["Config"].MaaSet_Name)
+        else:
+            self.name = f"{primary.name}-{self.worker["Name"]}"
 
         self.emulator_process_manager = ProcessManager()
         self.maa_process_manager = ProcessManager()
@@ -90,8 +334,20 @@ class MaaManager(QObject):
         self.log_start_time = datetime.now()
         self.log_check_mode = None
         self.maa_logs = []
+        self.maa_log_analyzer = MaaLogAnalyzer()
+        self.maa_log_statistics = MaaLogStatistics()
         self.maa_result = "Wait"
 
+        # 上一用户的日志保存与通知推送在后台按序执行，与下一用户的启动流程重叠
+        self.post_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"MAA-{self.name}"
+        )
+        # 预启动的下一用户模拟器
+        self.prewarm_process_manager = ProcessManager()
+        self.prewarm_emulator = None
+        self.prewarm_start_time = None
+        self.if_prewarm = True
+
         self.maa_process_manager.processClosed.connect(self.check_maa_log)
 
         self.question_loop = QEventLoop()
@@ -106,10 +362,17 @@ class MaaManager(QObject):
         self.maa_version = None
         self.maa_update_package = ""
         self.task_dict = {}
-        self.set = config["Config"].toDict()
 
-        self.data = {}
-        if "设置MAA" not in self.mode:
+        if primary is not None:
+            self.set = primary.set
+            self.data = primary.data
+            self.user_list = primary.user_list
+
+        else:
+            self.set = config["Config"].toDict()
+            self.data = {}
+
+        if primary is None and "设置MAA" not in self.mode:
             for name, info in config["UserData"].items():
                 self.data[name] = {
                     "Path": info["Path"],
@@ -129,14 +392,20 @@ class MaaManager(QObject):
     def configure(self):
         """提取配置信息"""
 
-        self.maa_root_path = Path(self.set["MaaSet"]["Path"])
+        self.maa_root_path = Path(
+            (self.worker or {}).get("Path") or self.set["MaaSet"]["Path"]
+        )
         self.maa_set_path = self.maa_root_path / "config/gui.json"
         self.maa_log_path = self.maa_root_path / "debug/gui.log"
         self.maa_exe_path = self.maa_root_path / "MAA.exe"
+        self.maa_log_reader = LogReader(self.maa_log_path)
         self.maa_tasks_path = self.maa_root_path / "resource/tasks/tasks.json"
+        self.maa_tasks_patcher = MaaTasksPatcher(self.maa_tasks_path)
+        self.maa_gui_composer = MaaGuiComposer()
+        # 多开实例仅使用各自配置的ADB地址，不搜索相邻端口，避免连接到其他实例的模拟器
+        search_range = 0 if self.worker else self.set["RunSet"]["ADBSearchRange"]
         self.port_range = [0] + [
-            (i // 2 + 1) * (-1 if i % 2 else 1)
-            for i in range(0, 2 * self.set["RunSet"]["ADBSearchRange"])
+            (i // 2 + 1) * (-1 if i % 2 else 1) for i in range(0, 2 * search_range)
         ]
 
         logger.success("MAA配置提取完成", module=f"MAA调度器-{self.name}")
@@ -166,6 +435,30 @@ class MaaManager(QObject):
             )
             return None
 
+        # 检查多开实例配置是否可用
+        if self.mode == "自动代理" and self.set["MaaSet"]["Workers"]:
+
+            worker_error = self.check_workers()
+            if worker_error is not None:
+
+                logger.error(
+                    f"多开实例配置有误：{worker_error}，MAA代理进程中止",
+                    module=f"MAA调度器-{self.name}",
+                )
+                self.push_info_bar.emit(
+                    "error",
+                    "启动MAA代理进程失败",
+                    f"多开实例配置有误：{worker_error}",
+                    -1,
+                )
+                self.accomplish.emit(
+                    {
+                        "Time": begin_time,
+                        "History": f"由于多开实例配置有误：{worker_error}，MAA代理进程中止",
+                    }
+                )
+                return None
+
         # 记录 MAA 配置文件
         logger.info(
             f"记录 MAA 配置文件：{self.maa_set_path}",
@@ -214,573 +507,15 @@ class MaaManager(QObject):
                 ] += f" - 第{self.data[_[2]]["Config"]["Data"]["ProxyTimes"] + 1}次代理"
 
             # 开始代理
-            for user in self.user_list:
-
-                user_data = self.data[user[2]]["Config"]
-
-                if self.isInterruptionRequested:
-                    break
-
-                if (
-                    self.set["RunSet"]["ProxyTimesLimit"] == 0
-                    or user_data["Data"]["ProxyTimes"]
-                    < self.set["RunSet"]["ProxyTimesLimit"]
-                ):
-                    user[1] = "运行"
-                    self.update_user_list.emit(self.user_list)
-                else:
-                    user[1] = "跳过"
-                    self.update_user_list.emit(self.user_list)
-                    continue
-
-                logger.info(f"开始代理用户: {user[0]}", module=f"MAA调度器-{self.name}")
-
-                # 简洁模式用户默认开启日常选项
-                if user_data["Info"]["Mode"] == "简洁":
-                    user_data["Info"]["Routine"] = True
-                # 详细模式用户首次代理需打开模拟器
-                elif user_data["Info"]["Mode"] == "详细":
-                    self.if_open_emulator = True
-
-                # 初始化代理情况记录和模式替换表
-                run_book = {
-                    "Annihilation": bool(user_data["Info"]["Annihilation"] == "Close"),
-                    "Routine": not user_data["Info"]["Routine"],
-                }
-                mode_book = {
-                    "Annihilation": "自动代理_剿灭",
-                    "Routine": "自动代理_日常",
-                }
-
-                user_logs_list = []
-                user_start_time = datetime.now()
-
-                if user_data["Info"]["IfSkland"] and user_data["Info"]["SklandToken"]:
-
-                    if user_data["Data"]["LastSklandDate"] != datetime.now().strftime(
-                        "%Y-%m-%d"
-                    ):
-
-                        self.update_log_text.emit("正在执行森空岛签到中\n请稍候~")
-
-                        skland_result = skland_sign_in(
-                            Crypto.win_decryptor(user_data["Info"]["SklandToken"])
-                        )
-
-                        for type, user_list in skland_result.items():
-
-                            if type != "总计" and len(user_list) > 0:
-
-                                logger.info(
-                                    f"用户: {user[0]} - 森空岛签到{type}: {'、'.join(user_list)}",
-                                    module=f"MAA调度器-{self.name}",
-                                )
-                                self.push_info_bar.emit(
-                                    "info",
-                                    f"森空岛签到{type}",
-                                    "、".join(user_list),
-                                    -1 if type == "失败" else 5000,
-                                )
-
-                        if skland_result["总计"] == 0:
-                            self.push_info_bar.emit(
-                                "info", "森空岛签到失败", user[0], -1
-                            )
-
-                        if (
-                            skland_result["总计"] > 0
-                            and len(skland_result["失败"]) == 0
-                        ):
-                            user_data["Data"][
-                                "LastSklandDate"
-                            ] = datetime.now().strftime("%Y-%m-%d")
-                            logger.success(
-                                f"用户: {user[0]} - 森空岛签到成功",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.play_sound.emit("森空岛签到成功")
-                        else:
-                            logger.warning(
-                                f"用户: {user[0]} - 森空岛签到失败",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.play_sound.emit("森空岛签到失败")
-
-                elif user_data["Info"]["IfSkland"]:
-                    logger.warning(
-                        f"用户: {user[0]} - 未配置森空岛签到Token，跳过森空岛签到",
-                        module=f"MAA调度器-{self.name}",
-                    )
-                    self.push_info_bar.emit(
-                        "warning", "森空岛签到失败", "未配置鹰角网络通行证登录凭证", -1
-                    )
-
-                # 剿灭-日常模式循环
-                for mode in ["Annihilation", "Routine"]:
+            if self.set["MaaSet"]["Workers"]:
+                self.run_workers(curdate, current_date)
+            else:
+                for user in self.user_list:
 
                     if self.isInterruptionRequested:
                         break
 
-                    if run_book[mode]:
-                        continue
-
-                    # 剿灭模式；满足条件跳过剿灭
-                    if (
-                        mode == "Annihilation"
-                        and self.set["RunSet"]["AnnihilationWeeklyLimit"]
-                        and datetime.strptime(
-                            user_data["Data"]["LastAnnihilationDate"], "%Y-%m-%d"
-                        ).isocalendar()[:2]
-                        == datetime.strptime(curdate, "%Y-%m-%d").isocalendar()[:2]
-                    ):
-                        logger.info(
-                            f"用户: {user_data['Info']['Name']} - 本周剿灭模式已达上限，跳过执行剿灭任务",
-                            module=f"MAA调度器-{self.name}",
-                        )
-                        run_book[mode] = True
-                        continue
-                    else:
-                        self.weekly_annihilation_limit_reached = False
-
-                    if (
-                        user_data["Info"]["Mode"] == "详细"
-                        and not (
-                            self.data[user[2]]["Path"] / "Routine/gui.json"
-                        ).exists()
-                    ):
-                        logger.error(
-                            f"用户: {user[0]} - 未找到日常详细配置文件",
-                            module=f"MAA调度器-{self.name}",
-                        )
-                        self.push_info_bar.emit(
-                            "error",
-                            "启动MAA代理进程失败",
-                            f"未找到{user[0]}的详细配置文件！",
-                            -1,
-                        )
-                        run_book[mode] = False
-                        break
-
-                    # 更新当前模式到界面
-                    self.update_user_list.emit(
-                        [
-                            (
-                                [f"{_[0]} - {mode_book[mode][5:7]}", _[1], _[2]]
-                                if _[2] == user[2]
-                                else _
-                            )
-                            for _ in self.user_list
-                        ]
-                    )
-
-                    # 解析任务构成
-                    if mode == "Routine":
-
-                        self.task_dict = {
-                            "WakeUp": str(user_data["Task"]["IfWakeUp"]),
-                            "Recruiting": str(user_data["Task"]["IfRecruiting"]),
-                            "Base": str(user_data["Task"]["IfBase"]),
-                            "Combat": str(user_data["Task"]["IfCombat"]),
-                            "Mission": str(user_data["Task"]["IfMission"]),
-                            "Mall": str(user_data["Task"]["IfMall"]),
-                            "AutoRoguelike": str(user_data["Task"]["IfAutoRoguelike"]),
-                            "Reclamation": str(user_data["Task"]["IfReclamation"]),
-                        }
-
-                    elif mode == "Annihilation":
-
-                        self.task_dict = {
-                            "WakeUp": "True",
-                            "Recruiting": "False",
-                            "Base": "False",
-                            "Combat": "True",
-                            "Mission": "False",
-                            "Mall": "False",
-                            "AutoRoguelike": "False",
-                            "Reclamation": "False",
-                        }
-
-                    logger.info(
-                        f"用户: {user[0]} - 模式: {mode_book[mode]} - 任务列表: {self.task_dict.values()}",
-                        module=f"MAA调度器-{self.name}",
-                    )
-
-                    # 尝试次数循环
-                    for i in range(self.set["RunSet"]["RunTimesLimit"]):
-
-                        if self.isInterruptionRequested:
-                            break
-
-                        if run_book[mode]:
-                            break
-
-                        logger.info(
-                            f"用户: {user[0]} - 模式: {mode_book[mode]} - 尝试次数: {i + 1}/{self.set["RunSet"]["RunTimesLimit"]}",
-                            module=f"MAA调度器-{self.name}",
-                        )
-
-                        # 配置MAA
-                        set = self.set_maa(mode_book[mode], user[2])
-                        # 记录当前时间
-                        self.log_start_time = datetime.now()
-
-                        # 记录模拟器与ADB路径
-                        self.emulator_path = Path(
-                            set["Configurations"]["Default"]["Start.EmulatorPath"]
-                        )
-                        self.emulator_arguments = set["Configurations"]["Default"][
-                            "Start.EmulatorAddCommand"
-                        ].split()
-                        # 如果是快捷方式，进行解析
-                        if (
-                            self.emulator_path.suffix == ".lnk"
-                            and self.emulator_path.exists()
-                        ):
-                            try:
-                                shell = win32com.client.Dispatch("WScript.Shell")
-                                shortcut = shell.CreateShortcut(str(self.emulator_path))
-                                self.emulator_path = Path(shortcut.TargetPath)
-                                self.emulator_arguments = shortcut.Arguments.split()
-                            except Exception as e:
-                                logger.exception(
-                                    f"解析快捷方式时出现异常：{e}",
-                                    module=f"MAA调度器-{self.name}",
-                                )
-                                self.push_info_bar.emit(
-                                    "error",
-                                    "解析快捷方式时出现异常",
-                                    "请检查快捷方式",
-                                    -1,
-                                )
-                                self.if_open_emulator = True
-                                break
-                        elif not self.emulator_path.exists():
-                            logger.error(
-                                f"模拟器快捷方式不存在：{self.emulator_path}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.push_info_bar.emit(
-                                "error",
-                                "启动模拟器时出现异常",
-                                "模拟器快捷方式不存在",
-                                -1,
-                            )
-                            self.if_open_emulator = True
-                            break
-
-                        self.wait_time = int(
-                            set["Configurations"]["Default"][
-                                "Start.EmulatorWaitSeconds"
-                            ]
-                        )
-
-                        self.ADB_path = Path(
-                            set["Configurations"]["Default"]["Connect.AdbPath"]
-                        )
-                        self.ADB_path = (
-                            self.ADB_path
-                            if self.ADB_path.is_absolute()
-                            else self.maa_root_path / self.ADB_path
-                        )
-                        self.ADB_address = set["Configurations"]["Default"][
-                            "Connect.Address"
-                        ]
-                        self.if_kill_emulator = bool(
-                            set["Configurations"]["Default"]["MainFunction.PostActions"]
-                            == "12"
-                        )
-                        self.if_open_emulator_process = bool(
-                            set["Configurations"]["Default"][
-                                "Start.OpenEmulatorAfterLaunch"
-                            ]
-                            == "True"
-                        )
-
-                        # 任务开始前释放ADB
-                        try:
-                            logger.info(
-                                f"释放ADB：{self.ADB_address}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            subprocess.run(
-                                [self.ADB_path, "disconnect", self.ADB_address],
-                                creationflags=subprocess.CREATE_NO_WINDOW,
-                            )
-                        except subprocess.CalledProcessError as e:
-                            # 忽略错误,因为可能本来就没有连接
-                            logger.warning(
-                                f"释放ADB时出现异常：{e}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                        except Exception as e:
-                            logger.exception(
-                                f"释放ADB时出现异常：{e}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.push_info_bar.emit(
-                                "error",
-                                "释放ADB时出现异常",
-                                "请检查MAA中ADB路径设置",
-                                -1,
-                            )
-
-                        if self.if_open_emulator_process:
-                            try:
-                                logger.info(
-                                    f"启动模拟器：{self.emulator_path}，参数：{self.emulator_arguments}",
-                                    module=f"MAA调度器-{self.name}",
-                                )
-                                self.emulator_process_manager.open_process(
-                                    self.emulator_path, self.emulator_arguments, 0
-                                )
-                            except Exception as e:
-                                logger.exception(
-                                    f"启动模拟器时出现异常：{e}",
-                                    module=f"MAA调度器-{self.name}",
-                                )
-                                self.push_info_bar.emit(
-                                    "error",
-                                    "启动模拟器时出现异常",
-                                    "请检查MAA中模拟器路径设置",
-                                    -1,
-                                )
-                                self.if_open_emulator = True
-                                break
-
-                        # 更新静默进程标记有效时间
-                        logger.info(
-                            f"更新静默进程标记：{self.emulator_path}，标记有效时间：{datetime.now() + timedelta(seconds=self.wait_time + 10)}",
-                            module=f"MAA调度器-{self.name}",
-                        )
-                        Config.silence_dict[self.emulator_path] = (
-                            datetime.now() + timedelta(seconds=self.wait_time + 10)
-                        )
-
-                        self.search_ADB_address()
-
-                        # 创建MAA任务
-                        logger.info(
-                            f"启动MAA进程：{self.maa_exe_path}",
-                            module=f"MAA调度器-{self.name}",
-                        )
-                        self.maa_process_manager.open_process(self.maa_exe_path, [], 0)
-
-                        # 监测MAA运行状态
-                        self.log_check_mode = mode_book[mode]
-                        self.start_monitor()
-
-                        # 处理MAA结果
-                        if self.maa_result == "Success!":
-
-                            # 标记任务完成
-                            run_book[mode] = True
-
-                            logger.info(
-                                f"用户: {user[0]} - MAA进程完成代理任务",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.update_log_text.emit(
-                                "检测到MAA进程完成代理任务\n正在等待相关程序结束\n请等待10s"
-                            )
-
-                        else:
-                            logger.error(
-                                f"用户: {user[0]} - 代理任务异常: {self.maa_result}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            # 打印中止信息
-                            # 此时，log变量内存储的就是出现异常的日志信息，可以保存或发送用于问题排查
-                            self.update_log_text.emit(
-                                f"{self.maa_result}\n正在中止相关程序\n请等待10s"
-                            )
-                            # 无命令行中止MAA与其子程序
-                            logger.info(
-                                f"中止MAA进程：{self.maa_exe_path}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.maa_process_manager.kill(if_force=True)
-                            System.kill_process(self.maa_exe_path)
-
-                            # 中止模拟器进程
-                            logger.info(
-                                f"中止模拟器进程：{list(self.emulator_process_manager.tracked_pids)}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.emulator_process_manager.kill()
-
-                            self.if_open_emulator = True
-
-                            # 推送异常通知
-                            Notify.push_plyer(
-                                "用户自动代理出现异常！",
-                                f"用户 {user[0].replace("_", " 今天的")}的{mode_book[mode][5:7]}部分出现一次异常",
-                                f"{user[0].replace("_", " ")}的{mode_book[mode][5:7]}出现异常",
-                                1,
-                            )
-                            if i == self.set["RunSet"]["RunTimesLimit"] - 1:
-                                self.play_sound.emit("子任务失败")
-                            else:
-                                self.play_sound.emit(self.maa_result)
-
-                        self.sleep(10)
-
-                        # 任务结束后释放ADB
-                        try:
-                            logger.info(
-                                f"释放ADB：{self.ADB_address}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            subprocess.run(
-                                [self.ADB_path, "disconnect", self.ADB_address],
-                                creationflags=subprocess.CREATE_NO_WINDOW,
-                            )
-                        except subprocess.CalledProcessError as e:
-                            # 忽略错误,因为可能本来就没有连接
-                            logger.warning(
-                                f"释放ADB时出现异常：{e}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                        except Exception as e:
-                            logger.exception(
-                                f"释放ADB时出现异常：{e}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.push_info_bar.emit(
-                                "error",
-                                "释放ADB时出现异常",
-                                "请检查MAA中ADB路径设置",
-                                -1,
-                            )
-                        # 任务结束后再次手动中止模拟器进程，防止退出不彻底
-                        if self.if_kill_emulator:
-                            logger.info(
-                                f"任务结束后再次中止模拟器进程：{list(self.emulator_process_manager.tracked_pids)}",
-                                module=f"MAA调度器-{self.name}",
-                            )
-                            self.emulator_process_manager.kill()
-                            self.if_open_emulator = True
-
-                        # 从配置文件中解析所需信息
-                        with self.maa_set_path.open(mode="r", encoding="utf-8") as f:
-                            data = json.load(f)
-
-                        # 记录自定义基建索引
-                        user_data["Data"]["CustomInfrastPlanIndex"] = data[
-                            "Configurations"
-                        ]["Default"]["Infrast.CustomInfrastPlanIndex"]
-
-                        # 记录更新包路径
-                        if (
-                            data["Global"]["VersionUpdate.package"]
-                            and (
-                                self.maa_root_path
-                                / data["Global"]["VersionUpdate.package"]
-                            ).exists()
-                        ):
-                            self.maa_update_package = data["Global"][
-                                "VersionUpdate.package"
-                            ]
-
-                        # 记录剿灭情况
-                        if (
-                            mode == "Annihilation"
-                            and self.weekly_annihilation_limit_reached
-                        ):
-                            user_data["Data"]["LastAnnihilationDate"] = curdate
-                        # 保存运行日志以及统计信息
-                        if_six_star = Config.save_maa_log(
-                            Config.app_path
-                            / f"history/{curdate}/{user_data["Info"]["Name"]}/{self.log_start_time.strftime("%H-%M-%S")}.log",
-                            self.maa_logs,
-                            self.maa_result,
-                        )
-                        user_logs_list.append(
-                            Config.app_path
-                            / f"history/{curdate}/{user_data["Info"]["Name"]}/{self.log_start_time.strftime("%H-%M-%S")}.json",
-                        )
-                        if if_six_star:
-                            self.push_notification(
-                                "公招六星",
-                                f"喜报：用户 {user[0]} 公招出六星啦！",
-                                {
-                                    "user_name": user_data["Info"]["Name"],
-                                },
-                                user_data,
-                            )
-                            self.play_sound.emit("六星喜报")
-
-                        # 执行MAA解压更新动作
-                        if self.maa_update_package:
-
-                            logger.info(
-                                f"检测到MAA更新，正在执行更新动作",
-                                module=f"MAA调度器-{self.name}",
-                            )
-
-                            self.update_log_text.emit(
-                                f"检测到MAA存在更新\nMAA正在执行更新动作\n请等待10s"
-                            )
-                            self.play_sound.emit("MAA更新")
-                            self.set_maa("更新MAA", None)
-                            subprocess.Popen(
-                                [self.maa_exe_path],
-                                creationflags=subprocess.CREATE_NO_WINDOW,
-                            )
-                            self.sleep(10)
-                            System.kill_process(self.maa_exe_path)
-
-                            self.maa_update_package = ""
-
-                            logger.info(
-                                f"更新动作结束", module=f"MAA调度器-{self.name}"
-                            )
-
-                # 发送统计信息
-                statistics = Config.merge_statistic_info(user_logs_list)
-                statistics["user_index"] = user[2]
-                statistics["user_info"] = user[0]
-                statistics["start_time"] = user_start_time.strftime("%Y-%m-%d %H:%M:%S")
-                statistics["end_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                statistics["maa_result"] = (
-                    "代理任务全部完成"
-                    if (run_book["Annihilation"] and run_book["Routine"])
-                    else "代理任务未全部完成"
-                )
-                self.push_notification(
-                    "统计信息",
-                    f"{current_date} | 用户 {user[0]} 的自动代理统计报告",
-                    statistics,
-                    user_data,
-                )
-
-                if run_book["Annihilation"] and run_book["Routine"]:
-                    # 成功完成代理的用户修改相关参数
-                    if (
-                        user_data["Data"]["ProxyTimes"] == 0
-                        and user_data["Info"]["RemainedDay"] != -1
-                    ):
-                        user_data["Info"]["RemainedDay"] -= 1
-                    user_data["Data"]["ProxyTimes"] += 1
-                    user[1] = "完成"
-                    logger.success(
-                        f"用户 {user[0]} 的自动代理任务已完成",
-                        module=f"MAA调度器-{self.name}",
-                    )
-                    Notify.push_plyer(
-                        "成功完成一个自动代理任务！",
-                        f"已完成用户 {user[0].replace("_", " 今天的")}任务",
-                        f"已完成 {user[0].replace("_", " 的")}",
-                        3,
-                    )
-                else:
-                    # 录入代理失败的用户
-                    logger.error(
-                        f"用户 {user[0]} 的自动代理任务未完成",
-                        module=f"MAA调度器-{self.name}",
-                    )
-                    user[1] = "异常"
-
-                self.update_user_list.emit(self.user_list)
+                    self.proxy_user(user, curdate, current_date)
 
         # 人工排查模式
         elif self.mode == "人工排查":
@@ -823,6 +558,7 @@ class MaaManager(QObject):
 
                     # 记录当前时间
                     self.log_start_time = datetime.now()
+                    self.reset_maa_log()
                     # 创建MAA任务
                     logger.info(
                         f"启动MAA进程：{self.maa_exe_path}",
@@ -857,7 +593,7 @@ class MaaManager(QObject):
                         self.maa_process_manager.kill(if_force=True)
                         System.kill_process(self.maa_exe_path)
                         self.if_open_emulator = True
-                        self.sleep(10)
+                        self.wait_process_exit(10)
 
                     # 登录成功，结束循环
                     if run_book[0]:
@@ -915,106 +651,1007 @@ class MaaManager(QObject):
             self.maa_process_manager.open_process(self.maa_exe_path, [], 0)
             # 记录当前时间
             self.log_start_time = datetime.now()
+            self.reset_maa_log()
 
             # 监测MAA运行状态
             self.log_check_mode = "设置MAA"
             self.start_monitor()
 
-            if "全局" in self.mode:
-                (self.config_path / "Default").mkdir(parents=True, exist_ok=True)
-                shutil.copy(self.maa_set_path, self.config_path / "Default")
-                logger.success(
-                    f"全局MAA配置文件已保存到 {self.config_path / 'Default/gui.json'}",
-                    module=f"MAA调度器-{self.name}",
+            if "全局" in self.mode:
+                (self.config_path / "Default").mkdir(parents=True, exist_ok=True)
+                shutil.copy(self.maa_set_path, self.config_path / "Default")
+                logger.success(
+                    f"全局MAA配置文件已保存到 {self.config_path / 'Default/gui.json'}",
+                    module=f"MAA调度器-{self.name}",
+                )
+
+            elif "用户" in self.mode:
+                self.user_config_path.mkdir(parents=True, exist_ok=True)
+                shutil.copy(self.maa_set_path, self.user_config_path)
+                logger.success(
+                    f"用户MAA配置文件已保存到 {self.user_config_path}",
+                    module=f"MAA调度器-{self.name}",
+                )
+
+            result_text = ""
+
+        # 等待后台任务完成并关闭未使用的预启动模拟器
+        self.wait_post_tasks()
+        self.stop_prewarm()
+
+        # 导出结果
+        if self.mode in ["自动代理", "人工排查"]:
+
+            # 关闭可能未正常退出的MAA进程
+            if self.isInterruptionRequested:
+                logger.info(
+                    f"关闭可能未正常退出的MAA进程：{self.maa_exe_path}",
+                    module=f"MAA调度器-{self.name}",
+                )
+                self.maa_process_manager.kill(if_force=True)
+                System.kill_process(self.maa_exe_path)
+
+            # 更新用户数据
+            updated_info = {_[2]: self.data[_[2]] for _ in self.user_list}
+            self.update_user_info.emit(self.config_path.name, updated_info)
+
+            error_index = [_[2] for _ in self.user_list if _[1] == "异常"]
+            over_index = [_[2] for _ in self.user_list if _[1] == "完成"]
+            wait_index = [_[2] for _ in self.user_list if _[1] == "等待"]
+
+            # 保存运行日志
+            title = (
+                f"{current_date} | {self.set["MaaSet"]["Name"]}的{self.mode[:4]}任务报告"
+                if self.set["MaaSet"]["Name"] != ""
+                else f"{current_date} | {self.mode[:4]}任务报告"
+            )
+            result = {
+                "title": f"{self.mode[:4]}任务报告",
+                "script_name": (
+                    self.set["MaaSet"]["Name"]
+                    if self.set["MaaSet"]["Name"] != ""
+                    else "空白"
+                ),
+                "start_time": begin_time,
+                "end_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "completed_count": len(over_index),
+                "uncompleted_count": len(error_index) + len(wait_index),
+                "failed_user": [
+                    self.data[_]["Config"]["Info"]["Name"] for _ in error_index
+                ],
+                "waiting_user": [
+                    self.data[_]["Config"]["Info"]["Name"] for _ in wait_index
+                ],
+            }
+
+            # 生成结果文本
+            result_text = (
+                f"任务开始时间：{result["start_time"]}，结束时间：{result["end_time"]}\n"
+                f"已完成数：{result["completed_count"]}，未完成数：{result["uncompleted_count"]}\n\n"
+            )
+            if len(result["failed_user"]) > 0:
+                result_text += f"{self.mode[2:4]}未成功的用户：\n{"\n".join(result["failed_user"])}\n"
+            if len(result["waiting_user"]) > 0:
+                result_text += f"\n未开始{self.mode[2:4]}的用户：\n{"\n".join(result["waiting_user"])}\n"
+
+            # 推送代理结果通知
+            Notify.push_plyer(
+                title.replace("报告", "已完成！"),
+                f"已完成用户数：{len(over_index)}，未完成用户数：{len(error_index) + len(wait_index)}",
+                f"已完成用户数：{len(over_index)}，未完成用户数：{len(error_index) + len(wait_index)}",
+                10,
+            )
+            Notify.flush_digest()
+            self.push_notification("代理结果", title, result)
+
+        # 复原 MAA 配置文件
+        logger.info(
+            f"复原 MAA 配置文件：{self.config_path / 'Temp/gui.json'}",
+            module=f"MAA调度器-{self.name}",
+        )
+        if (self.config_path / "Temp/gui.json").exists():
+            shutil.copy(self.config_path / "Temp/gui.json", self.maa_set_path)
+        shutil.rmtree(self.config_path / "Temp")
+
+        self.agree_bilibili(False)
+        self.log_monitor.deleteLater()
+        self.log_monitor_timer.deleteLater()
+        self.accomplish.emit({"Time": begin_time, "History": result_text})
+
+    def run_workers(self, curdate: str, current_date: str) -> None:
+        """
+        多开模式：将用户分派至多个MAA实例并行代理，结果直接写回共享的用户列表与用户数据
+
+        :param curdate: 当前服务器日期
+        :param current_date: 当前日期，用于通知标题
+        """
+
+        user_queue = queue.Queue()
+        for user in self.user_list:
+            user_queue.put(user)
+
+        # 多开实例列表包含全部实例，未指定MAA路径的实例使用主MAA路径
+        worker_info_list = [
+            {"Name": f"实例{i + 1}", **_}
+            for i, _ in enumerate(self.set["MaaSet"]["Workers"])
+        ]
+
+        logger.info(
+            f"多开模式启动，实例数：{len(worker_info_list)}",
+            module=f"MAA调度器-{self.name}",
+        )
+
+        self.worker_list = [
+            MaaWorker(self, worker_info, user_queue, curdate, current_date)
+            for worker_info in worker_info_list
+        ]
+        for worker in self.worker_list:
+            worker.start()
+
+        # 等待所有实例完成，期间处理各实例转发的信号
+        while any(worker.isRunning() for worker in self.worker_list):
+            QTimer.singleShot(1000, self.wait_loop.quit)
+            self.wait_loop.exec()
+
+        self.worker_list = []
+
+        logger.info("多开模式结束", module=f"MAA调度器-{self.name}")
+
+    def check_workers(self) -> Optional[str]:
+        """
+        检查多开实例配置，每个实例均需使用独立的MAA、模拟器与ADB地址
+
+        :return: 配置错误信息，配置可用时返回 None
+        """
+
+        maa_path_list = []
+        emulator_list = []
+        adb_address_list = []
+
+        for i, worker in enumerate(self.set["MaaSet"]["Workers"]):
+
+            name = f"实例{i + 1}"
+
+            if not worker.get("EmulatorPath"):
+                return f"{name}未配置模拟器路径"
+            if not worker.get("ADBAddress"):
+                return f"{name}未配置ADB地址"
+
+            maa_path = Path(worker.get("Path") or self.set["MaaSet"]["Path"]).resolve()
+            emulator = (
+                Path(worker["EmulatorPath"]).resolve(),
+                worker.get("EmulatorArgs", ""),
+            )
+
+            if maa_path in maa_path_list:
+                return f"{name}与其他实例使用了相同的MAA路径"
+            if emulator in emulator_list:
+                return f"{name}与其他实例使用了相同的模拟器"
+            if worker["ADBAddress"] in adb_address_list:
+                return f"{name}与其他实例使用了相同的ADB地址"
+
+            maa_path_list.append(maa_path)
+            emulator_list.append(emulator)
+            adb_address_list.append(worker["ADBAddress"])
+
+        return None
+
+    def work(self, user_queue: queue.Queue, curdate: str, current_date: str) -> None:
+        """
+        多开实例主体，从共享队列领取用户并代理，直至队列为空
+
+        :param user_queue: 待代理用户队列
+        :param curdate: 当前服务器日期
+        :param current_date: 当前日期，用于通知标题
+        """
+
+        self.configure()
+        if not self.maa_exe_path.exists() or not self.maa_set_path.exists():
+            logger.error(
+                "未正确配置多开实例的MAA路径，该实例不参与代理",
+                module=f"MAA调度器-{self.name}",
+            )
+            self.push_info_bar.emit(
+                "error", "多开实例启动失败", f"{self.name}的MAA路径不可用", -1
+            )
+            return None
+
+        # 记录本实例的 MAA 配置文件
+        backup = self.maa_set_path.read_bytes()
+
+        self.user_queue = user_queue
+        self.if_open_emulator = True
+        # 多开模式下无法预知下一用户，不预启动模拟器
+        self.if_prewarm = False
+
+        while not self.isInterruptionRequested:
+
+            try:
+                user = user_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            logger.info(f"领取用户: {user[0]}", module=f"MAA调度器-{self.name}")
+            self.proxy_user(user, curdate, current_date)
+
+        # 关闭可能未正常退出的MAA进程
+        if self.isInterruptionRequested:
+            self.maa_process_manager.kill(if_force=True)
+            System.kill_process(self.maa_exe_path)
+
+        # 各实例独立使用模拟器，领取结束后关闭本实例仍在运行的模拟器
+        if self.emulator_process_manager.is_running():
+            logger.info(
+                f"关闭本实例的模拟器：{list(self.emulator_process_manager.tracked_pids)}",
+                module=f"MAA调度器-{self.name}",
+            )
+            self.emulator_process_manager.kill()
+
+        self.wait_post_tasks()
+
+        self.maa_set_path.write_bytes(backup)
+
+        self.agree_bilibili(False)
+        self.log_monitor.deleteLater()
+        self.log_monitor_timer.deleteLater()
+
+    def submit_post(self, func, *args) -> None:
+        """
+        提交后台后处理任务，任务按提交顺序执行
+
+        :param func: 后处理方法
+        :param args: 后处理方法的参数
+        """
+
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                logger.exception(
+                    f"后台处理任务出现异常：{e}", module=f"MAA调度器-{self.name}"
+                )
+
+        self.post_executor.submit(run)
+
+    def wait_post_tasks(self) -> None:
+        """等待所有已提交的后台后处理任务完成，并关闭后台线程"""
+
+        self.post_executor.shutdown(wait=True)
+
+    def save_user_log(
+        self,
+        user: List[str],
+        user_data: dict,
+        log_path: Path,
+        logs: list,
+        maa_result: str,
+        statistics: MaaLogStatistics,
+    ) -> None:
+        """
+        保存用户单次运行的日志与统计信息，公招出六星时推送喜报
+
+        :param user: 用户列表中的用户条目
+        :param user_data: 用户配置数据
+        :param log_path: 日志文件保存路径
+        :param logs: 日志内容列表
+        :param maa_result: MAA运行结果
+        :param statistics: MAA日志统计数据
+        """
+
+        if Config.save_maa_log(log_path, logs, maa_result, statistics):
+            self.push_notification(
+                "公招六星",
+                f"喜报：用户 {user[0]} 公招出六星啦！",
+                {
+                    "user_name": user_data["Info"]["Name"],
+                },
+                user_data,
+            )
+            self.play_sound.emit("六星喜报")
+
+    def push_user_statistics(
+        self,
+        user: List[str],
+        user_data: dict,
+        user_logs_list: List[Path],
+        start_time: datetime,
+        end_time: datetime,
+        if_success: bool,
+        current_date: str,
+    ) -> None:
+        """
+        汇总并推送用户的自动代理统计信息
+
+        :param user: 用户列表中的用户条目
+        :param user_data: 用户配置数据
+        :param user_logs_list: 用户本次代理的统计文件列表
+        :param start_time: 代理开始时间
+        :param end_time: 代理结束时间
+        :param if_success: 代理任务是否全部完成
+        :param current_date: 当前日期，用于通知标题
+        """
+
+        statistics = Config.merge_statistic_info(user_logs_list)
+        statistics["user_index"] = user[2]
+        statistics["user_info"] = user[0]
+        statistics["start_time"] = start_time.strftime("%Y-%m-%d %H:%M:%S")
+        statistics["end_time"] = end_time.strftime("%Y-%m-%d %H:%M:%S")
+        statistics["maa_result"] = (
+            "代理任务全部完成" if if_success else "代理任务未全部完成"
+        )
+        self.push_notification(
+            "统计信息",
+            f"{current_date} | 用户 {user[0]} 的自动代理统计报告",
+            statistics,
+            user_data,
+        )
+
+    def get_user_emulator(self, index: str) -> Optional[Tuple[Path, List[str], str]]:
+        """
+        获取用户自动代理时使用的模拟器
+
+        :param index: 用户索引
+        :return: 模拟器路径、启动参数与ADB地址，不由本程序启动模拟器时返回 None
+        """
+
+        if self.data[index]["Config"]["Info"]["Mode"] == "详细":
+            base_path = self.data[index]["Path"] / "Routine/gui.json"
+        else:
+            base_path = self.config_path / "Default/gui.json"
+
+        if not base_path.exists():
+            return None
+
+        data = self.maa_gui_composer.load(base_path)
+        set = data["Configurations"][data["Current"]]
+
+        if set["Start.OpenEmulatorAfterLaunch"] != "True":
+            return None
+
+        emulator_path = Path(set["Start.EmulatorPath"])
+        emulator_arguments = set["Start.EmulatorAddCommand"].split()
+        if emulator_path.suffix == ".lnk" and emulator_path.exists():
+            shell = win32com.client.Dispatch("WScript.Shell")
+            shortcut = shell.CreateShortcut(str(emulator_path))
+            emulator_path = Path(shortcut.TargetPath)
+            emulator_arguments = shortcut.Arguments.split()
+
+        if not emulator_path.exists():
+            return None
+
+        return emulator_path, emulator_arguments, set["Connect.Address"]
+
+    def start_prewarm(self, user: List[str]) -> None:
+        """
+        下一用户使用不同的模拟器实例时，提前启动该模拟器
+
+        :param user: 当前用户条目
+        """
+
+        if not self.if_prewarm or self.prewarm_emulator is not None:
+            return None
+
+        user_index = self.user_list.index(user)
+        next_user = next(
+            (_ for _ in self.user_list[user_index + 1 :] if _[1] == "等待"), None
+        )
+        if next_user is None:
+            return None
+
+        try:
+            emulator = self.get_user_emulator(next_user[2])
+        except Exception as e:
+            logger.warning(
+                f"获取下一用户模拟器信息失败，跳过预启动：{e}",
+                module=f"MAA调度器-{self.name}",
+            )
+            return None
+
+        if emulator is None:
+            return None
+
+        emulator_path, emulator_arguments, ADB_address = emulator
+        if (emulator_path, emulator_arguments) == (
+            self.emulator_path,
+            self.emulator_arguments,
+        ):
+            return None
+
+        # 下一用户的ADB地址正被当前模拟器占用时，启动探测可能连接到当前模拟器，不预启动
+        if ADB_address == self.ADB_address:
+            logger.info(
+                f"下一用户的模拟器与当前模拟器使用相同的ADB地址，跳过预启动：{ADB_address}",
+                module=f"MAA调度器-{self.name}",
+            )
+            return None
+
+        logger.info(
+            f"预启动下一用户的模拟器：{emulator_path}，参数：{emulator_arguments}",
+            module=f"MAA调度器-{self.name}",
+        )
+        try:
+            self.prewarm_process_manager.open_process(
+                emulator_path, emulator_arguments, 0
+            )
+        except Exception as e:
+            logger.warning(f"预启动模拟器失败：{e}", module=f"MAA调度器-{self.name}")
+            return None
+
+        self.prewarm_emulator = (emulator_path, emulator_arguments)
+        self.prewarm_start_time = datetime.now()
+
+    def stop_prewarm(self) -> None:
+        """关闭未被使用的预启动模拟器"""
+
+        if self.prewarm_emulator is not None:
+            logger.info(
+                f"关闭未使用的预启动模拟器：{self.prewarm_emulator[0]}",
+                module=f"MAA调度器-{self.name}",
+            )
+            self.prewarm_process_manager.kill()
+            self.prewarm_emulator = None
+
+    def proxy_user(self, user: List[str], curdate: str, current_date: str) -> None:
+        """
+        自动代理单个用户
+
+        :param user: 用户列表中的用户条目
+        :param curdate: 当前服务器日期
+        :param current_date: 当前日期，用于通知标题
+        """
+
+        user_data = self.data[user[2]]["Config"]
+
+        if (
+            self.set["RunSet"]["ProxyTimesLimit"] == 0
+            or user_data["Data"]["ProxyTimes"] < self.set["RunSet"]["ProxyTimesLimit"]
+        ):
+            user[1] = "运行"
+            self.update_user_list.emit(self.user_list)
+        else:
+            user[1] = "跳过"
+            self.update_user_list.emit(self.user_list)
+            return None
+
+        logger.info(f"开始代理用户: {user[0]}", module=f"MAA调度器-{self.name}")
+
+        # 简洁模式用户默认开启日常选项
+        if user_data["Info"]["Mode"] == "简洁":
+            user_data["Info"]["Routine"] = True
+        # 详细模式用户首次代理需打开模拟器
+        elif user_data["Info"]["Mode"] == "详细":
+            self.if_open_emulator = True
+
+        # 初始化代理情况记录和模式替换表
+        run_book = {
+            "Annihilation": bool(user_data["Info"]["Annihilation"] == "Close"),
+            "Routine": not user_data["Info"]["Routine"],
+        }
+        mode_book = {
+            "Annihilation": "自动代理_剿灭",
+            "Routine": "自动代理_日常",
+        }
+
+        user_logs_list = []
+        user_start_time = datetime.now()
+
+        if user_data["Info"]["IfSkland"] and user_data["Info"]["SklandToken"]:
+
+            if user_data["Data"]["LastSklandDate"] != datetime.now().strftime(
+                "%Y-%m-%d"
+            ):
+
+                self.update_log_text.emit("正在执行森空岛签到中\n请稍候~")
+
+                skland_result = skland_sign_in(
+                    Crypto.win_decryptor(user_data["Info"]["SklandToken"])
+                )
+
+                for type, user_list in skland_result.items():
+
+                    if type != "总计" and len(user_list) > 0:
+
+                        logger.info(
+                            f"用户: {user[0]} - 森空岛签到{type}: {'、'.join(user_list)}",
+                            module=f"MAA调度器-{self.name}",
+                        )
+                        self.push_info_bar.emit(
+                            "info",
+                            f"森空岛签到{type}",
+                            "、".join(user_list),
+                            -1 if type == "失败" else 5000,
+                        )
+
+                if skland_result["总计"] == 0:
+                    self.push_info_bar.emit("info", "森空岛签到失败", user[0], -1)
+
+                if skland_result["总计"] > 0 and len(skland_result["失败"]) == 0:
+                    user_data["Data"]["LastSklandDate"] = datetime.now().strftime(
+                        "%Y-%m-%d"
+                    )
+                    logger.success(
+                        f"用户: {user[0]} - 森空岛签到成功",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.play_sound.emit("森空岛签到成功")
+                else:
+                    logger.warning(
+                        f"用户: {user[0]} - 森空岛签到失败",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.play_sound.emit("森空岛签到失败")
+
+        elif user_data["Info"]["IfSkland"]:
+            logger.warning(
+                f"用户: {user[0]} - 未配置森空岛签到Token，跳过森空岛签到",
+                module=f"MAA调度器-{self.name}",
+            )
+            self.push_info_bar.emit(
+                "warning", "森空岛签到失败", "未配置鹰角网络通行证登录凭证", -1
+            )
+
+        # 剿灭-日常模式循环
+        for mode in ["Annihilation", "Routine"]:
+
+            if self.isInterruptionRequested:
+                break
+
+            if run_book[mode]:
+                continue
+
+            # 剿灭模式；满足条件跳过剿灭
+            if (
+                mode == "Annihilation"
+                and self.set["RunSet"]["AnnihilationWeeklyLimit"]
+                and datetime.strptime(
+                    user_data["Data"]["LastAnnihilationDate"], "%Y-%m-%d"
+                ).isocalendar()[:2]
+                == datetime.strptime(curdate, "%Y-%m-%d").isocalendar()[:2]
+            ):
+                logger.info(
+                    f"用户: {user_data['Info']['Name']} - 本周剿灭模式已达上限，跳过执行剿灭任务",
+                    module=f"MAA调度器-{self.name}",
+                )
+                run_book[mode] = True
+                continue
+            else:
+                self.weekly_annihilation_limit_reached = False
+
+            if (
+                user_data["Info"]["Mode"] == "详细"
+                and not (self.data[user[2]]["Path"] / "Routine/gui.json").exists()
+            ):
+                logger.error(
+                    f"用户: {user[0]} - 未找到日常详细配置文件",
+                    module=f"MAA调度器-{self.name}",
+                )
+                self.push_info_bar.emit(
+                    "error",
+                    "启动MAA代理进程失败",
+                    f"未找到{user[0]}的详细配置文件！",
+                    -1,
+                )
+                run_book[mode] = False
+                break
+
+            # 更新当前模式到界面
+            self.update_user_list.emit(
+                [
+                    (
+                        [f"{_[0]} - {mode_book[mode][5:7]}", _[1], _[2]]
+                        if _[2] == user[2]
+                        else _
+                    )
+                    for _ in self.user_list
+                ]
+            )
+
+            # 解析任务构成
+            if mode == "Routine":
+
+                self.task_dict = {
+                    "WakeUp": str(user_data["Task"]["IfWakeUp"]),
+                    "Recruiting": str(user_data["Task"]["IfRecruiting"]),
+                    "Base": str(user_data["Task"]["IfBase"]),
+                    "Combat": str(user_data["Task"]["IfCombat"]),
+                    "Mission": str(user_data["Task"]["IfMission"]),
+                    "Mall": str(user_data["Task"]["IfMall"]),
+                    "AutoRoguelike": str(user_data["Task"]["IfAutoRoguelike"]),
+                    "Reclamation": str(user_data["Task"]["IfReclamation"]),
+                }
+
+            elif mode == "Annihilation":
+
+                self.task_dict = {
+                    "WakeUp": "True",
+                    "Recruiting": "False",
+                    "Base": "False",
+                    "Combat": "True",
+                    "Mission": "False",
+                    "Mall": "False",
+                    "AutoRoguelike": "False",
+                    "Reclamation": "False",
+                }
+
+            logger.info(
+                f"用户: {user[0]} - 模式: {mode_book[mode]} - 任务列表: {self.task_dict.values()}",
+                module=f"MAA调度器-{self.name}",
+            )
+
+            # 尝试次数循环
+            for i in range(self.set["RunSet"]["RunTimesLimit"]):
+
+                if self.isInterruptionRequested:
+                    break
+
+                if run_book[mode]:
+                    break
+
+                logger.info(
+                    f"用户: {user[0]} - 模式: {mode_book[mode]} - 尝试次数: {i + 1}/{self.set["RunSet"]["RunTimesLimit"]}",
+                    module=f"MAA调度器-{self.name}",
+                )
+
+                # 配置MAA
+                set = self.set_maa(mode_book[mode], user[2])
+                # 记录当前时间
+                self.log_start_time = datetime.now()
+                self.reset_maa_log()
+
+                # 记录模拟器与ADB路径
+                self.emulator_path = Path(
+                    set["Configurations"]["Default"]["Start.EmulatorPath"]
+                )
+                self.emulator_arguments = set["Configurations"]["Default"][
+                    "Start.EmulatorAddCommand"
+                ].split()
+                # 如果是快捷方式，进行解析
+                if self.emulator_path.suffix == ".lnk" and self.emulator_path.exists():
+                    try:
+                        shell = win32com.client.Dispatch("WScript.Shell")
+                        shortcut = shell.CreateShortcut(str(self.emulator_path))
+                        self.emulator_path = Path(shortcut.TargetPath)
+                        self.emulator_arguments = shortcut.Arguments.split()
+                    except Exception as e:
+                        logger.exception(
+                            f"解析快捷方式时出现异常：{e}",
+                            module=f"MAA调度器-{self.name}",
+                        )
+                        self.push_info_bar.emit(
+                            "error",
+                            "解析快捷方式时出现异常",
+                            "请检查快捷方式",
+                            -1,
+                        )
+                        self.if_open_emulator = True
+                        break
+                elif not self.emulator_path.exists():
+                    logger.error(
+                        f"模拟器快捷方式不存在：{self.emulator_path}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.push_info_bar.emit(
+                        "error",
+                        "启动模拟器时出现异常",
+                        "模拟器快捷方式不存在",
+                        -1,
+                    )
+                    self.if_open_emulator = True
+                    break
+
+                self.wait_time = int(
+                    set["Configurations"]["Default"]["Start.EmulatorWaitSeconds"]
+                )
+
+                self.ADB_path = Path(
+                    set["Configurations"]["Default"]["Connect.AdbPath"]
+                )
+                self.ADB_path = (
+                    self.ADB_path
+                    if self.ADB_path.is_absolute()
+                    else self.maa_root_path / self.ADB_path
+                )
+                self.ADB_address = set["Configurations"]["Default"]["Connect.Address"]
+                self.if_kill_emulator = bool(
+                    set["Configurations"]["Default"]["MainFunction.PostActions"] == "12"
+                )
+                self.if_open_emulator_process = bool(
+                    set["Configurations"]["Default"]["Start.OpenEmulatorAfterLaunch"]
+                    == "True"
+                )
+
+                # 任务开始前释放ADB
+                try:
+                    logger.info(
+                        f"释放ADB：{self.ADB_address}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    subprocess.run(
+                        [self.ADB_path, "disconnect", self.ADB_address],
+                        creationflags=subprocess.CREATE_NO_WINDOW,
+                    )
+                except subprocess.CalledProcessError as e:
+                    # 忽略错误,因为可能本来就没有连接
+                    logger.warning(
+                        f"释放ADB时出现异常：{e}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                except Exception as e:
+                    logger.exception(
+                        f"释放ADB时出现异常：{e}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.push_info_bar.emit(
+                        "error",
+                        "释放ADB时出现异常",
+                        "请检查MAA中ADB路径设置",
+                        -1,
+                    )
+
+                self.emulator_start_time = None
+                if self.if_open_emulator_process and self.prewarm_emulator == (
+                    self.emulator_path,
+                    self.emulator_arguments,
+                ):
+                    # 关闭上一用户仍在运行的模拟器，避免其被探测为当前用户的模拟器，并在复用其进程管理器前结束跟踪
+                    if self.emulator_process_manager.is_running():
+                        logger.info(
+                            f"关闭上一用户的模拟器：{list(self.emulator_process_manager.tracked_pids)}",
+                            module=f"MAA调度器-{self.name}",
+                        )
+                        self.emulator_process_manager.kill()
+
+                    # 接管预启动的模拟器
+                    logger.info(
+                        f"使用预启动的模拟器：{self.emulator_path}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    (
+                        self.emulator_process_manager,
+                        self.prewarm_process_manager,
+                    ) = (self.prewarm_process_manager, self.emulator_process_manager)
+                    self.emulator_start_time = self.prewarm_start_time
+                    self.prewarm_emulator = None
+                elif self.if_open_emulator_process:
+                    try:
+                        logger.info(
+                            f"启动模拟器：{self.emulator_path}，参数：{self.emulator_arguments}",
+                            module=f"MAA调度器-{self.name}",
+                        )
+                        self.emulator_process_manager.open_process(
+                            self.emulator_path, self.emulator_arguments, 0
+                        )
+                        self.emulator_start_time = datetime.now()
+                    except Exception as e:
+                        logger.exception(
+                            f"启动模拟器时出现异常：{e}",
+                            module=f"MAA调度器-{self.name}",
+                        )
+                        self.push_info_bar.emit(
+                            "error",
+                            "启动模拟器时出现异常",
+                            "请检查MAA中模拟器路径设置",
+                            -1,
+                        )
+                        self.if_open_emulator = True
+                        break
+
+                # 更新静默进程标记有效时间
+                logger.info(
+                    f"更新静默进程标记：{self.emulator_path}，标记有效时间：{datetime.now() + timedelta(seconds=self.wait_time + 10)}",
+                    module=f"MAA调度器-{self.name}",
+                )
+                Config.silence_dict[self.emulator_path] = datetime.now() + timedelta(
+                    seconds=self.wait_time + 10
+                )
+
+                self.search_ADB_address()
+
+                # 创建MAA任务
+                logger.info(
+                    f"启动MAA进程：{self.maa_exe_path}",
+                    module=f"MAA调度器-{self.name}",
+                )
+                self.maa_process_manager.open_process(self.maa_exe_path, [], 0)
+
+                # 当前用户运行期间预启动下一用户的模拟器
+                self.start_prewarm(user)
+
+                # 监测MAA运行状态
+                self.log_check_mode = mode_book[mode]
+                self.start_monitor()
+
+                # 处理MAA结果
+                if self.maa_result == "Success!":
+
+                    # 标记任务完成
+                    run_book[mode] = True
+
+                    logger.info(
+                        f"用户: {user[0]} - MAA进程完成代理任务",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.update_log_text.emit(
+                        "检测到MAA进程完成代理任务\n正在等待相关程序结束\n请等待10s"
+                    )
+
+                else:
+                    logger.error(
+                        f"用户: {user[0]} - 代理任务异常: {self.maa_result}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    # 打印中止信息
+                    # 此时，log变量内存储的就是出现异常的日志信息，可以保存或发送用于问题排查
+                    self.update_log_text.emit(
+                        f"{self.maa_result}\n正在中止相关程序\n请等待10s"
+                    )
+                    # 无命令行中止MAA与其子程序
+                    logger.info(
+                        f"中止MAA进程：{self.maa_exe_path}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.maa_process_manager.kill(if_force=True)
+                    System.kill_process(self.maa_exe_path)
+
+                    # 中止模拟器进程
+                    logger.info(
+                        f"中止模拟器进程：{list(self.emulator_process_manager.tracked_pids)}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.emulator_process_manager.kill()
+
+                    self.if_open_emulator = True
+
+                    # 推送异常通知
+                    Notify.push_plyer(
+                        "用户自动代理出现异常！",
+                        f"用户 {user[0].replace("_", " 今天的")}的{mode_book[mode][5:7]}部分出现一次异常",
+                        f"{user[0].replace("_", " ")}的{mode_book[mode][5:7]}出现异常",
+                        1,
+                    )
+                    if i == self.set["RunSet"]["RunTimesLimit"] - 1:
+                        self.play_sound.emit("子任务失败")
+                    else:
+                        self.play_sound.emit(self.maa_result)
+
+                self.wait_process_exit(10)
+
+                # 任务结束后释放ADB
+                try:
+                    logger.info(
+                        f"释放ADB：{self.ADB_address}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    subprocess.run(
+                        [self.ADB_path, "disconnect", self.ADB_address],
+                        creationflags=subprocess.CREATE_NO_WINDOW,
+                    )
+                except subprocess.CalledProcessError as e:
+                    # 忽略错误,因为可能本来就没有连接
+                    logger.warning(
+                        f"释放ADB时出现异常：{e}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                except Exception as e:
+                    logger.exception(
+                        f"释放ADB时出现异常：{e}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.push_info_bar.emit(
+                        "error",
+                        "释放ADB时出现异常",
+                        "请检查MAA中ADB路径设置",
+                        -1,
+                    )
+                # 任务结束后再次手动中止模拟器进程，防止退出不彻底
+                if self.if_kill_emulator:
+                    logger.info(
+                        f"任务结束后再次中止模拟器进程：{list(self.emulator_process_manager.tracked_pids)}",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    self.emulator_process_manager.kill()
+                    self.if_open_emulator = True
+
+                # 从配置文件中解析所需信息
+                data = self.maa_gui_composer.load(self.maa_set_path)
+
+                # 记录自定义基建索引
+                user_data["Data"]["CustomInfrastPlanIndex"] = data["Configurations"][
+                    "Default"
+                ]["Infrast.CustomInfrastPlanIndex"]
+
+                # 记录更新包路径
+                if (
+                    data["Global"]["VersionUpdate.package"]
+                    and (
+                        self.maa_root_path / data["Global"]["VersionUpdate.package"]
+                    ).exists()
+                ):
+                    self.maa_update_package = data["Global"]["VersionUpdate.package"]
+
+                # 记录剿灭情况
+                if mode == "Annihilation" and self.weekly_annihilation_limit_reached:
+                    user_data["Data"]["LastAnnihilationDate"] = curdate
+                # 后台保存运行日志以及统计信息
+                log_path = (
+                    Config.app_path
+                    / f"history/{curdate}/{user_data["Info"]["Name"]}/{self.log_start_time.strftime("%H-%M-%S")}.log"
                 )
-
-            elif "用户" in self.mode:
-                self.user_config_path.mkdir(parents=True, exist_ok=True)
-                shutil.copy(self.maa_set_path, self.user_config_path)
-                logger.success(
-                    f"用户MAA配置文件已保存到 {self.user_config_path}",
-                    module=f"MAA调度器-{self.name}",
+                self.submit_post(
+                    self.save_user_log,
+                    user,
+                    user_data,
+                    log_path,
+                    self.maa_logs,
+                    self.maa_result,
+                    self.maa_log_statistics,
                 )
+                user_logs_list.append(log_path.with_suffix(".json"))
 
-            result_text = ""
+                # 执行MAA解压更新动作
+                if self.maa_update_package:
 
-        # 导出结果
-        if self.mode in ["自动代理", "人工排查"]:
+                    logger.info(
+                        f"检测到MAA更新，正在执行更新动作",
+                        module=f"MAA调度器-{self.name}",
+                    )
 
-            # 关闭可能未正常退出的MAA进程
-            if self.isInterruptionRequested:
-                logger.info(
-                    f"关闭可能未正常退出的MAA进程：{self.maa_exe_path}",
-                    module=f"MAA调度器-{self.name}",
-                )
-                self.maa_process_manager.kill(if_force=True)
-                System.kill_process(self.maa_exe_path)
+                    self.update_log_text.emit(
+                        f"检测到MAA存在更新\nMAA正在执行更新动作\n请等待10s"
+                    )
+                    self.play_sound.emit("MAA更新")
+                    self.set_maa("更新MAA", None)
+                    subprocess.Popen(
+                        [self.maa_exe_path],
+                        creationflags=subprocess.CREATE_NO_WINDOW,
+                    )
+                    self.sleep(10)
+                    System.kill_process(self.maa_exe_path)
 
-            # 更新用户数据
-            updated_info = {_[2]: self.data[_[2]] for _ in self.user_list}
-            self.update_user_info.emit(self.config_path.name, updated_info)
+                    self.maa_update_package = ""
 
-            error_index = [_[2] for _ in self.user_list if _[1] == "异常"]
-            over_index = [_[2] for _ in self.user_list if _[1] == "完成"]
-            wait_index = [_[2] for _ in self.user_list if _[1] == "等待"]
+                    logger.info(f"更新动作结束", module=f"MAA调度器-{self.name}")
 
-            # 保存运行日志
-            title = (
-                f"{current_date} | {self.set["MaaSet"]["Name"]}的{self.mode[:4]}任务报告"
-                if self.set["MaaSet"]["Name"] != ""
-                else f"{current_date} | {self.mode[:4]}任务报告"
-            )
-            result = {
-                "title": f"{self.mode[:4]}任务报告",
-                "script_name": (
-                    self.set["MaaSet"]["Name"]
-                    if self.set["MaaSet"]["Name"] != ""
-                    else "空白"
-                ),
-                "start_time": begin_time,
-                "end_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "completed_count": len(over_index),
-                "uncompleted_count": len(error_index) + len(wait_index),
-                "failed_user": [
-                    self.data[_]["Config"]["Info"]["Name"] for _ in error_index
-                ],
-                "waiting_user": [
-                    self.data[_]["Config"]["Info"]["Name"] for _ in wait_index
-                ],
-            }
+        # 后台发送统计信息
+        self.submit_post(
+            self.push_user_statistics,
+            user,
+            user_data,
+            user_logs_list,
+            user_start_time,
+            datetime.now(),
+            bool(run_book["Annihilation"] and run_book["Routine"]),
+            current_date,
+        )
 
-            # 生成结果文本
-            result_text = (
-                f"任务开始时间：{result["start_time"]}，结束时间：{result["end_time"]}\n"
-                f"已完成数：{result["completed_count"]}，未完成数：{result["uncompleted_count"]}\n\n"
+        if run_book["Annihilation"] and run_book["Routine"]:
+            # 成功完成代理的用户修改相关参数
+            if (
+                user_data["Data"]["ProxyTimes"] == 0
+                and user_data["Info"]["RemainedDay"] != -1
+            ):
+                user_data["Info"]["RemainedDay"] -= 1
+            user_data["Data"]["ProxyTimes"] += 1
+            user[1] = "完成"
+            logger.success(
+                f"用户 {user[0]} 的自动代理任务已完成",
+                module=f"MAA调度器-{self.name}",
             )
-            if len(result["failed_user"]) > 0:
-                result_text += f"{self.mode[2:4]}未成功的用户：\n{"\n".join(result["failed_user"])}\n"
-            if len(result["waiting_user"]) > 0:
-                result_text += f"\n未开始{self.mode[2:4]}的用户：\n{"\n".join(result["waiting_user"])}\n"
-
-            # 推送代理结果通知
             Notify.push_plyer(
-                title.replace("报告", "已完成！"),
-                f"已完成用户数：{len(over_index)}，未完成用户数：{len(error_index) + len(wait_index)}",
-                f"已完成用户数：{len(over_index)}，未完成用户数：{len(error_index) + len(wait_index)}",
-                10,
+                "成功完成一个自动代理任务！",
+                f"已完成用户 {user[0].replace("_", " 今天的")}任务",
+                f"已完成 {user[0].replace("_", " 的")}",
+                3,
             )
-            self.push_notification("代理结果", title, result)
-
-        # 复原 MAA 配置文件
-        logger.info(
-            f"复原 MAA 配置文件：{self.config_path / 'Temp/gui.json'}",
-            module=f"MAA调度器-{self.name}",
-        )
-        if (self.config_path / "Temp/gui.json").exists():
-            shutil.copy(self.config_path / "Temp/gui.json", self.maa_set_path)
-        shutil.rmtree(self.config_path / "Temp")
+        else:
+            # 录入代理失败的用户
+            logger.error(
+                f"用户 {user[0]} 的自动代理任务未完成",
+                module=f"MAA调度器-{self.name}",
+            )
+            user[1] = "异常"
 
-        self.agree_bilibili(False)
-        self.log_monitor.deleteLater()
-        self.log_monitor_timer.deleteLater()
-        self.accomplish.emit({"Time": begin_time, "History": result_text})
+        self.update_user_list.emit(self.user_list)
 
     def requestInterruption(self) -> None:
         """请求中止任务"""
@@ -1028,6 +1665,9 @@ class MaaManager(QObject):
         self.isInterruptionRequested = True
         self.wait_loop.quit()
 
+        for worker in self.worker_list:
+            worker.requestInterruption()
+
     def push_question(self, title: str, message: str) -> bool:
         """推送询问窗口"""
 
@@ -1051,34 +1691,197 @@ class MaaManager(QObject):
         QTimer.singleShot(time * 1000, self.wait_loop.quit)
         self.wait_loop.exec()
 
-    def search_ADB_address(self) -> None:
-        """搜索ADB实际地址"""
+    def wait_emulator_ready(
+        self, ADB_ip: str, ADB_host: str, port_list: List[int], probe_offset: int
+    ) -> None:
+        """
+        主动探测模拟器是否完成启动，完成启动后立即返回，并记录模拟器启动耗时
+
+        :param ADB_ip: ADB地址前缀
+        :param ADB_host: ADB主机地址
+        :param port_list: 探测端口列表，仅包含配置的端口与该模拟器上次成功连接的端口
+        :param probe_offset: 可达性探测端口相对于候选端口的偏移
+        """
+
+        # 等待时限随历史启动耗时自适应增长，不低于MAA中设置的等待时间
+        boot_time = Config.emulator_boot_dict.get(self.emulator_path)
+        timeout = self.wait_time
+        if boot_time is not None:
+            timeout = max(timeout, int(boot_time * 1.5))
+
+        start_time = self.emulator_start_time or datetime.now()
+        deadline = start_time + timedelta(seconds=timeout)
 
         self.update_log_text.emit(
-            f"即将搜索ADB实际地址\n正在等待模拟器完成启动\n请等待{self.wait_time}s"
+            f"即将搜索ADB实际地址\n正在等待模拟器完成启动\n最长等待{timeout}s"
+        )
+        logger.info(
+            f"开始探测模拟器启动状态，最长等待：{timeout}s",
+            module=f"MAA调度器-{self.name}",
         )
 
-        self.sleep(self.wait_time)
+        interval = 1
+        while not self.isInterruptionRequested:
 
-        if self.isInterruptionRequested:
-            return None
+            with ThreadPoolExecutor(max_workers=len(port_list)) as executor:
+                reachable_list = list(
+                    executor.map(
+                        partial(self.check_port, ADB_host),
+                        [port + probe_offset for port in port_list],
+                    )
+                )
+
+            for port, reachable in zip(port_list, reachable_list):
+                if reachable and self.check_boot_completed(f"{ADB_ip}{port}"):
+
+                    duration = (datetime.now() - start_time).total_seconds()
+                    logger.info(
+                        f"模拟器已完成启动，耗时：{duration:.1f}s",
+                        module=f"MAA调度器-{self.name}",
+                    )
+                    if self.emulator_start_time is not None:
+                        Config.emulator_boot_dict[self.emulator_path] = duration
+                    return None
+
+            if datetime.now() >= deadline:
+                logger.warning(
+                    f"等待模拟器完成启动超时：{timeout}s",
+                    module=f"MAA调度器-{self.name}",
+                )
+                return None
+
+            self.sleep(interval)
+            interval = min(interval + 1, 3)
+
+    def check_boot_completed(self, ADB_address: str) -> bool:
+        """
+        通过ADB检查模拟器系统是否完成启动
+
+        :param ADB_address: ADB地址
+        :return: 是否完成启动
+        """
+
+        # 网络地址需先连接，检查完成后断开，避免残留连接
+        if_connect = ":" in ADB_address
+
+        try:
+            if if_connect:
+                subprocess.run(
+                    [self.ADB_path, "connect", ADB_address],
+                    creationflags=subprocess.CREATE_NO_WINDOW,
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    timeout=5,
+                )
+            result = subprocess.run(
+                [
+                    self.ADB_path,
+                    "-s",
+                    ADB_address,
+                    "shell",
+                    "getprop",
+                    "sys.boot_completed",
+                ],
+                creationflags=subprocess.CREATE_NO_WINDOW,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                timeout=5,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+
+        finally:
+            if if_connect:
+                try:
+                    subprocess.run(
+                        [self.ADB_path, "disconnect", ADB_address],
+                        creationflags=subprocess.CREATE_NO_WINDOW,
+                        stdin=subprocess.DEVNULL,
+                        capture_output=True,
+                        timeout=5,
+                    )
+                except (subprocess.TimeoutExpired, OSError):
+                    pass
+
+        return result.stdout.strip() == "1"
+
+    def wait_process_exit(self, timeout: int) -> None:
+        """
+        等待MAA进程退出，退出后立即返回
+
+        :param timeout: 最长等待时间（秒）
+        """
+
+        deadline = datetime.now() + timedelta(seconds=timeout)
+
+        while (
+            not self.isInterruptionRequested
+            and datetime.now() < deadline
+            and self.maa_process_manager.is_running()
+        ):
+            self.sleep(1)
+
+    def search_ADB_address(self) -> None:
+        """搜索ADB实际地址"""
 
         if "-" in self.ADB_address:
             ADB_ip = f"{self.ADB_address.split("-")[0]}-"
             ADB_port = int(self.ADB_address.split("-")[1])
+            ADB_host = "127.0.0.1"
+            # emulator-N 中的 N 为模拟器控制台端口，ADB 服务端口为 N+1
+            probe_offset = 1
 
         elif ":" in self.ADB_address:
             ADB_ip = f"{self.ADB_address.split(':')[0]}:"
             ADB_port = int(self.ADB_address.split(":")[1])
+            ADB_host = self.ADB_address.split(":")[0]
+            probe_offset = 0
+
+        # 候选端口按与初始端口的距离排序，上次成功的端口优先尝试
+        port_list = [ADB_port + port for port in self.port_range]
+        adb_key = f"{self.emulator_path}|{self.ADB_address}"
+        last_port = Config.adb_port_dict.get(adb_key)
+        if last_port in port_list:
+            port_list.remove(last_port)
+            port_list.insert(0, last_port)
+
+        # 启动探测仅针对配置的端口与该模拟器上次成功连接的端口，避免将相邻的其他模拟器误判为已启动
+        probe_list = [ADB_port]
+        if last_port in port_list and last_port != ADB_port:
+            probe_list.append(last_port)
+
+        self.wait_emulator_ready(ADB_ip, ADB_host, probe_list, probe_offset)
+
+        if self.isInterruptionRequested:
+            return None
 
         logger.info(
             f"正在搜索ADB实际地址，ADB前缀：{ADB_ip}，初始端口：{ADB_port}，搜索范围：{self.port_range}",
             module=f"MAA调度器-{self.name}",
         )
 
-        for port in self.port_range:
+        # 并行探测端口可达性，仅对可达端口执行ADB连接
+        with ThreadPoolExecutor(max_workers=len(port_list)) as executor:
+            reachable_list = list(
+                executor.map(
+                    partial(self.check_port, ADB_host),
+                    [port + probe_offset for port in port_list],
+                )
+            )
+        candidate_list = [
+            port for port, reachable in zip(port_list, reachable_list) if reachable
+        ]
+
+        logger.info(f"可达端口：{candidate_list}", module=f"MAA调度器-{self.name}")
+
+        for port in candidate_list:
+
+            if self.isInterruptionRequested:
+                return None
 
-            ADB_address = f"{ADB_ip}{ADB_port + port}"
+            ADB_address = f"{ADB_ip}{port}"
 
             # 尝试通过ADB连接到指定地址
             connect_result = subprocess.run(
@@ -1116,6 +1919,7 @@ class MaaManager(QObject):
                         creationflags=subprocess.CREATE_NO_WINDOW,
                     )
 
+                    Config.adb_port_dict[adb_key] = port
                     self.ADB_address = ADB_address
 
                     # 覆写当前ADB地址
@@ -1125,14 +1929,12 @@ class MaaManager(QObject):
                     )
                     self.maa_process_manager.kill(if_force=True)
                     System.kill_process(self.maa_exe_path)
-                    with self.maa_set_path.open(mode="r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = self.maa_gui_composer.load(self.maa_set_path)
                     data["Configurations"]["Default"][
                         "Connect.Address"
                     ] = self.ADB_address
                     data["Configurations"]["Default"]["Start.EmulatorWaitSeconds"] = "0"
-                    with self.maa_set_path.open(mode="w", encoding="utf-8") as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
+                    self.maa_gui_composer.write(self.maa_set_path, data)
 
                     self.play_sound.emit("ADB成功")
                     return None
@@ -1150,6 +1952,22 @@ class MaaManager(QObject):
         if not self.isInterruptionRequested:
             self.play_sound.emit("ADB失败")
 
+    def check_port(self, host: str, port: int, timeout: float = 0.5) -> bool:
+        """
+        检查端口是否可达
+
+        :param host: 主机地址
+        :param port: 端口号
+        :param timeout: 超时时间
+        :return: 端口是否可达
+        """
+
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
     def refresh_maa_log(self) -> None:
         """刷新MAA日志"""
 
@@ -1174,24 +1992,12 @@ class MaaManager(QObject):
 
         self.last_check_time = datetime.now()
 
-        # 获取日志
+        # 增量获取日志
         if self.maa_log_path.exists():
-            self.maa_logs = []
-            if_log_start = False
-            with self.maa_log_path.open(mode="r", encoding="utf-8") as f:
-                for entry in f:
-                    if not if_log_start:
-                        try:
-                            entry_time = datetime.strptime(
-                                entry[1:20], "%Y-%m-%d %H:%M:%S"
-                            )
-                            if entry_time > self.log_start_time:
-                                if_log_start = True
-                                self.maa_logs.append(entry)
-                        except ValueError:
-                            pass
-                    else:
-                        self.maa_logs.append(entry)
+            new_logs = self.maa_log_reader.read()
+            self.maa_logs.extend(new_logs)
+            self.maa_log_analyzer.feed(new_logs)
+            self.maa_log_statistics.feed(new_logs)
         else:
             logger.warning(
                 f"MAA日志文件不存在：{self.maa_log_path}",
@@ -1199,8 +2005,6 @@ class MaaManager(QObject):
             )
             return None
 
-        log = "".join(self.maa_logs)
-
         # 更新MAA日志
         if self.maa_process_manager.is_running():
 
@@ -1210,21 +2014,13 @@ class MaaManager(QObject):
                 else "".join(self.maa_logs[-100:])
             )
 
-        if "自动代理" in self.log_check_mode:
+        analyzer = self.maa_log_analyzer
 
-            # 获取最近一条日志的时间
-            latest_time = self.log_start_time
-            for _ in self.maa_logs[::-1]:
-                try:
-                    if "如果长时间无进一步日志更新，可能需要手动干预。" in _:
-                        continue
-                    latest_time = datetime.strptime(_[1:20], "%Y-%m-%d %H:%M:%S")
-                    break
-                except ValueError:
-                    pass
+        if "自动代理" in self.log_check_mode:
 
             logger.info(
-                f"MAA最近一条日志时间：{latest_time}", module=f"MAA调度器-{self.name}"
+                f"MAA最近一条日志时间：{analyzer.latest_time}",
+                module=f"MAA调度器-{self.name}",
             )
 
             time_book = {
@@ -1232,98 +2028,59 @@ class MaaManager(QObject):
                 "自动代理_日常": "RoutineTimeLimit",
             }
 
-            if self.log_check_mode == "自动代理_剿灭" and "任务出错: 刷理智" in log:
-                self.weekly_annihilation_limit_reached = True
-            else:
-                self.weekly_annihilation_limit_reached = False
+            self.weekly_annihilation_limit_reached = bool(
+                self.log_check_mode == "自动代理_剿灭"
+                and "CombatError" in analyzer.flags
+            )
 
-            if "任务出错: StartUp" in log or "任务出错: 开始唤醒" in log:
-                self.maa_result = "MAA未能正确登录PRTS"
+            self.maa_result = analyzer.get_result("自动代理")
 
-            elif "任务已全部完成！" in log:
+            if self.maa_result == "Success!":
 
-                if "完成任务: StartUp" in log or "完成任务: 开始唤醒" in log:
-                    self.task_dict["WakeUp"] = "False"
-                if "完成任务: Recruit" in log or "完成任务: 自动公招" in log:
-                    self.task_dict["Recruiting"] = "False"
-                if "完成任务: Infrast" in log or "完成任务: 基建换班" in log:
-                    self.task_dict["Base"] = "False"
-                if (
-                    "完成任务: Fight" in log
-                    or "完成任务: 刷理智" in log
-                    or (
-                        self.log_check_mode == "自动代理_剿灭"
-                        and "任务出错: 刷理智" in log
-                    )
-                ):
+                # 统计各项任务完成情况
+                for task in self.task_dict:
+                    if task in analyzer.flags:
+                        self.task_dict[task] = "False"
+                if self.weekly_annihilation_limit_reached:
                     self.task_dict["Combat"] = "False"
-                if "完成任务: Mall" in log or "完成任务: 获取信用及购物" in log:
-                    self.task_dict["Mall"] = "False"
-                if "完成任务: Award" in log or "完成任务: 领取奖励" in log:
-                    self.task_dict["Mission"] = "False"
-                if "完成任务: Roguelike" in log or "完成任务: 自动肉鸽" in log:
-                    self.task_dict["AutoRoguelike"] = "False"
-                if "完成任务: Reclamation" in log or "完成任务: 生息演算" in log:
-                    self.task_dict["Reclamation"] = "False"
-
-                if all(v == "False" for v in self.task_dict.values()):
-                    self.maa_result = "Success!"
-                else:
+
+                if not all(v == "False" for v in self.task_dict.values()):
                     self.maa_result = "MAA部分任务执行失败"
 
-            elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in log:
-                self.maa_result = "MAA的ADB连接异常"
+            elif self.maa_result is None:
 
-            elif "未检测到任何模拟器" in log:
-                self.maa_result = "MAA未检测到任何模拟器"
+                if not self.maa_process_manager.is_running():
+                    self.maa_result = "MAA在完成任务前退出"
+                elif datetime.now() - analyzer.latest_time > timedelta(
+                    minutes=self.set["RunSet"][time_book[self.log_check_mode]]
+                ):
+                    self.maa_result = "MAA进程超时"
+                elif self.isInterruptionRequested:
+                    self.maa_result = "任务被手动中止"
+                else:
+                    self.maa_result = "Wait"
 
-            elif "已停止" in log:
-                self.maa_result = "MAA在完成任务前中止"
+        elif self.log_check_mode == "人工排查":
 
-            elif (
-                "MaaAssistantArknights GUI exited" in log
-                or not self.maa_process_manager.is_running()
-            ):
-                self.maa_result = "MAA在完成任务前退出"
+            self.maa_result = analyzer.get_result("人工排查")
 
-            elif datetime.now() - latest_time > timedelta(
-                minutes=self.set["RunSet"][time_book[self.log_check_mode]]
-            ):
-                self.maa_result = "MAA进程超时"
+            if self.maa_result is None:
 
-            elif self.isInterruptionRequested:
-                self.maa_result = "任务被手动中止"
+                if not self.maa_process_manager.is_running():
+                    self.maa_result = "MAA在完成任务前退出"
+                elif self.isInterruptionRequested:
+                    self.maa_result = "任务被手动中止"
+                else:
+                    self.maa_result = "Wait"
 
-            else:
-                self.maa_result = "Wait"
+        elif self.log_check_mode == "设置MAA":
 
-        elif self.log_check_mode == "人工排查":
-            if "完成任务: StartUp" in log or "完成任务: 开始唤醒" in log:
-                self.maa_result = "Success!"
-            elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in log:
-                self.maa_result = "MAA的ADB连接异常"
-            elif "未检测到任何模拟器" in log:
-                self.maa_result = "MAA未检测到任何模拟器"
-            elif "已停止" in log:
-                self.maa_result = "MAA在完成任务前中止"
-            elif (
-                "MaaAssistantArknights GUI exited" in log
-                or not self.maa_process_manager.is_running()
-            ):
-                self.maa_result = "MAA在完成任务前退出"
-            elif self.isInterruptionRequested:
-                self.maa_result = "任务被手动中止"
-            else:
-                self.maa_result = "Wait"
+            self.maa_result = analyzer.get_result("设置MAA")
 
-        elif self.log_check_mode == "设置MAA":
-            if (
-                "MaaAssistantArknights GUI exited" in log
-                or not self.maa_process_manager.is_running()
-            ):
-                self.maa_result = "Success!"
-            else:
-                self.maa_result = "Wait"
+            if self.maa_result is None:
+                self.maa_result = (
+                    "Wait" if self.maa_process_manager.is_running() else "Success!"
+                )
 
         logger.info(
             f"MAA日志分析结果：{self.maa_result}", module=f"MAA调度器-{self.name}"
@@ -1333,6 +2090,14 @@ class MaaManager(QObject):
 
             self.quit_monitor()
 
+    def reset_maa_log(self) -> None:
+        """以当前日志起始时间重置MAA日志的增量读取、分析与统计状态"""
+
+        self.maa_logs = []
+        self.maa_log_reader.reset(self.log_start_time)
+        self.maa_log_analyzer.reset(self.log_start_time)
+        self.maa_log_statistics = MaaLogStatistics()
+
     def start_monitor(self) -> None:
         """开始监视MAA日志"""
 
@@ -1390,31 +2155,21 @@ class MaaManager(QObject):
         # 预导入MAA配置文件
         if mode == "设置MAA_用户":
             if self.user_config_path.exists():
-                shutil.copy(self.user_config_path / "gui.json", self.maa_set_path)
+                base_path = self.user_config_path / "gui.json"
             else:
-                shutil.copy(
-                    self.config_path / "Default/gui.json",
-                    self.maa_set_path,
-                )
+                base_path = self.config_path / "Default/gui.json"
         elif (mode in ["设置MAA_全局", "更新MAA"]) or (
             ("自动代理" in mode or "人工排查" in mode)
             and user_data["Info"]["Mode"] == "简洁"
         ):
-            shutil.copy(
-                self.config_path / "Default/gui.json",
-                self.maa_set_path,
-            )
+            base_path = self.config_path / "Default/gui.json"
         elif "自动代理" in mode and user_data["Info"]["Mode"] == "详细":
-            shutil.copy(
-                self.data[index]["Path"] / "Routine/gui.json", self.maa_set_path
-            )
+            base_path = self.data[index]["Path"] / "Routine/gui.json"
         elif "人工排查" in mode and user_data["Info"]["Mode"] == "详细":
-            shutil.copy(
-                self.data[index]["Path"] / "Routine/gui.json",
-                self.maa_set_path,
-            )
-        with self.maa_set_path.open(mode="r", encoding="utf-8") as f:
-            data = json.load(f)
+            base_path = self.data[index]["Path"] / "Routine/gui.json"
+        else:
+            base_path = self.maa_set_path
+        data = self.maa_gui_composer.load(base_path)
 
         # 切换配置
         if data["Current"] != "Default":
@@ -1429,21 +2184,21 @@ class MaaManager(QObject):
         # 自动代理配置
         if "自动代理" in mode:
 
-            if (
-                next((i for i, _ in enumerate(self.user_list) if _[2] == index), None)
-                == len(self.user_list) - 1
-            ) or (
-                self.data[
-                    self.user_list[
-                        next(
-                            (i for i, _ in enumerate(self.user_list) if _[2] == index),
-                            None,
-                        )
-                        + 1
-                    ][2]
-                ]["Config"]["Info"]["Mode"]
-                == "详细"
-            ):
+            if self.worker:
+                # 多开实例的下一用户取决于各实例的领取顺序，仅在共享队列已空时可确定为最后一个用户
+                if_exit_emulator = self.user_queue.empty()
+            else:
+                user_index = next(
+                    (i for i, _ in enumerate(self.user_list) if _[2] == index), None
+                )
+                if_exit_emulator = (user_index == len(self.user_list) - 1) or (
+                    self.data[self.user_list[user_index + 1][2]]["Config"]["Info"][
+                        "Mode"
+                    ]
+                    == "详细"
+                )
+
+            if if_exit_emulator:
                 data["Configurations"]["Default"][
                     "MainFunction.PostActions"
                 ] = "12"  # 完成后退出MAA和模拟器
@@ -1863,13 +2618,22 @@ class MaaManager(QObject):
                 "TaskQueue.Reclamation.IsChecked"
             ] = "False"  # 生息演算
 
+        # 多开实例使用各自的模拟器与ADB地址
+        if self.worker and "设置MAA" not in mode:
+            for key, value in {
+                "Start.EmulatorPath": self.worker.get("EmulatorPath"),
+                "Start.EmulatorAddCommand": self.worker.get("EmulatorArgs"),
+                "Connect.Address": self.worker.get("ADBAddress"),
+            }.items():
+                if value:
+                    data["Configurations"]["Default"][key] = value
+
         # 启动模拟器仅生效一次
         if "设置MAA" not in mode and "更新MAA" not in mode and self.if_open_emulator:
             self.if_open_emulator = False
 
         # 覆写配置文件
-        with self.maa_set_path.open(mode="w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        self.maa_gui_composer.write(self.maa_set_path, data)
 
         logger.success(
             f"MAA运行参数配置完成: {mode}/{index}", module=f"MAA调度器-{self.name}"
@@ -1884,28 +2648,10 @@ class MaaManager(QObject):
             module=f"MAA调度器-{self.name}",
         )
 
-        with self.maa_tasks_path.open(mode="r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if if_agree and Config.get(Config.function_IfAgreeBilibili):
-            data["BilibiliAgreement_AUTO"] = {
-                "algorithm": "OcrDetect",
-                "action": "ClickSelf",
-                "text": ["同意"],
-                "maxTimes": 5,
-                "Doc": "关闭B服用户协议",
-                "next": ["StartUpThemes#next"],
-            }
-            if "BilibiliAgreement_AUTO" not in data["StartUpThemes"]["next"]:
-                data["StartUpThemes"]["next"].insert(0, "BilibiliAgreement_AUTO")
-        else:
-            if "BilibiliAgreement_AUTO" in data:
-                data.pop("BilibiliAgreement_AUTO")
-            if "BilibiliAgreement_AUTO" in data["StartUpThemes"]["next"]:
-                data["StartUpThemes"]["next"].remove("BilibiliAgreement_AUTO")
-
-        with self.maa_tasks_path.open(mode="w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        if self.maa_tasks_patcher.set_bilibili_agreement(
+            bool(if_agree and Config.get(Config.function_IfAgreeBilibili))
+        ):
+            logger.info("已更新MAA任务文件", module=f"MAA调度器-{self.name}")
 
     def push_notification(
         self,
@@ -1920,9 +2666,7 @@ class MaaManager(QObject):
             module=f"MAA调度器-{self.name}",
         )
 
-        env = Environment(
-            loader=FileSystemLoader(str(Config.app_path / "resources/html"))
-        )
+        env = Notify.template_env
 
         if mode == "代理结果" and (
             Config.get(Config.notify_SendTaskResultTime) == "任何时刻"
@@ -1955,12 +2699,17 @@ class MaaManager(QObject):
             # 发送全局通知
 
             if Config.get(Config.notify_IfSendMail):
-                Notify.send_mail(
-                    "网页", title, message_html, Config.get(Config.notify_ToAddress)
+                Notify.submit(
+                    Notify.send_mail,
+                    "网页",
+                    title,
+                    message_html,
+                    Config.get(Config.notify_ToAddress),
                 )
 
             if Config.get(Config.notify_IfServerChan):
-                Notify.ServerChanPush(
+                Notify.submit(
+                    Notify.ServerChanPush,
                     title,
                     f"{serverchan_message}\n\nAUTO_MAA 敬上",
                     Config.get(Config.notify_ServerChanKey),
@@ -1969,7 +2718,8 @@ class MaaManager(QObject):
                 )
 
             if Config.get(Config.notify_IfCompanyWebHookBot):
-                Notify.CompanyWebHookBotPush(
+                Notify.submit(
+                    Notify.CompanyWebHookBotPush,
                     title,
                     f"{message_text}\n\nAUTO_MAA 敬上",
                     Config.get(Config.notify_CompanyWebHookBotUrl),
@@ -2000,9 +2750,8 @@ class MaaManager(QObject):
                 f"{drop_text}"
             )
 
-            # 生成HTML通知内容
-            template = env.get_template("MAA_statistics.html")
-            message_html = template.render(message)
+            # 邮件通知内容由通知服务合并为摘要后统一生成
+            message_mail = ("MAA_statistics.html", message)
 
             # ServerChan的换行是两个换行符。故而将\n替换为\n\n
             serverchan_message = message_text.replace("\n", "\n\n")
@@ -2011,23 +2760,28 @@ class MaaManager(QObject):
             if Config.get(Config.notify_IfSendStatistic):
 
                 if Config.get(Config.notify_IfSendMail):
-                    Notify.send_mail(
-                        "网页", title, message_html, Config.get(Config.notify_ToAddress)
+                    Notify.push_statistic(
+                        "send_mail",
+                        title,
+                        message_mail,
+                        Config.get(Config.notify_ToAddress),
                     )
 
                 if Config.get(Config.notify_IfServerChan):
-                    Notify.ServerChanPush(
+                    Notify.push_statistic(
+                        "ServerChanPush",
                         title,
-                        f"{serverchan_message}\n\nAUTO_MAA 敬上",
+                        serverchan_message,
                         Config.get(Config.notify_ServerChanKey),
                         Config.get(Config.notify_ServerChanTag),
                         Config.get(Config.notify_ServerChanChannel),
                     )
 
                 if Config.get(Config.notify_IfCompanyWebHookBot):
-                    Notify.CompanyWebHookBotPush(
+                    Notify.push_statistic(
+                        "CompanyWebHookBotPush",
                         title,
-                        f"{message_text}\n\nAUTO_MAA 敬上",
+                        message_text,
                         Config.get(Config.notify_CompanyWebHookBotUrl),
                     )
 
@@ -2040,10 +2794,10 @@ class MaaManager(QObject):
                 # 发送邮件通知
                 if user_data["Notify"]["IfSendMail"]:
                     if user_data["Notify"]["ToAddress"]:
-                        Notify.send_mail(
-                            "网页",
+                        Notify.push_statistic(
+                            "send_mail",
                             title,
-                            message_html,
+                            message_mail,
                             user_data["Notify"]["ToAddress"],
                         )
                     else:
@@ -2052,9 +2806,10 @@ class MaaManager(QObject):
                 # 发送ServerChan通知
                 if user_data["Notify"]["IfServerChan"]:
                     if user_data["Notify"]["ServerChanKey"]:
-                        Notify.ServerChanPush(
+                        Notify.push_statistic(
+                            "ServerChanPush",
                             title,
-                            f"{serverchan_message}\n\nAUTO_MAA 敬上",
+                            serverchan_message,
                             user_data["Notify"]["ServerChanKey"],
                             user_data["Notify"]["ServerChanTag"],
                             user_data["Notify"]["ServerChanChannel"],
@@ -2067,9 +2822,10 @@ class MaaManager(QObject):
                 # 推送CompanyWebHookBot通知
                 if user_data["Notify"]["IfCompanyWebHookBot"]:
                     if user_data["Notify"]["CompanyWebHookBotUrl"]:
-                        Notify.CompanyWebHookBotPush(
+                        Notify.push_statistic(
+                            "CompanyWebHookBotPush",
                             title,
-                            f"{message_text}\n\nAUTO_MAA 敬上",
+                            message_text,
                             user_data["Notify"]["CompanyWebHookBotUrl"],
                         )
                     else:
@@ -2088,12 +2844,17 @@ class MaaManager(QObject):
             if Config.get(Config.notify_IfSendSixStar):
 
                 if Config.get(Config.notify_IfSendMail):
-                    Notify.send_mail(
-                        "网页", title, message_html, Config.get(Config.notify_ToAddress)
+                    Notify.submit(
+                        Notify.send_mail,
+                        "网页",
+                        title,
+                        message_html,
+                        Config.get(Config.notify_ToAddress),
                     )
 
                 if Config.get(Config.notify_IfServerChan):
-                    Notify.ServerChanPush(
+                    Notify.submit(
+                        Notify.ServerChanPush,
                         title,
                         "好羡慕~\n\nAUTO_MAA 敬上",
                         Config.get(Config.notify_ServerChanKey),
@@ -2102,12 +2863,14 @@ class MaaManager(QObject):
                     )
 
                 if Config.get(Config.notify_IfCompanyWebHookBot):
-                    Notify.CompanyWebHookBotPush(
+                    Notify.submit(
+                        Notify.CompanyWebHookBotPush,
                         title,
                         "好羡慕~\n\nAUTO_MAA 敬上",
                         Config.get(Config.notify_CompanyWebHookBotUrl),
                     )
-                    Notify.CompanyWebHookBotPushImage(
+                    Notify.submit(
+                        Notify.CompanyWebHookBotPushImage,
                         Config.app_path / "resources/images/notification/six_star.png",
                         Config.get(Config.notify_CompanyWebHookBotUrl),
                     )
@@ -2118,7 +2881,8 @@ class MaaManager(QObject):
                 # 发送邮件通知
                 if user_data["Notify"]["IfSendMail"]:
                     if user_data["Notify"]["ToAddress"]:
-                        Notify.send_mail(
+                        Notify.submit(
+                            Notify.send_mail,
                             "网页",
                             title,
                             message_html,
@@ -2131,7 +2895,8 @@ class MaaManager(QObject):
                 if user_data["Notify"]["IfServerChan"]:
 
                     if user_data["Notify"]["ServerChanKey"]:
-                        Notify.ServerChanPush(
+                        Notify.submit(
+                            Notify.ServerChanPush,
                             title,
                             "好羡慕~\n\nAUTO_MAA 敬上",
                             user_data["Notify"]["ServerChanKey"],
@@ -2146,12 +2911,14 @@ class MaaManager(QObject):
                 # 推送CompanyWebHookBot通知
                 if user_data["Notify"]["IfCompanyWebHookBot"]:
                     if user_data["Notify"]["CompanyWebHookBotUrl"]:
-                        Notify.CompanyWebHookBotPush(
+                        Notify.submit(
+                            Notify.CompanyWebHookBotPush,
                             title,
                             "好羡慕~\n\nAUTO_MAA 敬上",
                             user_data["Notify"]["CompanyWebHookBotUrl"],
                         )
-                        Notify.CompanyWebHookBotPushImage(
+                        Notify.submit(
+                            Notify.CompanyWebHookBotPushImage,
                             Config.app_path
                             / "resources/images/notification/six_star.png",
                             Config.get(Config.notify_CompanyWebHookBotUrl),
@@ -2162,3 +2929,58 @@ class MaaManager(QObject):
                         )
 
         return None
+
+
+class MaaWorker(QThread):
+    """MAA多开实例线程，在独立线程中运行一个使用指定MAA与模拟器的调度器"""
+
+    def __init__(
+        self,
+        manager: "MaaManager",
+        worker: Dict[str, str],
+        user_queue: queue.Queue,
+        curdate: str,
+        current_date: str,
+    ):
+        super().__init__()
+
+        self.manager = manager
+        self.worker = worker
+        self.user_queue = user_queue
+        self.curdate = curdate
+        self.current_date = current_date
+        self.task = None
+        self.if_interrupted = False
+
+    def run(self):
+
+        # 调度器需在本线程中创建，以便其日志监视器与事件循环归属于本线程
+        self.task = MaaManager(
+            self.manager.mode,
+            self.manager.script_config,
+            worker=self.worker,
+            primary=self.manager,
+        )
+        self.task.isInterruptionRequested = self.if_interrupted
+
+        self.task.push_info_bar.connect(self.manager.push_info_bar)
+        self.task.play_sound.connect(self.manager.play_sound)
+        self.task.update_user_list.connect(self.manager.update_user_list)
+        self.task.update_log_text.connect(
+            lambda text: self.manager.update_log_text.emit(f"{self.task.name}\n{text}")
+        )
+
+        try:
+            self.task.work(self.user_queue, self.curdate, self.current_date)
+        except Exception as e:
+            logger.exception(f"多开实例异常：{e}", module=f"MAA调度器-{self.task.name}")
+            self.manager.push_info_bar.emit("error", "多开实例异常", self.task.name, -1)
+
+        self.task.deleteLater()
+
+    def requestInterruption(self) -> None:
+        """请求中止多开实例"""
+
+        self.if_interrupted = True
+        if self.task is not None:
+            self.task.requestInterruption()
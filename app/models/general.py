@@ -33,7 +33,6 @@ import subprocess
 from functools import partial
 from datetime import datetime, timedelta
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 from typing import Union, List, Dict
 
 from app.core import Config, GeneralConfig, GeneralSubConfig, logger
@@ -404,7 +403,7 @@ class GeneralManager(QObject):
                             module=f"通用调度器-{self.name}",
                         )
                         self.script_process_manager.kill()
-                        System.kill_process(self.script_exe_path)
+                        kill_list = [self.script_exe_path]
                         if self.set["Game"]["Enabled"]:
                             logger.info(
                                 f"中止游戏/模拟器进程：{list(self.game_process_manager.tracked_pids)}",
@@ -412,7 +411,8 @@ class GeneralManager(QObject):
                             )
                             self.game_process_manager.kill()
                             if self.set["Game"]["IfForceClose"]:
-                                System.kill_process(self.game_path)
+                                kill_list.append(self.game_path)
+                        System.kill_processes(kill_list)
 
                         logger.info(
                             f"配置: {sub[0]} - 通用脚本进程完成代理任务",
@@ -465,7 +465,7 @@ class GeneralManager(QObject):
                             module=f"通用调度器-{self.name}",
                         )
                         self.script_process_manager.kill()
-                        System.kill_process(self.script_exe_path)
+                        kill_list = [self.script_exe_path]
                         if self.set["Game"]["Enabled"]:
                             logger.info(
                                 f"中止游戏/模拟器进程：{list(self.game_process_manager.tracked_pids)}",
@@ -473,7 +473,8 @@ class GeneralManager(QObject):
                             )
                             self.game_process_manager.kill()
                             if self.set["Game"]["IfForceClose"]:
-                                System.kill_process(self.game_path)
+                                kill_list.append(self.game_path)
+                        System.kill_processes(kill_list)
 
                         # 推送异常通知
                         Notify.push_plyer(
@@ -636,7 +637,7 @@ class GeneralManager(QObject):
                     module=f"通用调度器-{self.name}",
                 )
                 self.script_process_manager.kill(if_force=True)
-                System.kill_process(self.script_exe_path)
+                kill_list = [self.script_exe_path]
                 if self.set["Game"]["Enabled"]:
                     logger.info(
                         f"关闭可能未正常退出的游戏/模拟器进程：{list(self.game_process_manager.tracked_pids)}",
@@ -644,7 +645,8 @@ class GeneralManager(QObject):
                     )
                     self.game_process_manager.kill(if_force=True)
                     if self.set["Game"]["IfForceClose"]:
-                        System.kill_process(self.game_path)
+                        kill_list.append(self.game_path)
+                System.kill_processes(kill_list)
 
             # 更新用户数据
             updated_info = {_[2]: self.data[_[2]] for _ in self.sub_list}
@@ -692,6 +694,7 @@ class GeneralManager(QObject):
                 f"已完成配置数：{len(over_index)}，未完成配置数：{len(error_index) + len(wait_index)}",
                 10,
             )
+            Notify.flush_digest()
             self.push_notification("代理结果", title, result)
 
         # 复原通用脚本配置文件
@@ -944,9 +947,9 @@ class GeneralManager(QObject):
 
         # 配置前关闭可能未正常退出的脚本进程
         if self.mode == "自动代理":
-            System.kill_process(self.script_exe_path)
+            System.kill_processes([self.script_exe_path])
         elif self.mode == "设置通用脚本":
-            System.kill_process(self.script_set_exe_path)
+            System.kill_processes([self.script_set_exe_path])
 
         # 预导入配置文件
         if self.mode == "设置通用脚本":
@@ -1061,9 +1064,7 @@ class GeneralManager(QObject):
             module=f"通用调度器-{self.name}",
         )
 
-        env = Environment(
-            loader=FileSystemLoader(str(Config.app_path / "resources/html"))
-        )
+        env = Notify.template_env
 
         if mode == "代理结果" and (
             Config.get(Config.notify_SendTaskResultTime) == "任何时刻"
@@ -1096,12 +1097,17 @@ class GeneralManager(QObject):
             # 发送全局通知
 
             if Config.get(Config.notify_IfSendMail):
-                Notify.send_mail(
-                    "网页", title, message_html, Config.get(Config.notify_ToAddress)
+                Notify.submit(
+                    Notify.send_mail,
+                    "网页",
+                    title,
+                    message_html,
+                    Config.get(Config.notify_ToAddress),
                 )
 
             if Config.get(Config.notify_IfServerChan):
-                Notify.ServerChanPush(
+                Notify.submit(
+                    Notify.ServerChanPush,
                     title,
                     f"{serverchan_message}\n\nAUTO_MAA 敬上",
                     Config.get(Config.notify_ServerChanKey),
@@ -1110,7 +1116,8 @@ class GeneralManager(QObject):
                 )
 
             if Config.get(Config.notify_IfCompanyWebHookBot):
-                Notify.CompanyWebHookBotPush(
+                Notify.submit(
+                    Notify.CompanyWebHookBotPush,
                     title,
                     f"{message_text}\n\nAUTO_MAA 敬上",
                     Config.get(Config.notify_CompanyWebHookBotUrl),
@@ -1124,9 +1131,8 @@ class GeneralManager(QObject):
                 f"通用脚本执行结果: {message['sub_result']}\n\n"
             )
 
-            # 生成HTML通知内容
-            template = env.get_template("general_statistics.html")
-            message_html = template.render(message)
+            # 邮件通知内容由通知服务合并为摘要后统一生成
+            message_mail = ("general_statistics.html", message)
 
             # ServerChan的换行是两个换行符。故而将\n替换为\n\n
             serverchan_message = message_text.replace("\n", "\n\n")
@@ -1135,23 +1141,28 @@ class GeneralManager(QObject):
             if Config.get(Config.notify_IfSendStatistic):
 
                 if Config.get(Config.notify_IfSendMail):
-                    Notify.send_mail(
-                        "网页", title, message_html, Config.get(Config.notify_ToAddress)
+                    Notify.push_statistic(
+                        "send_mail",
+                        title,
+                        message_mail,
+                        Config.get(Config.notify_ToAddress),
                     )
 
                 if Config.get(Config.notify_IfServerChan):
-                    Notify.ServerChanPush(
+                    Notify.push_statistic(
+                        "ServerChanPush",
                         title,
-                        f"{serverchan_message}\n\nAUTO_MAA 敬上",
+                        serverchan_message,
                         Config.get(Config.notify_ServerChanKey),
                         Config.get(Config.notify_ServerChanTag),
                         Config.get(Config.notify_ServerChanChannel),
                     )
 
                 if Config.get(Config.notify_IfCompanyWebHookBot):
-                    Notify.CompanyWebHookBotPush(
+                    Notify.push_statistic(
+                        "CompanyWebHookBotPush",
                         title,
-                        f"{message_text}\n\nAUTO_MAA 敬上",
+                        message_text,
                         Config.get(Config.notify_CompanyWebHookBotUrl),
                     )
 
@@ -1161,10 +1172,10 @@ class GeneralManager(QObject):
                 # 发送邮件通知
                 if sub_data["Notify"]["IfSendMail"]:
                     if sub_data["Notify"]["ToAddress"]:
-                        Notify.send_mail(
-                            "网页",
+                        Notify.push_statistic(
+                            "send_mail",
                             title,
-                            message_html,
+                            message_mail,
                             sub_data["Notify"]["ToAddress"],
                         )
                     else:
@@ -1173,9 +1184,10 @@ class GeneralManager(QObject):
                 # 发送ServerChan通知
                 if sub_data["Notify"]["IfServerChan"]:
                     if sub_data["Notify"]["ServerChanKey"]:
-                        Notify.ServerChanPush(
+                        Notify.push_statistic(
+                            "ServerChanPush",
                             title,
-                            f"{serverchan_message}\n\nAUTO_MAA 敬上",
+                            serverchan_message,
                             sub_data["Notify"]["ServerChanKey"],
                             sub_data["Notify"]["ServerChanTag"],
                             sub_data["Notify"]["ServerChanChannel"],
@@ -1188,9 +1200,10 @@ class GeneralManager(QObject):
                 # 推送CompanyWebHookBot通知
                 if sub_data["Notify"]["IfCompanyWebHookBot"]:
                     if sub_data["Notify"]["CompanyWebHookBotUrl"]:
-                        Notify.CompanyWebHookBotPush(
+                        Notify.push_statistic(
+                            "CompanyWebHookBotPush",
                             title,
-                            f"{message_text}\n\nAUTO_MAA 敬上",
+                            message_text,
                             sub_data["Notify"]["CompanyWebHookBotUrl"],
                         )
                     else:
@@ -28,19 +28,22 @@ v4.4
 import re
 import smtplib
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formataddr
 from pathlib import Path
-from typing import Union
+from typing import Callable, Dict, List, Set, Tuple, Union
 
 import requests
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from PySide6.QtCore import QObject, Signal
 
 from plyer import notification
 
-from app.core import Config, logger
+from app.core import Config, Network, logger
 from app.services.security import Crypto
 from app.utils.ImageUtils import ImageUtils
 
@@ -49,9 +52,190 @@ class Notification(QObject):
 
     push_info_bar = Signal(str, str, str, int)
 
+    # 统计信息摘要的最长等待时间（秒），超时后自动发送
+    digest_delay = 300
+    # SMTP连接空闲超时时间（秒），超时后关闭连接
+    smtp_idle_timeout = 60
+    # 退出时等待推送任务完成的最长时间（秒），超时后放弃剩余推送
+    shutdown_timeout = 5
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        self.executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="Notification"
+        )
+        self.future_lock = threading.Lock()
+        self.future_set: Set[Future] = set()
+        self.digest_lock = threading.Lock()
+        self.digest_dict: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+        self.digest_timer = None
+
+        # SMTP连接按（服务器, 发件人, 授权码）分别加锁与计时，不同账户的发送互不阻塞
+        self.smtp_lock = threading.Lock()
+        self.smtp_dict: Dict[Tuple[str, str, str], smtplib.SMTP_SSL] = {}
+        self.smtp_lock_dict: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self.smtp_timer_dict: Dict[Tuple[str, str, str], threading.Timer] = {}
+
+        # 共享的通知模板环境，模板编译结果缓存于内存与磁盘，仅在模板文件修改后重新编译
+        (Config.app_path / "data/template_cache").mkdir(parents=True, exist_ok=True)
+        self.template_env = Environment(
+            loader=FileSystemLoader(str(Config.app_path / "resources/html")),
+            bytecode_cache=FileSystemBytecodeCache(
+                str(Config.app_path / "data/template_cache")
+            ),
+            auto_reload=True,
+        )
+
+    def submit(self, func: Callable, *args) -> Future:
+        """
+        将通知推送任务提交至后台线程池，不阻塞调用线程
+
+        :param func: 推送方法
+        :param args: 推送方法的参数
+        :return: 推送任务的Future对象
+        """
+
+        def run():
+            try:
+                return func(*args)
+            except Exception as e:
+                logger.exception(f"推送通知时出现异常：{e}", module="通知服务")
+
+        future = self.executor.submit(run)
+        with self.future_lock:
+            self.future_set.add(future)
+        future.add_done_callback(self.remove_future)
+        return future
+
+    def remove_future(self, future: Future) -> None:
+        """
+        推送任务结束后将其移出未完成任务集合
+
+        :param future: 已结束的推送任务
+        """
+
+        with self.future_lock:
+            self.future_set.discard(future)
+
+    def push_statistic(self, channel: str, title: str, content: str, *target) -> None:
+        """
+        将统计信息加入摘要队列，发往同一目标的统计信息将合并为一条摘要发送
+
+        :param channel: 推送渠道，支持 "send_mail"、"ServerChanPush" 和 "CompanyWebHookBotPush"
+        :param title: 通知标题
+        :param content: 通知内容，邮件为（模板名称, 模板数据），其余渠道为不含落款的文本内容
+        :param target: 推送目标参数，与对应推送方法中通知内容之后的参数一致
+        """
+
+        with self.digest_lock:
+
+            self.digest_dict.setdefault((channel, *target), []).append((title, content))
+
+            if self.digest_timer is None:
+                self.digest_timer = threading.Timer(
+                    self.digest_delay, self.flush_digest
+                )
+                self.digest_timer.daemon = True
+                self.digest_timer.start()
+
+    def flush_digest(self) -> None:
+        """将摘要队列中的统计信息合并后提交推送"""
+
+        with self.digest_lock:
+            digest_dict, self.digest_dict = self.digest_dict, {}
+            if self.digest_timer is not None:
+                self.digest_timer.cancel()
+                self.digest_timer = None
+
+        for (channel, *target), message_list in digest_dict.items():
+
+            logger.info(
+                f"推送统计信息摘要：{channel}，共{len(message_list)}条",
+                module="通知服务",
+            )
+
+            if channel == "send_mail":
+                # 邮件按模板分组，同一模板的统计信息由模板逐条渲染为一封邮件
+                template_dict: Dict[str, List[Tuple[str, dict]]] = {}
+                for title, (template, data) in message_list:
+                    template_dict.setdefault(template, []).append((title, data))
+                for template, data_list in template_dict.items():
+                    self.submit(
+                        self.send_mail_digest,
+                        self.get_digest_title([_[0] for _ in data_list]),
+                        template,
+                        [_[1] for _ in data_list],
+                        *target,
+                    )
+
+            elif channel == "ServerChanPush":
+                content = "\n\n---\n\n".join(_[1] for _ in message_list)
+                self.submit(
+                    self.ServerChanPush,
+                    self.get_digest_title([_[0] for _ in message_list]),
+                    f"{content}\n\nAUTO_MAA 敬上",
+                    *target,
+                )
+
+            elif channel == "CompanyWebHookBotPush":
+                content = "\n\n----------\n\n".join(_[1] for _ in message_list)
+                self.submit(
+                    self.CompanyWebHookBotPush,
+                    self.get_digest_title([_[0] for _ in message_list]),
+                    f"{content}\n\nAUTO_MAA 敬上",
+                    *target,
+                )
+
+    def get_digest_title(self, title_list: List[str]) -> str:
+        """
+        生成统计信息摘要的标题
+
+        :param title_list: 摘要中各条统计信息的标题
+        :return: 摘要标题
+        """
+
+        if len(title_list) == 1:
+            return title_list[0]
+        return f"{title_list[0]} 等{len(title_list)}条统计信息"
+
+    def send_mail_digest(
+        self, title: str, template: str, message_list: List[dict], to_address: str
+    ) -> None:
+        """
+        以同一模板渲染多条统计信息，合并为一封邮件发送
+
+        :param title: 邮件标题
+        :param template: 模板名称
+        :param message_list: 各条统计信息的模板数据
+        :param to_address: 收件人地址
+        """
+
+        content = self.template_env.get_template(template).render(
+            message_list=message_list
+        )
+        self.send_mail("网页", title, content, to_address)
+
+    def shutdown(self) -> None:
+        """发送剩余的统计信息摘要，并在限定时间内等待推送任务完成"""
+
+        self.flush_digest()
+
+        with self.future_lock:
+            future_list = list(self.future_set)
+        _, not_done = wait(future_list, timeout=self.shutdown_timeout)
+
+        # 退出时不无限等待网络，超时后放弃尚未开始与仍在进行的推送
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            logger.warning(
+                f"退出时仍有{len(not_done)}条通知未推送完成，已放弃",
+                module="通知服务",
+            )
+        else:
+            self.close_smtp()
+
     def push_plyer(self, title, message, ticker, t) -> bool:
         """
         推送系统通知
@@ -137,20 +321,115 @@ class Notification(QObject):
             if mode == "网页":
                 message.attach(MIMEText(content, "html", "utf-8"))
 
-            smtpObj = smtplib.SMTP_SSL(Config.get(Config.notify_SMTPServerAddress), 465)
-            smtpObj.login(
+            self.send_smtp(
+                Config.get(Config.notify_SMTPServerAddress),
                 Config.get(Config.notify_FromAddress),
-                Crypto.win_decryptor(Config.get(Config.notify_AuthorizationCode)),
+                Config.get(Config.notify_AuthorizationCode),
+                to_address,
+                message.as_string(),
             )
-            smtpObj.sendmail(
-                Config.get(Config.notify_FromAddress), to_address, message.as_string()
-            )
-            smtpObj.quit()
             logger.success(f"邮件发送成功：{title}", module="通知服务")
         except Exception as e:
             logger.exception(f"发送邮件时出错：{e}", module="通知服务")
             self.push_info_bar.emit("error", "发送邮件时出错", f"{e}", -1)
 
+    def send_smtp(
+        self,
+        server: str,
+        from_address: str,
+        authorization_code: str,
+        to_address: str,
+        message: str,
+    ) -> None:
+        """
+        通过连接池中的SMTP连接发送邮件，连接断开时自动重连
+
+        :param server: SMTP服务器地址
+        :param from_address: 发件人地址
+        :param authorization_code: 加密后的授权码
+        :param to_address: 收件人地址
+        :param message: 邮件内容
+        """
+
+        key = (server, from_address, authorization_code)
+
+        with self.get_smtp_lock(key):
+
+            if key in self.smtp_timer_dict:
+                self.smtp_timer_dict.pop(key).cancel()
+
+            try:
+                for if_retry in (False, True):
+
+                    if key not in self.smtp_dict:
+                        logger.info(f"建立SMTP连接：{server}", module="通知服务")
+                        smtp = smtplib.SMTP_SSL(server, 465, timeout=30)
+                        try:
+                            smtp.login(
+                                from_address, Crypto.win_decryptor(authorization_code)
+                            )
+                        except Exception:
+                            smtp.close()
+                            raise
+                        self.smtp_dict[key] = smtp
+
+                    try:
+                        self.smtp_dict[key].sendmail(from_address, to_address, message)
+                        break
+                    except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                        # 服务器已关闭空闲连接，重连后重试一次
+                        self.smtp_dict.pop(key).close()
+                        if if_retry:
+                            raise
+                        logger.warning(
+                            f"SMTP连接已断开，正在重连：{e}", module="通知服务"
+                        )
+
+            finally:
+                if key in self.smtp_dict:
+                    timer = threading.Timer(
+                        self.smtp_idle_timeout, self.close_smtp, args=(key,)
+                    )
+                    timer.daemon = True
+                    timer.start()
+                    self.smtp_timer_dict[key] = timer
+
+    def get_smtp_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        """
+        获取指定SMTP连接的锁，不存在时创建
+
+        :param key: SMTP连接标识（服务器, 发件人, 授权码）
+        :return: 对应的锁
+        """
+
+        with self.smtp_lock:
+            return self.smtp_lock_dict.setdefault(key, threading.Lock())
+
+    def close_smtp(self, key: Tuple[str, str, str] = None) -> None:
+        """
+        关闭连接池中的SMTP连接
+
+        :param key: 需要关闭的SMTP连接标识，为空时关闭所有连接
+        """
+
+        with self.smtp_lock:
+            key_list = list(self.smtp_lock_dict) if key is None else [key]
+
+        for key in key_list:
+
+            with self.get_smtp_lock(key):
+
+                if key in self.smtp_timer_dict:
+                    self.smtp_timer_dict.pop(key).cancel()
+
+                if key in self.smtp_dict:
+                    smtp = self.smtp_dict.pop(key)
+                    try:
+                        smtp.quit()
+                    except (OSError, smtplib.SMTPException):
+                        smtp.close()
+                    logger.info(f"关闭SMTP连接：{key[0]}", module="通知服务")
+
     def ServerChanPush(
         self, title, content, send_key, tag, channel
     ) -> Union[bool, str]:
@@ -222,15 +501,11 @@ class Notification(QObject):
             params = {"title": title, "desp": content, **options}
             headers = {"Content-Type": "application/json;charset=utf-8"}
 
-            response = requests.post(
+            response = Network.get_session().post(
                 url,
                 json=params,
                 headers=headers,
                 timeout=10,
-                proxies={
-                    "http": Config.get(Config.update_ProxyAddress),
-                    "https": Config.get(Config.update_ProxyAddress),
-                },
             )
             result = response.json()
 
@@ -282,14 +557,10 @@ class Notification(QObject):
 
         for _ in range(3):
             try:
-                response = requests.post(
+                response = Network.get_session().post(
                     url=webhook_url,
                     json=data,
                     timeout=10,
-                    proxies={
-                        "http": Config.get(Config.update_ProxyAddress),
-                        "https": Config.get(Config.update_ProxyAddress),
-                    },
                 )
                 info = response.json()
                 break
@@ -379,14 +650,10 @@ class Notification(QObject):
 
             for _ in range(3):
                 try:
-                    response = requests.post(
+                    response = Network.get_session().post(
                         url=webhook_url,
                         json=data,
                         timeout=10,
-                        proxies={
-                            "http": Config.get(Config.update_ProxyAddress),
-                            "https": Config.get(Config.update_ProxyAddress),
-                        },
                     )
                     info = response.json()
                     break
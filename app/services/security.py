@@ -29,17 +29,34 @@ import hashlib
 import random
 import secrets
 import base64
+import threading
+import time
 import win32crypt
 from Crypto.Cipher import AES
 from Crypto.PublicKey import RSA
 from Crypto.Cipher import PKCS1_OAEP
 from Crypto.Util.Padding import pad, unpad
 
-from app.core import Config
+from typing import List
+
+from app.core import Config, logger
 
 
 class CryptoHandler:
 
+    # 解锁后的私钥在闲置超过该时长（秒）后自动清除
+    idle_timeout = 300
+
+    def __init__(self) -> None:
+
+        self.public_key = None
+        self.private_key = None
+        self.AES_password = None
+        self.PASSWORD_salt = None
+        self.last_used = 0
+        self.session_lock = threading.RLock()
+        self.expiry_timer = None
+
     def get_PASSWORD(self, PASSWORD: str) -> None:
         """
         配置管理密钥
@@ -48,6 +65,10 @@ class CryptoHandler:
         :type PASSWORD: str
         """
 
+        # 密钥即将更换，清除已解锁的会话
+        self.lock()
+        self.public_key = None
+
         # 生成目录
         Config.key_path.mkdir(parents=True, exist_ok=True)
 
@@ -86,6 +107,131 @@ class CryptoHandler:
         private_key_local = AES_key.encrypt(pad(private_key.exportKey(), 32))
         (Config.app_path / "data/key/private_key.bin").write_bytes(private_key_local)
 
+    def unlock(self, PASSWORD: str) -> bool:
+        """
+        使用管理密钥解锁RSA私钥并缓存于内存中
+
+        :param PASSWORD: 管理密钥
+        :type PASSWORD: str
+        :return: 是否解锁成功
+        :rtype: bool
+        """
+
+        with self.session_lock:
+
+            # 读入RSA私钥密文、盐与校验哈希值
+            private_key_local = (
+                (Config.app_path / "data/key/private_key.bin").read_bytes().strip()
+            )
+            PASSWORD_salt = (
+                (Config.app_path / "data/key/PASSWORDsalt.txt")
+                .read_text(encoding="utf-8")
+                .strip()
+            )
+            verify_salt = (
+                (Config.app_path / "data/key/verifysalt.txt")
+                .read_text(encoding="utf-8")
+                .strip()
+            )
+            AES_password_verify = (
+                (Config.app_path / "data/key/AES_password_verify.bin")
+                .read_bytes()
+                .strip()
+            )
+            # 将管理密钥转化为AES-256密钥并验证
+            AES_password = hashlib.sha256(
+                (PASSWORD + PASSWORD_salt).encode("utf-8")
+            ).digest()
+            AES_password_SHA = hashlib.sha256(
+                AES_password + verify_salt.encode("utf-8")
+            ).digest()
+            if AES_password_SHA != AES_password_verify:
+                return False
+
+            # AES解密RSA私钥
+            AES_key = AES.new(AES_password, AES.MODE_ECB)
+            private_key_pem = unpad(AES_key.decrypt(private_key_local), 32)
+
+            self.private_key = RSA.import_key(private_key_pem)
+            self.AES_password = AES_password
+            self.PASSWORD_salt = PASSWORD_salt
+            self.last_used = time.monotonic()
+            self.schedule_expiry(self.idle_timeout)
+
+            logger.info("管理密钥会话已解锁", module="安全服务")
+
+            return True
+
+    def lock(self) -> None:
+        """清除内存中已解锁的RSA私钥"""
+
+        with self.session_lock:
+
+            if self.expiry_timer is not None:
+                self.expiry_timer.cancel()
+                self.expiry_timer = None
+
+            if self.private_key is not None:
+                logger.info("管理密钥会话已锁定", module="安全服务")
+
+            self.private_key = None
+            self.AES_password = None
+            self.PASSWORD_salt = None
+
+    def schedule_expiry(self, delay: float) -> None:
+        """
+        安排闲置超时检查
+
+        :param delay: 距离下次检查的时长（秒）
+        :type delay: float
+        """
+
+        if self.expiry_timer is not None:
+            self.expiry_timer.cancel()
+
+        self.expiry_timer = threading.Timer(delay, self.check_expiry)
+        self.expiry_timer.daemon = True
+        self.expiry_timer.start()
+
+    def check_expiry(self) -> None:
+        """闲置超时后锁定会话，期间有使用则顺延检查"""
+
+        with self.session_lock:
+
+            if self.private_key is None:
+                return None
+
+            idle_time = time.monotonic() - self.last_used
+            if idle_time >= self.idle_timeout:
+                self.expiry_timer = None
+                self.lock()
+            else:
+                self.schedule_expiry(self.idle_timeout - idle_time)
+
+    def get_private_key(self, PASSWORD: str):
+        """
+        获取已解锁的RSA私钥，会话未解锁或已过期时使用管理密钥解锁
+
+        :param PASSWORD: 管理密钥
+        :type PASSWORD: str
+        :return: RSA私钥，管理密钥错误时返回 None
+        """
+
+        with self.session_lock:
+
+            # 会话中的私钥仅对解锁时使用的管理密钥有效
+            if self.private_key is not None and (
+                hashlib.sha256((PASSWORD + self.PASSWORD_salt).encode("utf-8")).digest()
+                == self.AES_password
+            ):
+                self.last_used = time.monotonic()
+                return self.private_key
+
+            if self.unlock(PASSWORD):
+                return self.private_key
+
+            return None
+
     def AUTO_encryptor(self, note: str) -> str:
         """
         使用AUTO_MAA的算法加密数据
@@ -98,11 +244,12 @@ class CryptoHandler:
             return ""
 
         # 读取RSA公钥
-        public_key_local = RSA.import_key(
-            (Config.app_path / "data/key/public_key.pem").read_bytes()
-        )
+        if self.public_key is None:
+            self.public_key = RSA.import_key(
+                (Config.app_path / "data/key/public_key.pem").read_bytes()
+            )
         # 使用RSA公钥对数据进行加密
-        cipher = PKCS1_OAEP.new(public_key_local)
+        cipher = PKCS1_OAEP.new(self.public_key)
         encrypted = cipher.encrypt(note.encode("utf-8"))
         return base64.b64encode(encrypted).decode("utf-8")
 
@@ -118,44 +265,49 @@ class CryptoHandler:
         :rtype: str
         """
 
-        if note == "":
-            return ""
+        return self.AUTO_batch_decryptor([note], PASSWORD)[0]
 
-        # 读入RSA私钥密文、盐与校验哈希值
-        private_key_local = (
-            (Config.app_path / "data/key/private_key.bin").read_bytes().strip()
-        )
-        PASSWORD_salt = (
-            (Config.app_path / "data/key/PASSWORDsalt.txt")
-            .read_text(encoding="utf-8")
-            .strip()
-        )
-        verify_salt = (
-            (Config.app_path / "data/key/verifysalt.txt")
-            .read_text(encoding="utf-8")
-            .strip()
-        )
-        AES_password_verify = (
-            (Config.app_path / "data/key/AES_password_verify.bin").read_bytes().strip()
-        )
-        # 将管理密钥转化为AES-256密钥并验证
-        AES_password = hashlib.sha256(
-            (PASSWORD + PASSWORD_salt).encode("utf-8")
-        ).digest()
-        AES_password_SHA = hashlib.sha256(
-            AES_password + verify_salt.encode("utf-8")
-        ).digest()
-        if AES_password_SHA != AES_password_verify:
-            return "管理密钥错误"
-        else:
-            # AES解密RSA私钥
-            AES_key = AES.new(AES_password, AES.MODE_ECB)
-            private_key_pem = unpad(AES_key.decrypt(private_key_local), 32)
-            private_key = RSA.import_key(private_key_pem)
-            # 使用RSA私钥解密数据
-            decrypter = PKCS1_OAEP.new(private_key)
-            note = decrypter.decrypt(base64.b64decode(note)).decode("utf-8")
-            return note
+    def AUTO_batch_encryptor(self, note_list: List[str]) -> List[str]:
+        """
+        使用AUTO_MAA的算法批量加密数据
+
+        :param note_list: 数据明文列表
+        :type note_list: List[str]
+        :return: 加密后的密文列表
+        :rtype: List[str]
+        """
+
+        return [self.AUTO_encryptor(note) for note in note_list]
+
+    def AUTO_batch_decryptor(self, note_list: List[str], PASSWORD: str) -> List[str]:
+        """
+        使用AUTO_MAA的算法批量解密数据，仅需解锁一次私钥
+
+        :param note_list: 数据密文列表
+        :type note_list: List[str]
+        :param PASSWORD: 管理密钥
+        :type PASSWORD: str
+        :return: 解密后的明文列表，管理密钥错误时均为"管理密钥错误"
+        :rtype: List[str]
+        """
+
+        if all(note == "" for note in note_list):
+            return ["" for _ in note_list]
+
+        private_key = self.get_private_key(PASSWORD)
+        if private_key is None:
+            return ["" if note == "" else "管理密钥错误" for note in note_list]
+
+        # 使用RSA私钥解密数据
+        decrypter = PKCS1_OAEP.new(private_key)
+        return [
+            (
+                decrypter.decrypt(base64.b64decode(note)).decode("utf-8")
+                if note != ""
+                else ""
+            )
+            for note in note_list
+        ]
 
     def change_PASSWORD(self, PASSWORD_old: str, PASSWORD_new: str) -> None:
         """
@@ -167,28 +319,24 @@ class CryptoHandler:
         :type PASSWORD_new: str
         """
 
-        for script in Config.script_dict.values():
-
-            # 使用旧管理密钥解密
-            if script["Type"] == "Maa":
-                for user in script["UserData"].values():
-                    user["Password"] = self.AUTO_decryptor(
-                        user["Config"].get(user["Config"].Info_Password), PASSWORD_old
-                    )
+        user_list = [
+            user
+            for script in Config.script_dict.values()
+            if script["Type"] == "Maa"
+            for user in script["UserData"].values()
+        ]
+
+        # 使用旧管理密钥解密
+        password_list = self.AUTO_batch_decryptor(
+            [user["Config"].get(user["Config"].Info_Password) for user in user_list],
+            PASSWORD_old,
+        )
 
         self.get_PASSWORD(PASSWORD_new)
 
-        for script in Config.script_dict.values():
-
-            # 使用新管理密钥重新加密
-            if script["Type"] == "Maa":
-                for user in script["UserData"].values():
-                    user["Config"].set(
-                        user["Config"].Info_Password,
-                        self.AUTO_encryptor(user["Password"]),
-                    )
-                    user["Password"] = None
-                    del user["Password"]
+        # 使用新管理密钥重新加密
+        for user, password in zip(user_list, self.AUTO_batch_encryptor(password_list)):
+            user["Config"].set(user["Config"].Info_Password, password)
 
     def reset_PASSWORD(self, PASSWORD_new: str) -> None:
         """
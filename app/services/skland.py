@@ -36,15 +36,17 @@ import time
 import json
 import hmac
 import hashlib
-import requests
 from urllib import parse
 
-from app.core import Config, logger
+from app.core import Network, logger
 
 
 def skland_sign_in(token) -> dict:
     """森空岛签到"""
 
+    # 每个token使用独立Cookie，避免不同账号及其他模块之间共享登录状态
+    session = Network.get_session(if_private=True)
+
     app_code = "4ca99fa6b56cc2ba"
     # 用于获取grant code
     grant_code_url = "https://as.hypergryph.com/user/oauth2/v2/grant"
@@ -60,7 +62,6 @@ def skland_sign_in(token) -> dict:
         "cred": "",
         "User-Agent": "Skland/1.5.1 (com.hypergryph.skland; build:100501001; Android 34;) Okhttp/4.11.0",
         "Accept-Encoding": "gzip",
-        "Connection": "close",
     }
     header_login = header.copy()
     header_for_sign = {
@@ -151,14 +152,10 @@ def skland_sign_in(token) -> dict:
         :return: (cred, sign_token)
         """
 
-        rsp = requests.post(
+        rsp = session.post(
             cred_code_url,
             json={"code": grant, "kind": 1},
             headers=header_login,
-            proxies={
-                "http": Config.get(Config.update_ProxyAddress),
-                "https": Config.get(Config.update_ProxyAddress),
-            },
         ).json()
         if rsp["code"] != 0:
             raise Exception(f'获得cred失败：{rsp.get("messgae")}')
@@ -173,14 +170,10 @@ def skland_sign_in(token) -> dict:
         :param token: 你的skyland token
         :return: grant code
         """
-        rsp = requests.post(
+        rsp = session.post(
             grant_code_url,
             json={"appCode": app_code, "token": token, "type": 0},
             headers=header_login,
-            proxies={
-                "http": Config.get(Config.update_ProxyAddress),
-                "https": Config.get(Config.update_ProxyAddress),
-            },
         ).json()
         if rsp["status"] != 0:
             raise Exception(
@@ -197,15 +190,11 @@ def skland_sign_in(token) -> dict:
         :return: 角色列表
         """
         v = []
-        rsp = requests.get(
+        rsp = session.get(
             binding_url,
             headers=get_sign_header(
                 binding_url, "get", None, copy_header(cred), sign_token
             ),
-            proxies={
-                "http": Config.get(Config.update_ProxyAddress),
-                "https": Config.get(Config.update_ProxyAddress),
-            },
         ).json()
         if rsp["code"] != 0:
             logger.error(
@@ -243,16 +232,12 @@ def skland_sign_in(token) -> dict:
                 "uid": character.get("uid"),
                 "gameId": character.get("channelMasterId"),
             }
-            rsp = requests.post(
+            rsp = session.post(
                 sign_url,
                 headers=get_sign_header(
                     sign_url, "post", body, copy_header(cred), sign_token
                 ),
                 json=body,
-                proxies={
-                    "http": Config.get(Config.update_ProxyAddress),
-                    "https": Config.get(Config.update_ProxyAddress),
-                },
             ).json()
 
             if rsp["code"] != 0:
@@ -34,8 +34,11 @@ import psutil
 import subprocess
 import tempfile
 import getpass
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Iterable
 
 from app.core import Config, logger
 
@@ -45,8 +48,18 @@ class _SystemHandler:
     ES_CONTINUOUS = 0x80000000
     ES_SYSTEM_REQUIRED = 0x00000001
 
+    # 进程表快照有效期（秒）
+    SNAPSHOT_TTL = 1.0
+    # 中止进程时等待进程退出的超时时间（秒）
+    KILL_TIMEOUT = 3.0
+
     def __init__(self):
 
+        self.snapshot_lock = threading.Lock()
+        self.snapshot_time = 0.0
+        self.process_list: List[psutil.Process] = []
+        self.exe_dict: Dict[str, List[psutil.Process]] = {}
+
         self.set_Sleep()
         self.set_SelfStart()
 
@@ -265,7 +278,7 @@ class _SystemHandler:
         logger.info("正在清除模拟器进程", module="系统服务")
 
         keywords = ["Nemu", "nemu", "emulator", "MuMu"]
-        for proc in psutil.process_iter(["pid", "name"]):
+        for proc in self.get_process_snapshot():
             try:
                 pname = proc.info["name"].lower()
                 if any(keyword.lower() in pname for keyword in keywords):
@@ -274,9 +287,11 @@ class _SystemHandler:
                         f"已关闭 MuMu 模拟器进程: {proc.info['name']}",
                         module="系统服务",
                     )
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
                 continue
 
+        self.invalidate_snapshot()
+
         logger.success("模拟器进程清除完成", module="系统服务")
 
     def is_startup(self) -> bool:
@@ -309,6 +324,99 @@ class _SystemHandler:
         win32gui.EnumWindows(callback, window_info)
         return window_info
 
+    def get_process_snapshot(self, if_refresh: bool = False) -> List[psutil.Process]:
+        """
+        获取进程表快照，快照在有效期内复用，并按可执行文件路径建立索引
+
+        :param if_refresh: 是否强制刷新快照
+        :return: 进程列表
+        """
+
+        with self.snapshot_lock:
+
+            if if_refresh or time.monotonic() - self.snapshot_time > self.SNAPSHOT_TTL:
+
+                process_list = []
+                exe_dict: Dict[str, List[psutil.Process]] = {}
+                for proc in psutil.process_iter(["pid", "exe", "name"]):
+                    process_list.append(proc)
+                    if proc.info["exe"]:
+                        exe_dict.setdefault(proc.info["exe"].lower(), []).append(proc)
+
+                self.process_list = process_list
+                self.exe_dict = exe_dict
+                self.snapshot_time = time.monotonic()
+
+            return self.process_list
+
+    def invalidate_snapshot(self) -> None:
+        """使进程表快照失效"""
+
+        with self.snapshot_lock:
+            self.snapshot_time = 0.0
+
+    def search_processes(
+        self, paths: Iterable[Path]
+    ) -> Dict[Path, List[psutil.Process]]:
+        """
+        根据路径批量查找进程
+
+        :param paths: 进程路径列表
+        :return: 路径与匹配进程列表的对照表
+        """
+
+        self.get_process_snapshot()
+
+        with self.snapshot_lock:
+            return {
+                path: [
+                    proc
+                    for proc in self.exe_dict.get(str(path).lower(), [])
+                    if proc.is_running()
+                ]
+                for path in paths
+            }
+
+    def kill_processes(self, paths: Iterable[Path]) -> None:
+        """
+        根据路径批量中止进程及其子进程
+
+        :param paths: 进程路径列表
+        """
+
+        paths = list(paths)
+
+        logger.info(f"开始中止进程: {paths}", module="系统服务")
+
+        # 收集所有待中止的进程及其子进程
+        kill_dict: Dict[int, psutil.Process] = {}
+        for proc_list in self.search_processes(paths).values():
+            for proc in proc_list:
+                kill_dict[proc.pid] = proc
+                try:
+                    for child in proc.children(recursive=True):
+                        kill_dict.setdefault(child.pid, child)
+                except psutil.Error:
+                    continue
+
+        for proc in kill_dict.values():
+            try:
+                proc.terminate()
+            except psutil.Error:
+                continue
+
+        # 等待进程退出，超时仍未退出的进程强制中止
+        _, alive = psutil.wait_procs(kill_dict.values(), timeout=self.KILL_TIMEOUT)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.Error:
+                continue
+
+        self.invalidate_snapshot()
+
+        logger.success(f"进程已中止: {paths}", module="系统服务")
+
     def kill_process(self, path: Path) -> None:
         """
         根据路径中止进程
@@ -316,17 +424,7 @@ class _SystemHandler:
         :param path: 进程路径
         """
 
-        logger.info(f"开始中止进程: {path}", module="系统服务")
-
-        for pid in self.search_pids(path):
-            killprocess = subprocess.Popen(
-                f"taskkill /F /T /PID {pid}",
-                shell=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            killprocess.wait()
-
-        logger.success(f"进程已中止: {path}", module="系统服务")
+        self.kill_processes([path])
 
     def search_pids(self, path: Path) -> list:
         """
@@ -338,15 +436,7 @@ class _SystemHandler:
 
         logger.info(f"开始查找进程 PID: {path}", module="系统服务")
 
-        pids = []
-        for proc in psutil.process_iter(["pid", "exe"]):
-            try:
-                if proc.info["exe"] and proc.info["exe"].lower() == str(path).lower():
-                    pids.append(proc.info["pid"])
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                # 进程可能在此期间已结束或无法访问，忽略这些异常
-                pass
-        return pids
+        return [proc.pid for proc in self.search_processes([path])[path]]
 
 
 System = _SystemHandler()
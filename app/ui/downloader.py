@@ -26,7 +26,6 @@ v4.4
 """
 
 import zipfile
-import requests
 import subprocess
 import time
 from functools import partial
@@ -45,7 +44,7 @@ from PySide6.QtCore import QThread, Signal, QTimer, QEventLoop
 
 from typing import List, Dict, Union
 
-from app.core import Config, logger
+from app.core import Network, logger
 from app.services import System
 
 
@@ -68,7 +67,7 @@ class DownloadProcess(QThread):
     """分段下载子线程"""
 
     progress = Signal(int)
-    accomplish = Signal(float)
+    accomplish = Signal(bool, float)
 
     def __init__(
         self,
@@ -77,6 +76,7 @@ class DownloadProcess(QThread):
         end_byte: int,
         download_path: Path,
         check_times: int = -1,
+        write_offset: int = -1,
     ) -> None:
         super(DownloadProcess, self).__init__()
 
@@ -89,12 +89,13 @@ class DownloadProcess(QThread):
         self.end_byte = end_byte
         self.download_path = download_path
         self.check_times = check_times
+        self.write_offset = write_offset
 
     @logger.catch
     def run(self) -> None:
 
-        # 清理可能存在的临时文件
-        if self.download_path.exists():
+        # 写入预分配文件的指定位置时，文件由下载管理器统一创建与清理
+        if self.write_offset == -1 and self.download_path.exists():
             self.download_path.unlink()
 
         logger.info(
@@ -114,15 +115,11 @@ class DownloadProcess(QThread):
 
                 start_time = time.time()
 
-                response = requests.get(
+                response = Network.get_session().get(
                     self.url,
                     headers=headers,
                     timeout=10,
                     stream=True,
-                    proxies={
-                        "http": Config.get(Config.update_ProxyAddress),
-                        "https": Config.get(Config.update_ProxyAddress),
-                    },
                 )
 
                 if response.status_code not in [200, 206]:
@@ -135,6 +132,7 @@ class DownloadProcess(QThread):
                         module="下载子线程",
                     )
 
+                    response.close()
                     time.sleep(1)
                     continue
 
@@ -143,8 +141,24 @@ class DownloadProcess(QThread):
                     module="下载子线程",
                 )
 
+                # 指定下载范围时以范围长度为准，否则以响应声明的未压缩长度为准
+                if headers is not None:
+                    expected_size = self.end_byte - self.start_byte + 1
+                elif (
+                    "content-length" in response.headers
+                    and "content-encoding" not in response.headers
+                ):
+                    expected_size = int(response.headers["content-length"])
+                else:
+                    expected_size = None
+
                 downloaded_size = 0
-                with self.download_path.open(mode="wb") as f:
+                with self.download_path.open(
+                    mode="wb" if self.write_offset == -1 else "r+b"
+                ) as f:
+
+                    if self.write_offset != -1:
+                        f.seek(self.write_offset)
 
                     for chunk in response.iter_content(chunk_size=8192):
 
@@ -156,16 +170,30 @@ class DownloadProcess(QThread):
 
                         self.progress.emit(downloaded_size)
 
+                # 释放连接回共享连接池
+                response.close()
+
                 if self.isInterruptionRequested():
 
-                    if self.download_path.exists():
+                    if self.write_offset == -1 and self.download_path.exists():
                         self.download_path.unlink()
-                    self.accomplish.emit(0)
+                    self.accomplish.emit(False, 0)
                     logger.info(f"下载中止：{self.url}", module="下载子线程")
 
+                elif expected_size is not None and downloaded_size != expected_size:
+
+                    # 连接中断等原因导致数据不完整，不视为下载完成
+                    if self.write_offset == -1 and self.download_path.exists():
+                        self.download_path.unlink()
+                    self.accomplish.emit(False, time.time() - start_time)
+                    logger.error(
+                        f"下载不完整：{self.url}，应下载大小：{expected_size} 字节，实际下载大小：{downloaded_size} 字节",
+                        module="下载子线程",
+                    )
+
                 else:
 
-                    self.accomplish.emit(time.time() - start_time)
+                    self.accomplish.emit(True, time.time() - start_time)
                     logger.success(
                         f"下载完成：{self.url}，实际下载大小：{downloaded_size} 字节，耗时：{time.time() - start_time:.2f} 秒",
                         module="下载子线程",
@@ -186,9 +214,9 @@ class DownloadProcess(QThread):
 
         else:
 
-            if self.download_path.exists():
+            if self.write_offset == -1 and self.download_path.exists():
                 self.download_path.unlink()
-            self.accomplish.emit(0)
+            self.accomplish.emit(False, 0)
             logger.error(f"下载失败：{self.url}", module="下载子线程")
 
 
@@ -225,8 +253,14 @@ class ZipExtractProcess(QThread):
                     self.download_path.unlink()
                     return None
                 try:
+                    # 逐个成员流式解压，内存占用与压缩包大小无关
                     with zipfile.ZipFile(self.download_path, "r") as zip_ref:
-                        zip_ref.extractall(self.app_path)
+                        for member in zip_ref.infolist():
+                            if self.isInterruptionRequested():
+                                break
+                            zip_ref.extract(member, self.app_path)
+                    if self.isInterruptionRequested():
+                        continue
                     self.accomplish.emit()
                     logger.success(
                         f"解压完成：{self.download_path} 到 {self.app_path}",
@@ -363,30 +397,22 @@ class DownloadManager(QDialog):
 
                 elif self.config["mode"] == "MirrorChyan":
 
-                    with requests.get(
+                    with Network.get_session().get(
                         self.config["url"],
                         allow_redirects=True,
                         timeout=10,
                         stream=True,
-                        proxies={
-                            "http": Config.get(Config.update_ProxyAddress),
-                            "https": Config.get(Config.update_ProxyAddress),
-                        },
                     ) as response:
                         if response.status_code == 200:
                             return response.url
 
             elif self.config["mode"] == "MirrorChyan":
 
-                with requests.get(
+                with Network.get_session().get(
                     self.config["url"],
                     allow_redirects=True,
                     timeout=10,
                     stream=True,
-                    proxies={
-                        "http": Config.get(Config.update_ProxyAddress),
-                        "https": Config.get(Config.update_ProxyAddress),
-                    },
                 ) as response:
                     if response.status_code == 200:
                         return response.url
@@ -443,11 +469,12 @@ class DownloadManager(QDialog):
         if name in self.download_process_dict:
             self.download_process_dict[name].requestInterruption()
 
-    def check_test_speed(self, name: str, t: float) -> None:
+    def check_test_speed(self, name: str, if_success: bool, t: float) -> None:
         """
         更新测速子任务wc信息，并检查测速任务是否允许结束
 
         :param name: 测速任务的名称
+        :param if_success: 测速任务是否完整下载了测速文件
         :param t: 测速任务的耗时
         """
 
@@ -455,7 +482,7 @@ class DownloadManager(QDialog):
         if self.isInterruptionRequested:
             self.update_info(f"已中止测速进程：{name}")
             self.test_speed_result[name] = 0
-        elif t != 0:
+        elif if_success and t != 0:
             self.update_info(f"{name}：{ 4 / t:.2f} MB/s")
             self.test_speed_result[name] = 4 / t
         else:
@@ -513,17 +540,11 @@ class DownloadManager(QDialog):
 
         url = self.get_download_url("下载")
         self.downloaded_size_list: List[List[int, bool]] = []
+        self.if_download_failed = False
 
         logger.info(f"开始下载任务，链接：{url}", module="下载管理器")
 
-        response = requests.head(
-            url,
-            timeout=10,
-            proxies={
-                "http": Config.get(Config.update_ProxyAddress),
-                "https": Config.get(Config.update_ProxyAddress),
-            },
-        )
+        response = Network.get_session().head(url, timeout=10)
 
         self.file_size = int(response.headers.get("content-length", 0))
         part_size = self.file_size // self.config["thread_numb"]
@@ -532,6 +553,10 @@ class DownloadManager(QDialog):
         self.last_time = time.time()
         self.speed = 0
 
+        # 预分配下载文件，各下载线程直接写入各自的字节范围
+        with self.download_path.open(mode="wb") as f:
+            f.truncate(self.file_size)
+
         # 拆分下载任务，启用多线程下载
         for i in range(self.config["thread_numb"]):
 
@@ -551,8 +576,9 @@ class DownloadManager(QDialog):
                 url,
                 -1 if self.config["mode"] == "MirrorChyan" else start_byte,
                 -1 if self.config["mode"] == "MirrorChyan" else end_byte,
-                self.download_path.with_suffix(f".part{i}"),
+                self.download_path,
                 1 if self.config["mode"] == "MirrorChyan" else -1,
+                start_byte,
             )
             self.downloaded_size_list.append([0, False])
             self.download_process_dict[f"part{i}"].progress.connect(
@@ -595,17 +621,24 @@ class DownloadManager(QDialog):
                 f"正在下载：{self.name} 已下载：{self.downloaded_size / 1048576:.2f}/{self.file_size / 1048576:.2f} MB （{self.downloaded_size / self.file_size * 100:.2f}%） 下载速度：{self.speed:.2f} KB/s",
             )
 
-    def check_download(self, index: str, t: float) -> None:
+    def check_download(self, index: str, if_success: bool, t: float) -> None:
         """
         更新下载子任务完成信息，检查下载任务是否完成，完成后自动执行后续处理任务
 
         :param index: 下载任务的索引
+        :param if_success: 下载任务是否完整下载了对应分段
         :param t: 下载任务的耗时
         """
 
         # 标记下载线程完成
         self.downloaded_size_list[index][1] = True
 
+        # 任一分段失败时下载文件中存在未写入的空洞，中止其余分段，不再解压
+        if not if_success and not self.if_download_failed:
+            self.if_download_failed = True
+            for process in self.download_process_dict.values():
+                process.requestInterruption()
+
         # 清理下载线程
         self.download_process_dict[f"part{index}"].requestInterruption()
         self.download_process_dict[f"part{index}"].quit()
@@ -615,27 +648,29 @@ class DownloadManager(QDialog):
         if not self.download_process_dict:
             self.download_process_clear.emit()
 
-        if (
-            any([not _[1] for _ in self.downloaded_size_list])
-            or self.isInterruptionRequested
-        ):
+        if self.isInterruptionRequested or self.if_download_failed:
+
+            if self.download_process_dict:
+                return None
+
+            # 所有下载线程退出后清理预分配的下载文件
+            if self.download_path.exists():
+                self.download_path.unlink()
+
+            if not self.isInterruptionRequested:
+                logger.error(
+                    f"分段下载失败：{self.name}，已删除不完整的下载文件",
+                    module="下载管理器",
+                )
+                self.update_info(f"{self.name}下载失败，请检查网络后重试")
+                self.update_progress(0, 100, 0)
             return None
 
-        # 合并下载的分段文件
-        logger.info(
-            f"所有分段下载完成：{self.name}，开始合并分段文件到 {self.download_path}",
-            module="下载管理器",
-        )
-        with self.download_path.open(mode="wb") as outfile:
-            for i in range(self.config["thread_numb"]):
-                with self.download_path.with_suffix(f".part{i}").open(
-                    mode="rb"
-                ) as infile:
-                    outfile.write(infile.read())
-                self.download_path.with_suffix(f".part{i}").unlink()
+        if any([not _[1] for _ in self.downloaded_size_list]):
+            return None
 
         logger.success(
-            f"合并完成：{self.name}，下载文件大小：{self.download_path.stat().st_size} 字节",
+            f"所有分段下载完成：{self.name}，下载文件大小：{self.download_path.stat().st_size} 字节",
             module="下载管理器",
         )
 
@@ -47,7 +47,7 @@ import subprocess
 from datetime import datetime, timedelta
 from functools import partial
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 
 from app.core import Config, SoundPlayer, logger
@@ -112,9 +112,11 @@ class History(QWidget):
         )
 
         # 生成历史记录卡片并添加到布局中
-        for date, user_dict in history_dict.items():
+        for date, info in history_dict.items():
 
-            self.history_card_list.append(self.HistoryCard(date, user_dict, self))
+            self.history_card_list.append(
+                self.HistoryCard(date, info["User"], info["Range"], self)
+            )
             self.content_layout.addWidget(self.history_card_list[-1])
 
         self.content_layout.addStretch(1)
@@ -145,6 +147,7 @@ class History(QWidget):
             self.select_month = PushButton(FluentIcon.TAG, "最近一月")
             self.select_week = PushButton(FluentIcon.TAG, "最近一周")
             self.search = PushButton(FluentIcon.SEARCH, "查询")
+            self.rebuild = PushButton(FluentIcon.SYNC, "重建索引")
             self.select_month.clicked.connect(lambda: self.select_date("month"))
             self.select_week.clicked.connect(lambda: self.select_date("week"))
             self.search.clicked.connect(
@@ -154,6 +157,7 @@ class History(QWidget):
                     self.end_date.getDate(),
                 )
             )
+            self.rebuild.clicked.connect(self.rebuild_index)
 
             Layout.addWidget(self.lable_1)
             Layout.addWidget(self.start_date)
@@ -164,6 +168,13 @@ class History(QWidget):
             Layout.addWidget(self.select_month)
             Layout.addWidget(self.select_week)
             Layout.addWidget(self.search)
+            Layout.addWidget(self.rebuild)
+
+        def rebuild_index(self) -> None:
+            """从历史记录目录重建索引并重新查询"""
+
+            Config.rebuild_history_index()
+            self.search.clicked.emit()
 
         def select_date(self, date: str) -> None:
             """
@@ -192,7 +203,13 @@ class History(QWidget):
     class HistoryCard(QuickExpandGroupCard):
         """历史记录卡片"""
 
-        def __init__(self, date: str, user_dict: Dict[str, List[Path]], parent=None):
+        def __init__(
+            self,
+            date: str,
+            user_dict: Dict[str, List[Path]],
+            date_range: Tuple[datetime, datetime],
+            parent=None,
+        ):
             super().__init__(
                 FluentIcon.HISTORY, date, f"{date}的历史运行记录与统计信息", parent
             )
@@ -208,18 +225,26 @@ class History(QWidget):
             # 生成用户历史记录卡片并添加到布局中
             for user, info in user_dict.items():
                 self.user_history_card_list.append(
-                    self.UserHistoryCard(user, info, self)
+                    self.UserHistoryCard(user, info, date_range, self)
                 )
                 Layout.addWidget(self.user_history_card_list[-1])
 
         class UserHistoryCard(HeaderCardWidget):
             """用户历史记录卡片"""
 
-            def __init__(self, name: str, user_history: List[Path], parent=None):
+            def __init__(
+                self,
+                name: str,
+                user_history: List[Path],
+                date_range: Tuple[datetime, datetime],
+                parent=None,
+            ):
                 super().__init__(parent)
                 self.setTitle(name)
 
+                self.user = name
                 self.user_history = user_history
+                self.date_range = date_range
 
                 self.index_card = self.IndexCard(self.user_history, self)
                 self.index_card.index_changed.connect(self.update_info)
@@ -245,9 +270,12 @@ class History(QWidget):
                 :return: 结构化统计数据
                 """
 
-                history_info = Config.merge_statistic_info(
-                    self.user_history if mode == "数据总览" else [Path(mode)]
-                )
+                if mode == "数据总览":
+                    history_info = Config.merge_statistic_info(
+                        self.user_history, rollup=(self.user, *self.date_range)
+                    )
+                else:
+                    history_info = Config.merge_statistic_info([Path(mode)])
 
                 statistics_info = {}
 
@@ -339,7 +367,9 @@ class History(QWidget):
                     self.index_cards: List[StatefulItemCard] = []
 
                     # 生成索引卡片信息
-                    index_list = Config.merge_statistic_info(history_list)["index"]
+                    index_list = Config.merge_statistic_info(history_list).get(
+                        "index", []
+                    )
                     index_list.insert(0, ["数据总览", "运行", "数据总览"])
 
                     # 生成索引卡片组件并绑定点击事件
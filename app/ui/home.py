@@ -46,9 +46,10 @@ import re
 import shutil
 import json
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
-from app.core import Config, MainInfoBar, Network, logger
+from app.core import Config, MainInfoBar, Network, NetworkTask, logger
 from .Widget import Banner, IconButton
 
 
@@ -201,92 +202,115 @@ class Home(QWidget):
                 )
         elif Config.get(Config.function_HomeImageMode) == "主题图像":
 
-            # 从远程服务器获取最新主题图像信息
-            network = Network.add_task(
-                mode="get",
-                url="http://221.236.27.82:10197/d/AUTO_MAA/Server/theme_image.json",
+            # 主题图像的获取与下载均在网络线程池中执行，完成后再刷新主页图像
+            self.request_theme_image().add_done_callback(self.apply_theme_image)
+            return None
+
+        self.set_banner()
+
+    def request_theme_image(self) -> NetworkTask:
+        """
+        发起最新主题图像信息请求，请求在网络线程池中执行，不等待结果
+
+        :return: 网络请求任务
+        """
+
+        # 从远程服务器获取最新主题图像信息
+        return Network.add_task(
+            mode="get",
+            url="http://221.236.27.82:10197/d/AUTO_MAA/Server/theme_image.json",
+        )
+
+    def apply_theme_image(self, network: NetworkTask) -> None:
+        """
+        根据最新主题图像信息请求结果下载主题图像
+
+        :param network: 已完成的最新主题图像信息请求任务
+        """
+
+        network_result = Network.get_result(network)
+        if network_result["status_code"] == 200:
+            theme_image = network_result["response_json"]
+        else:
+            logger.warning(
+                f"获取最新主题图像时出错：{network_result['error_message']}",
+                module="主页",
             )
-            network.loop.exec()
-            network_result = Network.get_result(network)
-            if network_result["status_code"] == 200:
-                theme_image = network_result["response_json"]
-            else:
-                logger.warning(
-                    f"获取最新主题图像时出错：{network_result['error_message']}",
-                    module="主页",
-                )
-                MainInfoBar.push_info_bar(
-                    "warning",
-                    "获取最新主题图像时出错",
-                    f"网络错误：{network_result['status_code']}",
-                    5000,
-                )
-                return None
+            MainInfoBar.push_info_bar(
+                "warning",
+                "获取最新主题图像时出错",
+                f"网络错误：{network_result['status_code']}",
+                5000,
+            )
+            return None
+
+        if (Config.app_path / "resources/theme_image.json").exists():
+            with (Config.app_path / "resources/theme_image.json").open(
+                mode="r", encoding="utf-8"
+            ) as f:
+                theme_image_local = json.load(f)
+            time_local = datetime.strptime(theme_image_local["time"], "%Y-%m-%d %H:%M")
+        else:
+            time_local = datetime.strptime("2000-01-01 00:00", "%Y-%m-%d %H:%M")
+
+        # 检查主题图像是否需要更新
+        if not (Config.app_path / "resources/images/Home/BannerTheme.jpg").exists() or (
+            datetime.now()
+            > datetime.strptime(theme_image["time"], "%Y-%m-%d %H:%M")
+            > time_local
+        ):
+
+            Network.add_task(
+                mode="get_file",
+                url=theme_image["url"],
+                path=Config.app_path / "resources/images/Home/BannerTheme.jpg",
+            ).add_done_callback(partial(self.save_theme_image, theme_image))
+
+        else:
+
+            logger.info("主题图像已是最新", module="主页")
+            MainInfoBar.push_info_bar(
+                "info", "主题图像已是最新", "主题图像已是最新！", 3000
+            )
+            self.set_banner()
 
-            if (Config.app_path / "resources/theme_image.json").exists():
-                with (Config.app_path / "resources/theme_image.json").open(
-                    mode="r", encoding="utf-8"
-                ) as f:
-                    theme_image_local = json.load(f)
-                time_local = datetime.strptime(
-                    theme_image_local["time"], "%Y-%m-%d %H:%M"
-                )
-            else:
-                time_local = datetime.strptime("2000-01-01 00:00", "%Y-%m-%d %H:%M")
-
-            # 检查主题图像是否需要更新
-            if not (
-                Config.app_path / "resources/images/Home/BannerTheme.jpg"
-            ).exists() or (
-                datetime.now()
-                > datetime.strptime(theme_image["time"], "%Y-%m-%d %H:%M")
-                > time_local
-            ):
-
-                network = Network.add_task(
-                    mode="get_file",
-                    url=theme_image["url"],
-                    path=Config.app_path / "resources/images/Home/BannerTheme.jpg",
-                )
-                network.loop.exec()
-                network_result = Network.get_result(network)
-
-                if network_result["status_code"] == 200:
-
-                    with (Config.app_path / "resources/theme_image.json").open(
-                        mode="w", encoding="utf-8"
-                    ) as f:
-                        json.dump(theme_image, f, ensure_ascii=False, indent=4)
-
-                    logger.success(
-                        f"主题图像「{theme_image["name"]}」下载成功", module="主页"
-                    )
-                    MainInfoBar.push_info_bar(
-                        "success",
-                        "主题图像下载成功",
-                        f"「{theme_image["name"]}」下载成功！",
-                        3000,
-                    )
-
-                else:
-
-                    logger.warning(
-                        f"下载最新主题图像时出错：{network_result['error_message']}",
-                        module="主页",
-                    )
-                    MainInfoBar.push_info_bar(
-                        "warning",
-                        "下载最新主题图像时出错",
-                        f"网络错误：{network_result['status_code']}",
-                        5000,
-                    )
+    def save_theme_image(self, theme_image: dict, network: NetworkTask) -> None:
+        """
+        主题图像下载完成后保存主题图像信息并刷新主页图像
 
-            else:
+        :param theme_image: 最新主题图像信息
+        :param network: 已完成的主题图像下载任务
+        """
 
-                logger.info("主题图像已是最新", module="主页")
-                MainInfoBar.push_info_bar(
-                    "info", "主题图像已是最新", "主题图像已是最新！", 3000
-                )
+        network_result = Network.get_result(network)
+
+        if network_result["status_code"] == 200:
+
+            with (Config.app_path / "resources/theme_image.json").open(
+                mode="w", encoding="utf-8"
+            ) as f:
+                json.dump(theme_image, f, ensure_ascii=False, indent=4)
+
+            logger.success(f"主题图像「{theme_image["name"]}」下载成功", module="主页")
+            MainInfoBar.push_info_bar(
+                "success",
+                "主题图像下载成功",
+                f"「{theme_image["name"]}」下载成功！",
+                3000,
+            )
+
+        else:
+
+            logger.warning(
+                f"下载最新主题图像时出错：{network_result['error_message']}",
+                module="主页",
+            )
+            MainInfoBar.push_info_bar(
+                "warning",
+                "下载最新主题图像时出错",
+                f"网络错误：{network_result['status_code']}",
+                5000,
+            )
 
         self.set_banner()
 
@@ -41,8 +41,20 @@ from qfluentwidgets import (
 from PySide6.QtGui import QIcon, QCloseEvent
 from PySide6.QtCore import QTimer
 import darkdetect
-
-from app.core import Config, logger, TaskManager, MainTimer, MainInfoBar, SoundPlayer
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.core import (
+    Config,
+    ConfigWriter,
+    logger,
+    TaskManager,
+    MainTimer,
+    MainInfoBar,
+    NetworkTask,
+    SoundPlayer,
+)
 from app.services import Notify, Crypto, System
 from .home import Home
 from .script_manager import ScriptManager
@@ -356,8 +368,12 @@ class AUTO_MAA(MSFluentWindow):
 
         logger.info("开始执行启动时任务", module="主窗口")
 
-        # 清理旧历史记录
-        Config.clean_old_history()
+        # 清理旧历史记录，仅涉及本地文件，交由后台线程执行
+        threading.Thread(
+            target=self.start_up_step,
+            args=("清理旧历史记录", Config.clean_old_history),
+            daemon=True,
+        ).start()
 
         # 清理安装包
         if (Config.app_path / "AUTO_MAA-Setup.exe").exists():
@@ -376,24 +392,33 @@ class AUTO_MAA(MSFluentWindow):
                 pass
 
         # 检查密码
-        self.setting.check_PASSWORD()
-
-        # 获取关卡号信息
-        Config.get_stage()
-
-        # 获取主题图像
-        if Config.get(Config.function_HomeImageMode) == "主题图像":
-            self.home.get_home_image()
+        self.start_up_step("检查密码", self.setting.check_PASSWORD)
 
-        # 启动定时器
+        # 启动定时器，不等待网络资源
         MainTimer.start()
 
-        # 获取公告
-        self.setting.show_notice(if_first=True)
+        # 网络相关任务立即发出请求，由网络线程池并发执行，请求完成后再于主线程处理结果
+        self.start_up_request(
+            "获取关卡号信息", Config.request_stage(), Config.apply_stage
+        )
+        if Config.get(Config.function_HomeImageMode) == "主题图像":
+            self.start_up_request(
+                "获取主题图像",
+                self.home.request_theme_image(),
+                self.home.apply_theme_image,
+            )
 
-        # 检查更新
-        if Config.get(Config.update_IfAutoUpdate):
-            self.setting.check_update(if_first=True)
+        # 公告与更新均可能弹窗，请求同时发出，更新结果待公告处理完成后再处理
+        self.start_up_request(
+            "获取公告",
+            self.setting.request_notice(),
+            self.start_up_notice,
+            (
+                self.setting.request_update()
+                if Config.get(Config.update_IfAutoUpdate)
+                else None
+            ),
+        )
 
         # 直接最小化
         if Config.get(Config.start_IfMinimizeDirectly):
@@ -441,6 +466,65 @@ class AUTO_MAA(MSFluentWindow):
 
         logger.success("启动时任务执行完成", module="主窗口")
 
+    def start_up_step(self, name: str, func: Callable, *args, **kwargs) -> None:
+        """
+        执行单个启动时任务并记录耗时
+
+        :param name: 任务名称
+        :param func: 任务函数
+        """
+
+        start_time = datetime.now()
+
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.exception(f"启动时任务 {name} 执行失败：{e}", module="主窗口")
+
+        logger.info(
+            f"启动时任务 {name} 耗时 {(datetime.now() - start_time).total_seconds():.2f} 秒",
+            module="主窗口",
+        )
+
+    def start_up_request(
+        self,
+        name: str,
+        network: Optional[NetworkTask],
+        func: Callable,
+        *args,
+        **kwargs,
+    ) -> None:
+        """
+        在启动时网络请求完成后于主线程处理请求结果，不进入嵌套事件循环等待
+
+        :param name: 任务名称
+        :param network: 已发出的网络请求任务，为 None 时无需处理
+        :param func: 以请求任务为首个参数的结果处理函数
+        """
+
+        if network is None:
+            return None
+
+        network.add_done_callback(
+            lambda network: self.start_up_step(name, func, network, *args, **kwargs)
+        )
+
+    def start_up_notice(
+        self, network: NetworkTask, update: Optional[NetworkTask]
+    ) -> None:
+        """
+        启动时显示公告，公告处理完成后再处理检查更新的结果
+
+        :param network: 已完成的最新公告请求任务
+        :param update: 已发出的最新版本信息请求任务，未启用自动更新时为 None
+        """
+
+        self.setting.apply_notice(network, if_first=True)
+
+        self.start_up_request(
+            "检查更新", update, self.setting.apply_update, if_first=True
+        )
+
     def start_up_queue(self) -> None:
         """启动时运行的调度队列"""
 
@@ -478,6 +562,12 @@ class AUTO_MAA(MSFluentWindow):
         MainTimer.stop()
         TaskManager.stop_task("ALL")
 
+        # 写入所有待写入的配置
+        ConfigWriter.flush()
+
+        # 发送剩余的通知
+        Notify.shutdown()
+
         # 关闭主题监听
         self.themeListener.terminate()
         self.themeListener.deleteLater()
@@ -42,7 +42,14 @@ from qfluentwidgets import (
 from typing import List, Dict, Union
 import shutil
 
-from app.core import Config, MainInfoBar, MaaPlanConfig, SoundPlayer, logger
+from app.core import (
+    Config,
+    ConfigWriter,
+    MainInfoBar,
+    MaaPlanConfig,
+    SoundPlayer,
+    logger,
+)
 from .Widget import (
     ComboBoxMessageBox,
     LineEditSettingCard,
@@ -335,6 +342,9 @@ class PlanManager(QWidget):
         def clear_SettingBox(self) -> None:
             """清空所有子界面"""
 
+            # 配置文件即将被移动或删除，先写入待写入的配置
+            ConfigWriter.flush()
+
             for sub_interface in self.script_list:
                 Config.stage_refreshed.disconnect(sub_interface.refresh_stage)
                 self.stackedWidget.removeWidget(sub_interface)
@@ -41,7 +41,14 @@ from qfluentwidgets import (
 )
 from typing import List, Dict
 
-from app.core import QueueConfig, Config, MainInfoBar, SoundPlayer, logger
+from app.core import (
+    QueueConfig,
+    Config,
+    ConfigWriter,
+    MainInfoBar,
+    SoundPlayer,
+    logger,
+)
 from .Widget import (
     SwitchSettingCard,
     ComboBoxSettingCard,
@@ -99,11 +106,13 @@ class QueueManager(QWidget):
             Config.app_path / f"config/QueueConfig/调度队列_{index}.json", queue_config
         )
         queue_config.save()
+        Config.watch_queue(queue_config)
 
         Config.queue_dict[f"调度队列_{index}"] = {
             "Path": Config.app_path / f"config/QueueConfig/调度队列_{index}.json",
             "Config": queue_config,
         }
+        Config.queue_changed.emit()
 
         # 添加到配置界面
         self.queue_manager.add_SettingBox(index)
@@ -333,6 +342,9 @@ class QueueManager(QWidget):
         def clear_SettingBox(self) -> None:
             """清空所有子界面"""
 
+            # 配置文件即将被移动或删除，先写入待写入的配置
+            ConfigWriter.flush()
+
             for sub_interface in self.script_list:
                 self.stackedWidget.removeWidget(sub_interface)
                 sub_interface.deleteLater()
@@ -60,6 +60,7 @@ import json
 
 from app.core import (
     Config,
+    ConfigWriter,
     logger,
     MainInfoBar,
     TaskManager,
@@ -540,11 +541,13 @@ class ScriptManager(QWidget):
                 self.key.setChecked(True)
             else:
                 Config.PASSWORD = ""
+                Crypto.lock()
                 Config.PASSWORD_refreshed.emit()
                 self.key.setIcon(FluentIcon.HIDE)
                 self.key.setChecked(False)
         else:
             Config.PASSWORD = ""
+            Crypto.lock()
             Config.PASSWORD_refreshed.emit()
             self.key.setIcon(FluentIcon.HIDE)
             self.key.setChecked(False)
@@ -697,6 +700,9 @@ class ScriptManager(QWidget):
         def clear_SettingBox(self) -> None:
             """清空所有子界面"""
 
+            # 配置文件即将被移动或删除，先写入待写入的配置
+            ConfigWriter.flush()
+
             for sub_interface in self.script_list:
                 self.stackedWidget.removeWidget(sub_interface)
                 sub_interface.deleteLater()
@@ -1285,6 +1291,9 @@ class ScriptManager(QWidget):
                     def clear_SettingBox(self) -> None:
                         """清空除用户仪表盘外所有子界面"""
 
+                        # 配置文件即将被移动或删除，先写入待写入的配置
+                        ConfigWriter.flush()
+
                         for sub_interface in self.script_list:
                             Config.stage_refreshed.disconnect(
                                 sub_interface.refresh_stage
@@ -1377,7 +1386,22 @@ class ScriptManager(QWidget):
 
                             self.dashboard.setRowCount(len(self.user_data))
 
-                            for name, info in self.user_data.items():
+                            # 批量解密密码，整个仪表盘仅需解锁一次私钥
+                            password_list = (
+                                Crypto.AUTO_batch_decryptor(
+                                    [
+                                        info["Config"].get(info["Config"].Info_Password)
+                                        for info in self.user_data.values()
+                                    ],
+                                    Config.PASSWORD,
+                                )
+                                if Config.PASSWORD
+                                else ["******" for _ in self.user_data]
+                            )
+
+                            for (name, info), password in zip(
+                                self.user_data.items(), password_list
+                            ):
 
                                 config = info["Config"]
 
@@ -1423,14 +1447,7 @@ class ScriptManager(QWidget):
                                 self.dashboard.setItem(
                                     int(name[3:]) - 1,
                                     2,
-                                    QTableWidgetItem(
-                                        Crypto.AUTO_decryptor(
-                                            config.get(config.Info_Password),
-                                            Config.PASSWORD,
-                                        )
-                                        if Config.PASSWORD
-                                        else "******"
-                                    ),
+                                    QTableWidgetItem(password),
                                 )
                                 self.dashboard.setCellWidget(
                                     int(name[3:]) - 1,
@@ -3409,6 +3426,9 @@ class ScriptManager(QWidget):
                     def clear_SettingBox(self) -> None:
                         """清空所有子界面"""
 
+                        # 配置文件即将被移动或删除，先写入待写入的配置
+                        ConfigWriter.flush()
+
                         for sub_interface in self.script_list:
                             self.stackedWidget.removeWidget(sub_interface)
                             sub_interface.deleteLater()
@@ -48,7 +48,7 @@ from packaging import version
 from pathlib import Path
 from typing import Dict, Union
 
-from app.core import Config, MainInfoBar, Network, SoundPlayer, logger
+from app.core import Config, MainInfoBar, Network, NetworkTask, SoundPlayer, logger
 from app.services import Crypto, System, Notify
 from .downloader import DownloadManager
 from .Widget import (
@@ -324,14 +324,38 @@ class Setting(QWidget):
         :param if_first: 是否为启动时检查更新
         """
 
+        network = self.request_update()
+        network.loop.exec()
+        self.apply_update(network, if_show, if_first)
+
+    def request_update(self) -> NetworkTask:
+        """
+        发起最新版本信息请求，请求在网络线程池中执行，不等待结果
+
+        :return: 网络请求任务
+        """
+
         current_version = list(map(int, Config.VERSION.split(".")))
 
         # 从远程服务器获取最新版本信息
-        network = Network.add_task(
+        return Network.add_task(
             mode="get",
             url=f"https://mirrorchyan.com/api/resources/AUTO_MAA/latest?user_agent=AutoMaaGui&current_version={version_text(current_version)}&cdk={Crypto.win_decryptor(Config.get(Config.update_MirrorChyanCDK))}&channel={Config.get(Config.update_UpdateType)}",
         )
-        network.loop.exec()
+
+    def apply_update(
+        self, network: NetworkTask, if_show: bool = False, if_first: bool = False
+    ) -> None:
+        """
+        根据最新版本信息请求结果提示更新，调起更新线程
+
+        :param network: 已完成的最新版本信息请求任务
+        :param if_show: 是否显示更新信息
+        :param if_first: 是否为启动时检查更新
+        """
+
+        current_version = list(map(int, Config.VERSION.split(".")))
+
         network_result = Network.get_result(network)
         if network_result["status_code"] == 200:
             version_info: Dict[str, Union[int, str, Dict[str, str]]] = network_result[
@@ -562,12 +586,34 @@ class Setting(QWidget):
     def show_notice(self, if_show: bool = False, if_first: bool = False) -> None:
         """显示公告"""
 
+        network = self.request_notice()
+        network.loop.exec()
+        self.apply_notice(network, if_show, if_first)
+
+    def request_notice(self) -> NetworkTask:
+        """
+        发起最新公告请求，请求在网络线程池中执行，不等待结果
+
+        :return: 网络请求任务
+        """
+
         # 从远程服务器获取最新公告
-        network = Network.add_task(
+        return Network.add_task(
             mode="get",
             url="http://221.236.27.82:10197/d/AUTO_MAA/Server/notice.json",
         )
-        network.loop.exec()
+
+    def apply_notice(
+        self, network: NetworkTask, if_show: bool = False, if_first: bool = False
+    ) -> None:
+        """
+        根据最新公告请求结果显示公告
+
+        :param network: 已完成的最新公告请求任务
+        :param if_show: 是否显示公告
+        :param if_first: 是否为启动时获取公告
+        """
+
         network_result = Network.get_result(network)
         if network_result["status_code"] == 200:
             notice = network_result["response_json"]
@@ -0,0 +1,122 @@
+#   AUTO_MAA:A MAA Multi Account Management and Automation Tool
+#   Copyright © 2024-2025 DLmaster361
+
+#   This file is part of AUTO_MAA.
+
+#   AUTO_MAA is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published
+#   by the Free Software Foundation, either version 3 of the License,
+#   or (at your option) any later version.
+
+#   AUTO_MAA is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with AUTO_MAA. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+"""
+AUTO_MAA
+AUTO_MAA日志增量读取组件
+v4.4
+作者：DLmaster_361
+"""
+
+import os
+from pathlib import Path
+from datetime import datetime
+from typing import List, Optional
+
+
+class LogReader:
+    """日志增量读取器，记录读取位置，每次仅读取并解析日志文件新增的内容"""
+
+    def __init__(self, path: Path, time_format: str = "%Y-%m-%d %H:%M:%S"):
+
+        self.path = path
+        self.time_format = time_format
+
+        self.offset = 0
+        self.inode = None
+        self.buffer = b""
+        self.start_time = datetime.now()
+        self.if_log_start = False
+
+    def reset(self, start_time: datetime, if_skip_exist: bool = True) -> None:
+        """
+        重置读取状态，开始新一轮日志读取
+
+        :param start_time: 日志起始时间，早于该时间的日志将被忽略
+        :param if_skip_exist: 是否跳过日志文件中已存在的内容
+        """
+
+        self.start_time = start_time
+        self.if_log_start = False
+        self.buffer = b""
+        self.offset = 0
+        self.inode = None
+
+        # 已存在的内容均早于起始时间，直接从文件末尾开始读取
+        if if_skip_exist:
+            stat = self.stat()
+            if stat is not None:
+                self.offset = stat.st_size
+                self.inode = stat.st_ino
+
+    def stat(self) -> Optional[os.stat_result]:
+        """获取日志文件状态，文件不存在时返回 None"""
+
+        try:
+            return self.path.stat()
+        except OSError:
+            return None
+
+    def read(self) -> List[str]:
+        """
+        读取日志文件自上次读取以来新增的完整行
+
+        :return: 新增的日志行列表，仅包含起始时间之后的日志
+        """
+
+        stat = self.stat()
+        if stat is None:
+            return []
+
+        # 日志文件被轮转或截断时从头开始读取
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.offset = 0
+            self.buffer = b""
+            self.inode = stat.st_ino
+
+        if stat.st_size == self.offset:
+            return []
+
+        with self.path.open(mode="rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+
+        # 保留末尾未写完的行，待下次读取时拼接
+        data = self.buffer + data
+        end = data.rfind(b"\n") + 1
+        self.buffer = data[end:]
+
+        text = data[:end].decode("utf-8", errors="replace").replace("\r\n", "\n")
+        lines = [f"{_}\n" for _ in text.split("\n")[:-1]]
+
+        if self.if_log_start:
+            return lines
+
+        for i, entry in enumerate(lines):
+            try:
+                entry_time = datetime.strptime(entry[1:20], self.time_format)
+            except ValueError:
+                continue
+            if entry_time > self.start_time:
+                self.if_log_start = True
+                return lines[i:]
+
+        return []
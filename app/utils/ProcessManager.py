@@ -25,13 +25,18 @@ v4.4
 作者：DLmaster_361
 """
 
-
+import sys
 import psutil
+import threading
 import subprocess
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Set
+
+from PySide6.QtCore import QObject, Signal
 
-from PySide6.QtCore import QTimer, QObject, Signal
+# 隐藏控制台窗口的创建标志仅在 Windows 上可用
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
 
 
 class ProcessManager(QObject):
@@ -39,14 +44,31 @@ class ProcessManager(QObject):
 
     processClosed = Signal()
 
+    # 子进程采样间隔（秒），在追踪时限内按指数退避增长
+    min_sample_interval = 0.1
+    max_sample_interval = 2.0
+    # 追踪时限结束后等待进程退出的超时时间（秒），用于响应停止请求
+    wait_timeout = 1.0
+
     def __init__(self):
         super().__init__()
 
         self.main_pid = None
-        self.tracked_pids = set()
+        self.tracking_time = 0
+        self.start_time = datetime.now()
+        self.tracked_dict: Dict[int, psutil.Process] = {}
+
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.stop_event = threading.Event()
+        self.waiter = None
 
-        self.check_timer = QTimer()
-        self.check_timer.timeout.connect(self.check_processes)
+    @property
+    def tracked_pids(self) -> Set[int]:
+        """当前跟踪的进程PID集合"""
+
+        with self.lock:
+            return set(self.tracked_dict.keys())
 
     def open_process(self, path: Path, args: list = [], tracking_time: int = 60) -> int:
         """
@@ -61,7 +83,7 @@ class ProcessManager(QObject):
         process = subprocess.Popen(
             [path, *args],
             cwd=path.parent,
-            creationflags=subprocess.CREATE_NO_WINDOW,
+            creationflags=CREATE_NO_WINDOW,
             stdin=subprocess.DEVNULL,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
@@ -69,6 +91,8 @@ class ProcessManager(QObject):
 
         self.start_monitoring(process.pid, tracking_time)
 
+        return process.pid
+
     def start_monitoring(self, pid: int, tracking_time: int = 60) -> None:
         """
         启动进程监视器，跟踪指定的主进程及其子进程
@@ -81,73 +105,118 @@ class ProcessManager(QObject):
 
         self.main_pid = pid
         self.tracking_time = tracking_time
+        self.start_time = datetime.now()
 
         # 扫描并记录所有相关进程
         try:
             # 获取主进程
             main_proc = psutil.Process(self.main_pid)
-            self.tracked_pids.add(self.main_pid)
+            with self.lock:
+                self.tracked_dict[self.main_pid] = main_proc
 
             # 递归获取所有子进程
             if tracking_time:
-                for child in main_proc.children(recursive=True):
-                    self.tracked_pids.add(child.pid)
+                self.sample_children()
 
         except psutil.NoSuchProcess:
             pass
 
-        # 启动持续追踪机制
-        self.start_time = datetime.now()
-        self.check_timer.start(100)
-
-    def check_processes(self) -> None:
-        """检查跟踪的进程是否仍在运行，并更新子进程列表"""
-
-        # 仅在时限内持续更新跟踪的进程列表，发现新的子进程
-        if (datetime.now() - self.start_time).total_seconds() < self.tracking_time:
-
-            current_pids = set(self.tracked_pids)
-            for pid in current_pids:
-                try:
-                    proc = psutil.Process(pid)
-                    for child in proc.children():
-                        if child.pid not in self.tracked_pids:
-                            # 新发现的子进程
-                            self.tracked_pids.add(child.pid)
-                except psutil.NoSuchProcess:
-                    continue
-
-        if not self.is_running():
-            self.clear()
-            self.processClosed.emit()
+        # 启动等待线程，阻塞等待进程退出
+        self.stop_event = threading.Event()
+        self.waiter = threading.Thread(
+            target=self.wait_processes,
+            args=(self.generation, self.stop_event),
+            daemon=True,
+        )
+        self.waiter.start()
 
-    def is_running(self) -> bool:
-        """检查所有跟踪的进程是否还在运行"""
+    def sample_children(self) -> None:
+        """扫描跟踪进程的子进程，复用已有的进程句柄"""
+
+        with self.lock:
+            proc_list = list(self.tracked_dict.values())
 
-        for pid in self.tracked_pids:
+        for proc in proc_list:
             try:
-                proc = psutil.Process(pid)
-                if proc.is_running():
-                    return True
-            except psutil.NoSuchProcess:
+                for child in proc.children(recursive=True):
+                    with self.lock:
+                        # 新发现的子进程
+                        self.tracked_dict.setdefault(child.pid, child)
+            except psutil.Error:
                 continue
 
-        return False
+    def wait_processes(self, generation: int, stop_event: threading.Event) -> None:
+        """
+        等待线程主体，阻塞等待跟踪的进程退出，并在时限内按退避间隔发现新的子进程
+
+        :param generation: 本次监视的代号，用于丢弃过期的监视结果
+        :param stop_event: 停止监视事件
+        """
+
+        interval = self.min_sample_interval
+
+        while not stop_event.is_set():
+
+            with self.lock:
+                proc_list = list(self.tracked_dict.values())
+
+            if not proc_list:
+                break
+
+            if_tracking = (
+                datetime.now() - self.start_time
+            ).total_seconds() < self.tracking_time
+
+            gone, _ = psutil.wait_procs(
+                proc_list, timeout=interval if if_tracking else self.wait_timeout
+            )
+
+            with self.lock:
+                if generation != self.generation:
+                    return
+                for proc in gone:
+                    self.tracked_dict.pop(proc.pid, None)
+
+            # 仅在时限内持续更新跟踪的进程列表，发现新的子进程
+            if if_tracking:
+                self.sample_children()
+                interval = min(interval * 2, self.max_sample_interval)
+
+        with self.lock:
+            if generation != self.generation or stop_event.is_set():
+                return
+            self.generation += 1
+            self.main_pid = None
+            self.tracked_dict.clear()
+
+        self.processClosed.emit()
+
+    def is_running(self) -> bool:
+        """检查所有跟踪的进程是否还在运行"""
+
+        with self.lock:
+            proc_list = list(self.tracked_dict.values())
+
+        return any(proc.is_running() for proc in proc_list)
 
     def kill(self, if_force: bool = False) -> None:
         """停止监视器并中止所有跟踪的进程"""
 
-        self.check_timer.stop()
+        self.stop_event.set()
+
+        with self.lock:
+            proc_list = list(self.tracked_dict.values())
 
-        for pid in self.tracked_pids:
+        for proc in proc_list:
             try:
-                proc = psutil.Process(pid)
-                if if_force:
+                if if_force and sys.platform == "win32":
                     kill_process = subprocess.Popen(
-                        ["taskkill", "/F", "/T", "/PID", str(pid)],
-                        creationflags=subprocess.CREATE_NO_WINDOW,
+                        ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                        creationflags=CREATE_NO_WINDOW,
                     )
                     kill_process.wait()
+                elif if_force:
+                    proc.kill()
                 proc.terminate()
             except psutil.NoSuchProcess:
                 continue
@@ -159,6 +228,9 @@ class ProcessManager(QObject):
     def clear(self) -> None:
         """清空跟踪的进程列表"""
 
-        self.main_pid = None
-        self.check_timer.stop()
-        self.tracked_pids.clear()
+        self.stop_event.set()
+
+        with self.lock:
+            self.generation += 1
+            self.main_pid = None
+            self.tracked_dict.clear()
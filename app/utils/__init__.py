@@ -30,6 +30,7 @@ __author__ = "DLmaster361 <DLmaster_361@163.com>"
 __license__ = "GPL-3.0 license"
 
 from .ImageUtils import ImageUtils
+from .LogReader import LogReader
 from .ProcessManager import ProcessManager
 
-__all__ = ["ImageUtils", "ProcessManager"]
+__all__ = ["ImageUtils", "LogReader", "ProcessManager"]
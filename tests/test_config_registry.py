@@ -0,0 +1,138 @@
+#   AUTO_MAA:A MAA Multi Account Management and Automation Tool
+#   Copyright © 2024-2025 DLmaster361
+
+#   This file is part of AUTO_MAA.
+
+#   AUTO_MAA is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published
+#   by the Free Software Foundation, either version 3 of the License,
+#   or (at your option) any later version.
+
+#   AUTO_MAA is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with AUTO_MAA. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+"""
+AUTO_MAA
+AUTO_MAA配置项注册表测试
+v4.4
+作者：DLmaster_361
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+qfluentwidgets = pytest.importorskip("qfluentwidgets")
+
+# 全局配置在导入时初始化，以临时目录作为程序目录，且不解析 pytest 的命令行参数
+argv = sys.argv
+sys.argv = [str(Path(tempfile.mkdtemp()) / "main.py")]
+try:
+    from app.core.config import (
+        LQConfig,
+        QueueConfig,
+        MaaConfig,
+        MaaUserConfig,
+        MaaPlanConfig,
+    )
+finally:
+    sys.argv = argv
+
+CONFIG_CLASSES = [QueueConfig, MaaConfig, MaaUserConfig, MaaPlanConfig]
+
+
+def scan_to_dict(config: LQConfig) -> dict:
+    """按原有方式逐次反射遍历配置项生成字典"""
+
+    items = {}
+    for name in dir(config):
+        item = getattr(config, name)
+        if not isinstance(item, qfluentwidgets.ConfigItem):
+            continue
+
+        value = item.serialize()
+        if not items.get(item.group):
+            if not item.name:
+                items[item.group] = value
+            else:
+                items[item.group] = {}
+
+        if item.name:
+            items[item.group][item.name] = value
+
+    return items
+
+
+def scan_key_map(config: LQConfig) -> dict:
+    """按原有方式逐次反射生成键值到配置项的映射"""
+
+    items = {}
+    for name in dir(config):
+        item = getattr(config, name)
+        if isinstance(item, qfluentwidgets.ConfigItem):
+            items[item.key] = item
+    return items
+
+
+def scan_load(config: LQConfig, file: Path) -> None:
+    """按原有方式通过逐次反射生成的键值映射加载配置文件"""
+
+    with file.open(encoding="utf-8") as f:
+        cfg = json.load(f)
+
+    items = scan_key_map(config)
+
+    for k, v in cfg.items():
+        if not isinstance(v, dict) and items.get(k) is not None:
+            items[k].deserializeFrom(v)
+        elif isinstance(v, dict):
+            for key, value in v.items():
+                key = k + "." + key
+                if items.get(key) is not None:
+                    items[key].deserializeFrom(value)
+
+
+@pytest.mark.parametrize("config_class", CONFIG_CLASSES)
+def test_registry_matches_reflection(config_class):
+    """注册表生成的字典与键值映射与逐次反射的结果一致"""
+
+    config = config_class()
+
+    assert config.toDict() == scan_to_dict(config)
+    assert config.get_registry()[0] == scan_key_map(config)
+
+
+@pytest.mark.parametrize("config_class", CONFIG_CLASSES)
+def test_registry_load_matches_reflection(config_class, tmp_path):
+    """通过注册表加载配置文件与通过反射加载的结果一致"""
+
+    # 翻转所有布尔配置项，保证加载结果与默认值不同
+    data = config_class().toDict()
+    for group, value in data.items():
+        if isinstance(value, dict):
+            for name, item in value.items():
+                if isinstance(item, bool):
+                    value[name] = not item
+        elif isinstance(value, bool):
+            data[group] = not value
+
+    file = tmp_path / "config.json"
+    file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    config = config_class()
+    config.load(file, config)
+
+    reference = config_class()
+    scan_load(reference, file)
+
+    assert config.toDict() == scan_to_dict(reference) == data
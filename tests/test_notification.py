@@ -0,0 +1,227 @@
+#   AUTO_MAA:A MAA Multi Account Management and Automation Tool
+#   Copyright © 2024-2025 DLmaster361
+
+#   This file is part of AUTO_MAA.
+
+#   AUTO_MAA is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published
+#   by the Free Software Foundation, either version 3 of the License,
+#   or (at your option) any later version.
+
+#   AUTO_MAA is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with AUTO_MAA. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+"""
+AUTO_MAA
+AUTO_MAA通知服务测试
+v4.4
+作者：DLmaster_361
+"""
+
+import sys
+import json
+import time
+import email
+import smtplib
+import tempfile
+import threading
+import socketserver
+from email.header import decode_header, make_header
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("qfluentwidgets")
+jinja2 = pytest.importorskip("jinja2")
+
+# 全局配置在导入时初始化，以临时目录作为程序目录，且不解析 pytest 的命令行参数
+argv = sys.argv
+sys.argv = [str(Path(tempfile.mkdtemp()) / "main.py")]
+try:
+    from app.core import Config
+    from app.services.notification import Notification
+    from app.services.security import Crypto
+finally:
+    sys.argv = argv
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """仅实现发信所需命令的本地SMTP服务"""
+
+    def reply(self, text: str) -> None:
+        self.wfile.write(f"{text}\r\n".encode())
+
+    def handle(self) -> None:
+
+        self.reply("220 localhost")
+
+        while line := self.rfile.readline():
+
+            verb = line.decode().strip().split(" ")[0].upper()
+
+            if verb == "EHLO":
+                self.reply("250-localhost\r\n250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                self.reply("235 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(line[1:] if line.startswith(b"..") else line)
+                self.server.message_list.append(
+                    email.message_from_bytes(b"".join(data))
+                )
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("250 OK")
+
+
+class WebHookHandler(BaseHTTPRequestHandler):
+    """记录请求内容并按企业微信格式应答的本地WebHook服务"""
+
+    def do_POST(self) -> None:
+
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.message_list.append(json.loads(body))
+
+        response = json.dumps({"errcode": 0, "errmsg": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def notify():
+    """使用仓库内通知模板的通知服务实例"""
+
+    notify = Notification()
+    notify.template_env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(
+            str(Path(__file__).resolve().parents[1] / "resources/html")
+        )
+    )
+    yield notify
+    notify.shutdown()
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    """本地SMTP服务，邮件通过明文连接发往该服务"""
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+    server.daemon_threads = True
+    server.message_list = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    port = server.server_address[1]
+    monkeypatch.setattr(
+        smtplib,
+        "SMTP_SSL",
+        lambda host, _, timeout: smtplib.SMTP(host, port, timeout=timeout),
+    )
+    monkeypatch.setattr(Crypto, "win_decryptor", lambda code: code)
+
+    config = {
+        Config.notify_SMTPServerAddress: "127.0.0.1",
+        Config.notify_AuthorizationCode: "code",
+        Config.notify_FromAddress: "from@example.com",
+    }
+    get = Config.get
+    monkeypatch.setattr(Config, "get", lambda item: config.get(item, get(item)))
+
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_server(monkeypatch):
+    """本地WebHook服务"""
+
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebHookHandler)
+    server.message_list = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_mail_digest(notify, smtp_server):
+    """发往同一地址的统计信息合并为一封邮件，由模板逐条渲染"""
+
+    for name in ("用户甲", "用户乙"):
+        notify.push_statistic(
+            "send_mail",
+            f"{name}的统计信息",
+            (
+                "MAA_statistics.html",
+                {
+                    "user_info": name,
+                    "start_time": "2025-01-01 04:00:00",
+                    "end_time": "2025-01-01 05:00:00",
+                    "maa_result": "代理任务全部完成",
+                    "recruit_statistics": {"3★": 2},
+                    "drop_statistics": {},
+                },
+            ),
+            "to@example.com",
+        )
+    notify.shutdown()
+
+    assert len(smtp_server.message_list) == 1
+    message = smtp_server.message_list[0]
+    assert str(make_header(decode_header(message["Subject"]))) == (
+        "用户甲的统计信息 等2条统计信息"
+    )
+
+    html = message.get_payload()[0].get_payload(decode=True).decode("utf-8")
+    assert html.count("<html>") == 1
+    assert "用户甲" in html and "用户乙" in html
+
+
+def test_webhook_digest(notify, webhook_server):
+    """发往同一WebHook的统计信息合并为一条消息"""
+
+    url = f"http://127.0.0.1:{webhook_server.server_address[1]}/"
+    notify.push_statistic("CompanyWebHookBotPush", "标题甲", "内容甲", url)
+    notify.push_statistic("CompanyWebHookBotPush", "标题乙", "内容乙", url)
+    notify.shutdown()
+
+    assert len(webhook_server.message_list) == 1
+    content = webhook_server.message_list[0]["text"]["content"]
+    assert content.startswith("标题甲 等2条统计信息")
+    assert "内容甲" in content and "内容乙" in content
+
+
+def test_shutdown_timeout(notify, monkeypatch):
+    """退出时仅在限定时间内等待未完成的推送"""
+
+    monkeypatch.setattr(notify, "shutdown_timeout", 0.2)
+
+    release = threading.Event()
+    notify.submit(release.wait, 10)
+
+    start_time = time.monotonic()
+    notify.shutdown()
+    release.set()
+
+    assert time.monotonic() - start_time < 2
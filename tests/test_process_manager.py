@@ -0,0 +1,115 @@
+#   AUTO_MAA:A MAA Multi Account Management and Automation Tool
+#   Copyright © 2024-2025 DLmaster361
+
+#   This file is part of AUTO_MAA.
+
+#   AUTO_MAA is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published
+#   by the Free Software Foundation, either version 3 of the License,
+#   or (at your option) any later version.
+
+#   AUTO_MAA is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU General Public License for more details.
+
+#   You should have received a copy of the GNU General Public License
+#   along with AUTO_MAA. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+"""
+AUTO_MAA
+AUTO_MAA进程管理组件测试
+v4.4
+作者：DLmaster_361
+"""
+
+import sys
+import time
+import threading
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+# 直接加载模块文件，避免导入 app 包时初始化全局配置
+spec = importlib.util.spec_from_file_location(
+    "ProcessManager",
+    Path(__file__).resolve().parents[1] / "app/utils/ProcessManager.py",
+)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+ProcessManager = module.ProcessManager
+
+# 等待线程发出的信号以队列方式投递至主线程，需要事件循环处理
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def process_events(seconds: float, until: threading.Event = None) -> bool:
+    """
+    在主线程处理事件，直至超时或事件被设置
+
+    :param seconds: 最长处理时间
+    :param until: 提前结束处理的事件
+    :return: 事件是否已被设置
+    """
+
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 50)
+        if until is not None and until.is_set():
+            return True
+        time.sleep(0.01)
+    return until is not None and until.is_set()
+
+
+def open_sleep(manager, seconds: float) -> threading.Event:
+    """通过进程管理器启动休眠子进程，返回进程结束信号对应的事件"""
+
+    closed = threading.Event()
+    manager.processClosed.connect(closed.set)
+    manager.open_process(
+        Path(sys.executable), ["-c", f"import time; time.sleep({seconds})"], 5
+    )
+    return closed
+
+
+def test_process_exit():
+    """进程自然退出后发出结束信号并清空跟踪列表"""
+
+    manager = ProcessManager()
+    closed = open_sleep(manager, 0.5)
+
+    assert manager.is_running()
+    assert process_events(10, closed)
+    assert not manager.is_running()
+    assert manager.tracked_pids == set()
+
+
+@pytest.mark.parametrize("if_force", [False, True])
+def test_process_kill(if_force):
+    """中止进程后仅发出一次结束信号，且等待线程不再重复发出"""
+
+    manager = ProcessManager()
+    count = []
+    manager.processClosed.connect(lambda: count.append(1))
+    closed = open_sleep(manager, 30)
+    pid = manager.main_pid
+
+    assert manager.is_running()
+    manager.kill(if_force=if_force)
+
+    assert closed.is_set()
+    assert not manager.is_running()
+
+    try:
+        psutil.Process(pid).wait(10)
+    except psutil.NoSuchProcess:
+        pass
+
+    process_events(ProcessManager.wait_timeout * 2)
+    assert len(count) == 1